@@ -0,0 +1,240 @@
+"""
+Offline Batch Optimization Command.
+
+Solves optimization problems read as JSON Lines, one request per line, on a
+pool of worker processes, and writes one JSON line per result in completion
+order:
+
+    python -m app.batch loads.jsonl -o results.jsonl [--workers 8]
+    cat loads.jsonl | python -m app.batch > results.jsonl
+
+Each input line is an ``/optimize/`` request (``products`` plus parameters)
+or a columnar one (``names``, ``spaces``, ``values``, ``amounts`` plus
+parameters). Each output line is ``{"index": ..., "result": ...}`` or
+``{"index": ..., "error": ...}``, where ``index`` is the zero-based input
+line number. Lines are read lazily and at most ``--max-in-flight`` problems
+are pending at once, so memory use does not grow with the file size.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, Set, TextIO, Tuple
+
+import orjson
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.controllers.optimizer_controller import COLUMNS, OptimizerController
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeRequest, OptimizeScenario, check_capacities
+from app.solvers.pool import mark_worker
+
+
+def _init_worker(verbose: bool) -> None:
+    """
+    Set the log level of the engines in a worker, and make the portfolio
+    engine race its engines inline instead of starting a nested pool.
+
+    Args:
+        verbose: Log the per-generation progress of the engines to stderr
+    """
+    mark_worker()
+    logging.basicConfig(
+        stream=sys.stderr, format="%(processName)s %(name)s: %(message)s"
+    )
+    logging.getLogger("app").setLevel(logging.DEBUG if verbose else logging.WARNING)
+
+
+def _parse(payload: Dict[str, Any]) -> Tuple[Problem, OptimizeScenario]:
+    """
+    Build the problem and scenario of one input line.
+
+    Args:
+        payload: Decoded input line
+
+    Returns:
+        Tuple[Problem, OptimizeScenario]: Problem and scenario to solve
+
+    Raises:
+        ValueError: If the line is not a valid request
+    """
+    if "products" in payload:
+        request = OptimizeRequest.model_validate(payload)
+        problem = Problem.from_products(request.products)
+        scenario = OptimizeScenario.model_validate(
+            request.model_dump(exclude={"products"})
+        )
+    else:
+        columns = {
+            column: payload.pop(column) for column in COLUMNS if column in payload
+        }
+        missing = [column for column in COLUMNS[:4] if column not in columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        problem = Problem.from_columns(**columns)
+        scenario = OptimizeScenario.model_validate(payload)
+        check_capacities(problem.resources.shape[1], [scenario])
+    return problem, scenario
+
+
+def _solve_line(index: int, line: bytes) -> Tuple[bytes, bool]:
+    """
+    Solve one input line; module-level so it runs in a worker process.
+
+    Decoding, solving and encoding all happen in the worker, so the parent
+    process only moves bytes.
+
+    Args:
+        index: Zero-based input line number
+        line: Raw input line
+
+    Returns:
+        Tuple[bytes, bool]: Output JSON line, with its trailing newline, and
+        whether the line failed
+    """
+    try:
+        payload = orjson.loads(line)
+        if not isinstance(payload, dict):
+            raise ValueError("Each line must be a JSON object")
+        problem, scenario = _parse(payload)
+        scenario = OptimizerController.resolve_warm_start(scenario)
+        result = OptimizerController.run(problem, scenario)
+        output = {
+            "index": index,
+            "result": OptimizerController.build_content(problem, scenario, result),
+        }
+    except ValidationError as error:
+        output = {"index": index, "error": error.errors(include_url=False)}
+    except HTTPException as error:
+        output = {"index": index, "error": error.detail}
+    except ValueError as error:
+        output = {"index": index, "error": str(error)}
+    except Exception as error:
+        # Uma linha com defeito não deve derrubar o lote inteiro
+        output = {"index": index, "error": repr(error)}
+    return orjson.dumps(output, default=str) + b"\n", "error" in output
+
+
+def _lines(source: TextIO) -> Iterator[Tuple[int, bytes]]:
+    """
+    Iterate over the non-blank lines of the input with their line numbers.
+
+    Args:
+        source: Input stream
+
+    Yields:
+        Tuple[int, bytes]: Zero-based line number and raw line
+    """
+    for index, line in enumerate(source.buffer):
+        if line.strip():
+            yield index, line
+
+
+def run(
+    source: TextIO,
+    target: TextIO,
+    workers: int,
+    max_in_flight: int,
+    verbose: bool = False,
+) -> Tuple[int, int]:
+    """
+    Solve every line of the input, writing results in completion order.
+
+    Args:
+        source: Input stream of JSON Lines requests
+        target: Output stream for the JSON Lines results
+        workers: Worker processes (0 = one per CPU)
+        max_in_flight: Problems submitted but not yet written
+        verbose: Forward the engines' progress to stderr
+
+    Returns:
+        Tuple[int, int]: Lines solved and lines that failed
+    """
+    solved = failed = 0
+    output = target.buffer
+    pending: Set[Future] = set()
+
+    def drain(until: int) -> None:
+        nonlocal pending, solved, failed
+        while len(pending) > until:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                line, error = future.result()
+                output.write(line)
+                if error:
+                    failed += 1
+                else:
+                    solved += 1
+            output.flush()
+
+    with ProcessPoolExecutor(
+        max_workers=workers or None, initializer=_init_worker, initargs=(verbose,)
+    ) as executor:
+        for index, line in _lines(source):
+            pending.add(executor.submit(_solve_line, index, line))
+            drain(max_in_flight - 1)
+        drain(0)
+    return solved, failed
+
+
+def main() -> None:
+    """
+    Parse the command line and run the batch.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solve JSON Lines optimization batches"
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="JSON Lines file with one request per line (default: stdin)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="JSON Lines file for the results (default: stdout)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0, help="worker processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=0,
+        help="problems pending at once (default: twice the workers)",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="forward the engines' progress to stderr"
+    )
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    max_in_flight = args.max_in_flight or 2 * workers
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    target = (
+        sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    )
+    started = time.perf_counter()
+    try:
+        solved, failed = run(source, target, workers, max_in_flight, args.verbose)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    elapsed = time.perf_counter() - started
+    print(
+        f"> Solved {solved} problems ({failed} failed) in {elapsed:.1f}s, "
+        f"{(solved + failed) / max(elapsed, 1e-9):.1f} problems/s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
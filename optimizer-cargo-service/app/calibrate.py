@@ -0,0 +1,62 @@
+"""
+Genetic Algorithm Calibration Command.
+
+Re-calibrates the table used by the automatic parameter tuning by running
+the genetic algorithm on this machine:
+
+    python -m app.calibrate [--budget-ms 200] [--sizes 10 50 200 1000 5000]
+"""
+
+import argparse
+
+from app.solvers.tuning import (
+    CALIBRATION_SIZES,
+    CALIBRATION_TIGHTNESS,
+    GA_CALIBRATION_PATH,
+    calibrate,
+    save_calibration,
+)
+
+
+def main() -> None:
+    """
+    Parse the command line, run the calibration and save the table.
+    """
+    parser = argparse.ArgumentParser(
+        description="Calibrate the automatic genetic algorithm tuning"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(CALIBRATION_SIZES),
+        help="catalog sizes to calibrate",
+    )
+    parser.add_argument(
+        "--tightness",
+        type=float,
+        nargs="+",
+        default=list(CALIBRATION_TIGHTNESS),
+        help="fleet capacity over total space of the catalogs",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=200,
+        help="time budget of each calibration run",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the synthetic catalogs and runs"
+    )
+    parser.add_argument(
+        "--output", default=GA_CALIBRATION_PATH, help="calibration file to write"
+    )
+    args = parser.parse_args()
+
+    table = calibrate(args.sizes, args.tightness, args.budget_ms, args.seed)
+    save_calibration(table, args.output)
+    print(f"> Calibration saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
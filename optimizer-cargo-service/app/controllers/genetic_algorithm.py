@@ -5,13 +5,23 @@ This module implements the GeneticAlgorithm class for solving the truck packing
 optimization problem using a genetic algorithm approach. It provides methods
 for population initialization, sorting, evaluation, parent selection, elitism,
 and running the optimization process.
+
+The population is stored as a matrix with one chromosome per row, so every
+genetic operator and the evaluation run over the whole population at once.
+Progress of each generation is logged at DEBUG level.
 """
 
-from random import random
-from typing import List, Optional
+import logging
+import time
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
+from app.models.problem import Problem
 from app.models.subject import Subject
-from app.schemas.product import ProductInput
+from .local_search import LocalSearch
+
+logger = logging.getLogger(__name__)
 
 
 class GeneticAlgorithm:
@@ -19,45 +29,146 @@ class GeneticAlgorithm:
     GeneticAlgorithm class for solving the truck packing optimization problem
     using a genetic algorithm.
 
+    Each gene holds the truck a product is assigned to, counting from 1, or 0
+    when the product is left out; with a single truck this is the classic
+    binary knapsack chromosome.
+
     Attributes:
-        products (List[ProductInput]): List of products to optimize.
-        population (List[Subject]): Current population of subjects.
+        problem (Problem): Preprocessed problem to optimize.
+        population (np.ndarray): Current population, shape (subjects, products).
+        evaluation_notes (np.ndarray): Evaluation note of each subject.
+        loads (np.ndarray): Load per truck and dimension of each subject.
         generation (int): Current generation number.
         solutions_list (List[float]): List of best solution values per generation.
         mutation_rate (float): Mutation rate for genetic algorithm.
         number_generations (int): Number of generations to run.
         population_size (int): Size of the population.
-        limit (float): Space limit of the truck.
+        capacities (np.ndarray): Capacity of each truck in each dimension,
+            space first.
         best_solution (Optional[Subject]): Best solution found so far.
+        rng (np.random.Generator): Random number generator for all operators.
+        seeds (Optional[np.ndarray]): Chromosomes of a previous solution used
+            to warm-start the initial population.
+        stall_generations (Optional[int]): Generations without improvement
+            after which the run stops early.
+        local_search (Optional[LocalSearch]): Hill climbing applied to the
+            best subjects of each generation.
+        deadline (Optional[float]): ``time.perf_counter()`` value at which the
+            run stops early.
+        evaluations (int): Chromosomes and local search moves evaluated.
+        stop_reason (str): Why the last run ended ("completed", "stalled" or
+            "time_limit").
+        restart_diversity (Optional[float]): Mean normalized Hamming distance
+            below which the population is partially restarted.
+        restart_keep (float): Share of the best subjects kept by a restart.
+        track_diversity (bool): Whether the diversity of every generation is
+            measured; always True when restarts are enabled.
+        diversity_list (List[Tuple[float, float]]): Mean normalized Hamming
+            distance and unique-chromosome ratio of each generation, when
+            tracked.
+        restarts (int): Partial restarts performed in the last run.
     """
-    products: List[ProductInput]
-    population: List[Subject]
+    problem: Problem
+    population: np.ndarray
+    evaluation_notes: np.ndarray
+    loads: np.ndarray
     generation: int = 0
     solutions_list: List[float] = []
     mutation_rate: float = 0.01
     number_generations: int = 100
     population_size: int = 200
-    limit: float = 0.0
     best_solution: Optional[Subject] = None
 
-    def __init__(self, products: List[ProductInput], limit: float,
-                 population_size: int, number_generations: int,
-                 mutation_rate: float = 0) -> None:
+    def __init__(
+        self,
+        problem: Problem,
+        limits: Union[float, Sequence[float]],
+        population_size: int,
+        number_generations: int,
+        mutation_rate: float = 0,
+        seed: Optional[int] = None,
+        capacities: Optional[Sequence[float]] = None,
+        seeds: Optional[np.ndarray] = None,
+        stall_generations: Optional[int] = None,
+        local_search_elite: int = 0,
+        local_search_evaluations: int = 1000,
+        local_search_time: Optional[float] = None,
+        deadline: Optional[float] = None,
+        restart_diversity: Optional[float] = None,
+        restart_keep: float = 0.1,
+        track_diversity: bool = False,
+    ) -> None:
         """
         Initialize the GeneticAlgorithm instance.
 
         Args:
-            products: List of products to optimize.
-            limit: Space limit of the truck.
+            problem: Preprocessed problem to optimize.
+            limits: Space limit of the truck, or one limit per truck.
             population_size: Size of the population.
             number_generations: Number of generations to run.
             mutation_rate: Mutation rate. Defaults to 0.
+            seed: Seed for the random number generator, making runs
+                reproducible. Defaults to None (unseeded).
+            capacities: Capacity of each extra resource of the products,
+                shared by all trucks. Defaults to None (space only).
+            seeds: Chromosomes, one per row, to warm-start from. Defaults to
+                None (random initial population).
+            stall_generations: Stop once the best solution has not improved
+                for this many generations. Defaults to None (never).
+            local_search_elite: Number of top subjects improved by local
+                search each generation. Defaults to 0 (disabled).
+            local_search_evaluations: Move evaluations allowed to the local
+                search per generation. Defaults to 1000.
+            local_search_time: Seconds allowed to the local search per
+                generation. Defaults to None (no time limit).
+            deadline: ``time.perf_counter()`` value at which the run stops.
+                Defaults to None (no time limit).
+            restart_diversity: Restart most of the population once its mean
+                normalized Hamming distance falls below this value. Defaults
+                to None (never).
+            restart_keep: Share of the best subjects kept by a restart.
+                Defaults to 0.1.
+            track_diversity: Measure the diversity of every generation even
+                without restarts. Defaults to False.
         """
-        self.products = products
-        self.limit = limit
-        self.population_size = population_size
+        self.problem = problem
+        self.capacities = Problem.capacity_matrix(np.atleast_1d(limits), capacities)
+        self.trucks = len(self.capacities)
+        # Populações ímpares perderiam o último filho do crossover em pares
+        self.population_size = population_size + population_size % 2
         self.number_generations = number_generations
         self.mutation_rate = mutation_rate
+        self.rng = np.random.default_rng(seed)
+        self.seeds = seeds
+        self.stall_generations = stall_generations
+        self.deadline = deadline
+        self.evaluations = 0
+        self.stop_reason = "completed"
+        self.restart_diversity = restart_diversity
+        self.restart_keep = restart_keep
+        # As reinicializações dependem da diversidade de cada geração
+        self.track_diversity = track_diversity or restart_diversity is not None
+        self.diversity_list: List[Tuple[float, float]] = []
+        self.restarts = 0
+        self.local_search: Optional[LocalSearch] = None
+        if local_search_elite > 0:
+            self.local_search = LocalSearch(
+                problem,
+                self.capacities,
+                local_search_elite,
+                local_search_evaluations,
+                local_search_time,
+                self.rng,
+            )
+
+    def evaluate_population(self) -> None:
+        """
+        Evaluates every subject of the current population at once.
+        """
+        self.evaluation_notes, self.loads = self.problem.evaluate(
+            self.population, self.capacities
+        )
+        self.evaluations += len(self.population)
 
     def start_initial_population(self) -> None:
         """
@@ -66,13 +177,66 @@ class GeneticAlgorithm:
         """
         # Reseta contador de geração
         self.generation = 0
-        self.population = []
-        # Iniciando a população de cromossomos, contendo os espaços e valores dos produtos
-        # e variando a carga
-        for i in range(self.population_size):
-            self.population.append(Subject(self.products, self.limit))
+        self.population = self.random_population(self.population_size)
+        if self.seeds is not None:
+            self.seed_population()
+        self.evaluate_population()
         # Define a primeira solução como melhor inicial
-        self.best_solution = self.population[0]
+        self.best_solution = self.subject(0)
+
+    def random_population(self, size: int) -> np.ndarray:
+        """
+        Draws random subjects.
+
+        Args:
+            size: Number of subjects to draw.
+
+        Returns:
+            np.ndarray: Random chromosomes, one per row.
+        """
+        # 50% de chance de pegar cada produto, distribuindo os escolhidos
+        # entre os caminhões
+        shape = (size, len(self.problem))
+        return np.where(
+            self.rng.random(shape) < 0.5,
+            0,
+            self.rng.integers(1, self.trucks + 1, size=shape),
+        ).astype(np.int16)
+
+    def seed_population(self) -> None:
+        """
+        Warm-starts the initial population from the seed chromosomes.
+
+        The seeds are kept as they are, half of the population is filled with
+        lightly mutated variants of them and a greedy solution is added; the
+        remaining subjects stay random to preserve diversity.
+        """
+        seeds = np.atleast_2d(self.seeds).astype(np.int16)
+        seeds = seeds[: self.population_size - 1]
+        # Variantes com poucas alterações: em média dois genes por cromossomo
+        variants = self.population_size // 2 - len(seeds)
+        rate = min(1.0, 2 / max(1, len(self.problem)))
+        mutated = self.mutate(seeds[np.arange(max(0, variants)) % len(seeds)], rate)
+        greedy = self.problem.greedy_chromosome(self.capacities)
+        warm = np.concatenate([seeds, mutated, greedy[np.newaxis, :]])
+        self.population[: len(warm)] = warm
+
+    def subject(self, index: int) -> Subject:
+        """
+        Builds a Subject snapshot of one row of the population.
+
+        Args:
+            index: Row of the population.
+
+        Returns:
+            Subject: Copy of the chromosome with its evaluation.
+        """
+        return Subject(
+            self.population[index].copy(),
+            self.evaluation_notes[index],
+            self.loads[index].copy(),
+            generation=self.generation,
+        )
 
     def sort_population(self) -> None:
         """
@@ -80,10 +244,10 @@ class GeneticAlgorithm:
         """
         # Avaliação da População - ordenando por maior pontuação
         # para que você possa selecionar os melhores indivíduos
-        self.population.sort(
-            key=lambda subject: subject.evaluation_note,
-            reverse=True
-        )
+        order = np.argsort(-self.evaluation_notes, kind="stable")
+        self.population = self.population[order]
+        self.evaluation_notes = self.evaluation_notes[order]
+        self.loads = self.loads[order]
 
     def sum_evaluations(self) -> float:
         """
@@ -92,53 +256,168 @@ class GeneticAlgorithm:
         Returns:
             float: The sum of evaluation notes.
         """
-        return sum(subject.evaluation_note for subject in self.population)
+        return float(self.evaluation_notes.sum())
 
-    def select_parent(self, sum_evaluation: float) -> int:
+    def select_parents(self, count: int) -> np.ndarray:
         """
-        Selects a parent index using the roulette wheel selection method.
+        Selects parent indices using the roulette wheel selection method.
 
         Args:
-            sum_evaluation: The sum of evaluation notes in the population.
+            count: Number of parents to draw.
 
         Returns:
-            int: The index of the selected parent.
-
-        Raises:
-            ValueError: If population is empty.
+            np.ndarray: The indices of the selected parents.
         """
         # Roleta viciada: indivíduos com melhor fitness têm maior chance
-        # Vamos selecionar os pais para gerar uma nova população
-        # Pegamos toda a população, avaliamos e selecionamos os melhores.
-        # Vamos usar o método da roleta viciada
-        parent = -1
-        # multiplicação de um número aleatório pela soma da população
-        drawn_value = random() * sum_evaluation  # Valor sorteado
-        soma = 0
-        i = 0
-        while i < len(self.population) and soma < drawn_value:
-            soma += self.population[i].evaluation_note
-            parent += 1
-            i += 1
-        return parent
+        sum_evaluation = self.sum_evaluations()
+        if sum_evaluation <= 0:
+            return self.rng.integers(0, len(self.population), size=count)
+        wheel = np.cumsum(self.evaluation_notes)
+        drawn_values = self.rng.random(count) * sum_evaluation  # Valores sorteados
+        parents = np.searchsorted(wheel, drawn_values, side="right")
+        return np.minimum(parents, len(self.population) - 1)
+
+    def apply_local_search(self) -> None:
+        """
+        Improves the best subjects of the sorted population by local search.
+
+        The generation budget is split evenly between the elite subjects, and
+        only the rows that changed are re-evaluated before re-sorting.
+        """
+        if self.local_search is None:
+            return
+        self.local_search.start_generation()
+        elite = min(self.local_search.elite, len(self.population))
+        share = max(1, self.local_search.max_evaluations // elite)
+        changed_rows = []
+        for index in range(elite):
+            if self.local_search.exhausted():
+                break
+            chromosome, changed = self.local_search.improve(
+                self.population[index], self.loads[index], share
+            )
+            if changed:
+                self.population[index] = chromosome
+                changed_rows.append(index)
+        self.evaluations += self.local_search.evaluations
+        if changed_rows:
+            rows = np.asarray(changed_rows)
+            notes, loads = self.problem.evaluate(self.population[rows], self.capacities)
+            self.evaluation_notes[rows] = notes
+            self.loads[rows] = loads
+            self.sort_population()
 
     def update_best_solution(self) -> None:
         """
         Updates the best solution if the provided subject is better than the current best.
         """
         # Verificando se o indivíduo atual é melhor que a melhor solução atual (Elitismo)
-        subject_candidate = self.population[0]
-        self.solutions_list.append(subject_candidate.evaluation_note)
+        candidate_note = float(self.evaluation_notes[0])
+        self.solutions_list.append(candidate_note)
 
-        print(f"> Gen Best Solution ... {subject_candidate}")
+        logger.debug("Gen %d best solution: %s", self.generation, candidate_note)
         # Atualiza a melhor solução global se necessário
-        if self.best_solution is None:  # Primeira melhor solução
-            # Se ainda não há melhor solução, define o sujeito atual como o melhor
-            self.best_solution = subject_candidate
-        elif (subject_candidate.evaluation_note >
-              self.best_solution.evaluation_note):
-            self.best_solution = subject_candidate
-        print(f"> Best Solution until now ... {self.best_solution}")
+        if (
+            self.best_solution is None
+            or candidate_note > self.best_solution.evaluation_note
+        ):
+            self.best_solution = self.subject(0)
+        logger.debug("Best solution until now: %s", self.best_solution.evaluation_note)
+
+    def measure_diversity(self) -> Tuple[float, float]:
+        """
+        Measures the diversity of the current population.
+
+        The mean Hamming distance over all pairs of subjects is computed from
+        the gene counts of each position, in O(subjects x products) rather
+        than over every pair. Unique chromosomes are counted on the genomes
+        packed into bytes (bits for a single truck).
+
+        Returns:
+            Tuple[float, float]: Mean Hamming distance divided by the number
+            of products, and share of distinct chromosomes.
+        """
+        subjects, genes = self.population.shape
+        if subjects < 2 or genes == 0:
+            diversity = (0.0, 1.0)
+            self.diversity_list.append(diversity)
+            return diversity
+        # Pares que diferem numa posição: (P² - Σ contagem²) / 2 por valor de gene
+        counts = np.stack(
+            [(self.population == truck).sum(axis=0) for truck in range(self.trucks + 1)]
+        )
+        differing = (subjects**2 - (counts.astype(np.int64) ** 2).sum(axis=0)).sum()
+        hamming = float(differing) / (subjects * (subjects - 1) * genes)
+
+        if self.trucks == 1:
+            packed = np.packbits(self.population.astype(bool), axis=1)
+        else:
+            packed = self.population.astype(np.uint8)
+        unique = len(np.unique(packed, axis=0)) / subjects
+        diversity = (hamming, unique)
+        self.diversity_list.append(diversity)
+        return diversity
+
+    def restart_population(self) -> None:
+        """
+        Partially restarts a converged population.
+
+        The best subjects of the sorted population are kept and the rest are
+        replaced by random ones, then the population is sorted again.
+        """
+        keep = max(1, int(np.ceil(self.restart_keep * self.population_size)))
+        fresh = self.random_population(self.population_size - keep)
+        notes, loads = self.problem.evaluate(fresh, self.capacities)
+        self.evaluations += len(fresh)
+        self.population = np.concatenate([self.population[:keep], fresh])
+        self.evaluation_notes = np.concatenate([self.evaluation_notes[:keep], notes])
+        self.loads = np.concatenate([self.loads[:keep], loads])
+        self.sort_population()
+        self.restarts += 1
+        logger.debug("Gen %d restart: keeping %d subjects", self.generation, keep)
+
+    def crossover(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        """
+        Performs one-point crossover between pairs of parents.
+
+        Args:
+            parents1: Chromosomes of the first parents, one per row.
+            parents2: Chromosomes of the second parents, one per row.
+
+        Returns:
+            np.ndarray: Two children per pair of parents, one per row.
+        """
+        pairs, genes = parents1.shape
+        # Define posição de corte para cada par de pais
+        cut_positions = self.rng.integers(0, genes + 1, size=pairs)
+        head = np.arange(genes) < cut_positions[:, np.newaxis]
+        son1 = np.where(head, parents1, parents2)
+        son2 = np.where(head, parents2, parents1)
+        return np.concatenate([son1, son2])
+
+    def mutate(
+        self, population: np.ndarray, mutation_rate: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Mutates genes of the population in place based on the mutation rate.
+
+        A mutated gene moves its product to a different truck, or in or out
+        of the load.
+
+        Args:
+            population: Chromosomes to mutate, one per row.
+            mutation_rate: Probability of mutating each gene. Defaults to
+                the mutation rate of the algorithm.
+
+        Returns:
+            np.ndarray: The mutated population.
+        """
+        if mutation_rate is None:
+            mutation_rate = self.mutation_rate
+        mutated = self.rng.random(population.shape) < mutation_rate
+        shifts = self.rng.integers(1, self.trucks + 1, size=int(mutated.sum()))
+        population[mutated] = (population[mutated] + shifts) % (self.trucks + 1)
+        return population
 
     def start_new_generation(self) -> None:
         """
@@ -146,22 +425,16 @@ class GeneticAlgorithm:
         This method generates a new population by performing crossover and
         mutation on selected parents.
         """
-        # Seleção de pais usando roleta viciada
-        sum_evaluation = self.sum_evaluations()
-        new_population = []
-        while len(new_population) < self.population_size:
-            # Vamos gerar dois pais de uma vez para o crossover
-            parent1 = self.select_parent(sum_evaluation)
-            parent2 = self.select_parent(sum_evaluation)
-            # Realiza crossover entre os pais
-            children = self.population[parent1].crossover(
-                self.population[parent2]
-            )
-            # Aplica mutação nos filhos
-            new_population.extend([
-                child.mutate(self.mutation_rate) for child in children
-            ])
-        self.population = list(new_population)
+        # Seleção de pais usando roleta viciada, dois pais por par de filhos
+        pairs = self.population_size // 2
+        parents = self.select_parents(2 * pairs)
+        children = self.crossover(
+            self.population[parents[:pairs]], self.population[parents[pairs:]]
+        )
+        # Aplica mutação nos filhos
+        self.population = self.mutate(children)
+        self.generation += 1
+        self.evaluate_population()
 
     def run(self) -> Optional[Subject]:
         """
@@ -170,24 +443,49 @@ class GeneticAlgorithm:
 
         Returns:
             Optional[Subject]: The best solution found after all generations.
-
-        Raises:
-            Exception: If population is not initialized.
         """
         # Inicializa a melhor solução e lista de soluções
         self.best_solution = None
         self.solutions_list = []
+        self.evaluations = 0
+        self.stop_reason = "completed"
+        self.diversity_list = []
+        self.restarts = 0
 
         # Inicializa população e avalia a primeira geração
         self.start_initial_population()
         self.sort_population()
+        self.apply_local_search()
         self.update_best_solution()
+        if self.track_diversity:
+            self.measure_diversity()
 
         # Executa o algoritmo genético por N gerações
+        stalled = 0
         for _ in range(self.number_generations):
+            best_note = self.best_solution.evaluation_note
             self.start_new_generation()  # Cria nova geração
             self.sort_population()       # Ordena por fitness
+            self.apply_local_search()  # Busca local nos melhores (memético)
             self.update_best_solution()  # Atualiza melhor solução
+            if self.track_diversity:
+                hamming, _ = self.measure_diversity()
+                # População convergida: reinicia a maior parte, mantendo os melhores
+                if (
+                    self.restart_diversity is not None
+                    and hamming < self.restart_diversity
+                ):
+                    self.restart_population()
 
-        return self.best_solution
+            # Encerra cedo quando a melhor solução para de evoluir
+            stalled = (
+                0 if self.best_solution.evaluation_note > best_note else stalled + 1
+            )
+            if self.stall_generations and stalled >= self.stall_generations:
+                self.stop_reason = "stalled"
+                break
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                self.stop_reason = "time_limit"
+                break
 
+        return self.best_solution
@@ -0,0 +1,234 @@
+"""
+Local Search Module.
+
+This module implements the LocalSearch class, a bounded hill-climbing stage
+applied to the best subjects of each generation of the genetic algorithm
+(a memetic algorithm). Moves are scored incrementally: only the products
+whose genes change are re-scored against the current loads.
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.models.problem import Problem
+
+
+class LocalSearch:
+    """
+    Bounded 1-flip/swap hill climbing with incremental delta fitness.
+
+    Three moves are used, all accepted only when they improve the solution:
+    removing a product from an overloaded truck (repair), adding a product to
+    a truck where it fits (1-flip) and exchanging a loaded product for a more
+    valuable unloaded one (swap).
+
+    Attributes:
+        problem (Problem): Preprocessed problem to optimize.
+        capacities (np.ndarray): Capacity of each truck in each dimension.
+        elite (int): Number of top subjects improved per generation.
+        max_evaluations (int): Move evaluations allowed per generation.
+        time_budget (Optional[float]): Seconds allowed per generation.
+        evaluations (int): Move evaluations performed in the current generation.
+    """
+
+    def __init__(
+        self,
+        problem: Problem,
+        capacities: np.ndarray,
+        elite: int,
+        max_evaluations: int,
+        time_budget: Optional[float],
+        rng: np.random.Generator,
+    ) -> None:
+        """
+        Initialize the LocalSearch instance.
+
+        Args:
+            problem: Preprocessed problem to optimize.
+            capacities: Capacity of each truck in each checked dimension.
+            elite: Number of top subjects improved per generation.
+            max_evaluations: Move evaluations allowed per generation, shared
+                by all elite subjects.
+            time_budget: Seconds allowed per generation, or None for no limit.
+            rng: Random number generator used to sample moves.
+        """
+        self.problem = problem
+        self.capacities = capacities
+        self.elite = elite
+        self.max_evaluations = max_evaluations
+        self.time_budget = time_budget
+        self.rng = rng
+        self.evaluations = 0
+        self._deadline = float("inf")
+        # Listas Python tornam cada avaliação de movimento O(dimensões)
+        self._weights: List[List[float]] = problem.weights[
+            :, : capacities.shape[1]
+        ].tolist()
+        self._values: List[float] = problem.total_values.tolist()
+        self._density: List[float] = problem.densities(capacities).tolist()
+        self._capacities: List[List[float]] = capacities.tolist()
+
+    def start_generation(self) -> None:
+        """
+        Resets the evaluation and time budgets for a new generation.
+        """
+        self.evaluations = 0
+        self._deadline = (
+            time.perf_counter() + self.time_budget
+            if self.time_budget is not None
+            else float("inf")
+        )
+
+    def exhausted(self, stop_at: Optional[int] = None) -> bool:
+        """
+        Checks whether the budget of the current generation is used up.
+
+        Args:
+            stop_at: Evaluation count at which the current subject must stop,
+                below the generation budget. Defaults to the generation budget.
+
+        Returns:
+            bool: True when no more moves may be evaluated.
+        """
+        limit = self.max_evaluations if stop_at is None else stop_at
+        return self.evaluations >= limit or time.perf_counter() >= self._deadline
+
+    def _fits(self, load: List[float], truck: int, add: int, remove: int = -1) -> bool:
+        """
+        Checks a truck's capacity after adding and optionally removing a product.
+
+        Args:
+            load: Current load of the truck in each dimension.
+            truck: Truck position, counting from 0.
+            add: Product entering the truck.
+            remove: Product leaving the truck, or -1 for none.
+
+        Returns:
+            bool: True when every dimension stays within capacity.
+        """
+        self.evaluations += 1
+        added = self._weights[add]
+        removed = self._weights[remove] if remove >= 0 else None
+        for dimension, capacity in enumerate(self._capacities[truck]):
+            new_load = load[dimension] + added[dimension]
+            if removed is not None:
+                new_load -= removed[dimension]
+            if new_load > capacity:
+                return False
+        return True
+
+    def _move(
+        self, genes: List[int], loads: List[List[float]], product: int, truck: int
+    ) -> None:
+        """
+        Moves a product to a truck (0 = unload), updating the loads in place.
+
+        Args:
+            genes: Chromosome being improved.
+            loads: Load of each truck in each dimension.
+            product: Product to move.
+            truck: Destination truck, counting from 1, or 0 to unload.
+        """
+        weights = self._weights[product]
+        if genes[product]:
+            source = loads[genes[product] - 1]
+            for dimension, weight in enumerate(weights):
+                source[dimension] -= weight
+        if truck:
+            target = loads[truck - 1]
+            for dimension, weight in enumerate(weights):
+                target[dimension] += weight
+        genes[product] = truck
+
+    def _repair(self, genes: List[int], loads: List[List[float]], stop_at: int) -> None:
+        """
+        Unloads the least dense products of overloaded trucks until they fit.
+
+        Only products that consume a dimension still over capacity are
+        unloaded; afterwards the unloaded products are put back, densest
+        first, wherever they fit again.
+
+        Args:
+            genes: Chromosome being improved.
+            loads: Load of each truck in each dimension.
+            stop_at: Evaluation count at which the subject must stop.
+        """
+        unloaded: List[int] = []
+        for truck, capacity in enumerate(self._capacities):
+            load = loads[truck]
+            if all(l <= c for l, c in zip(load, capacity)):
+                continue
+            loaded = [i for i, gene in enumerate(genes) if gene == truck + 1]
+            loaded.sort(key=lambda i: self._density[i])
+            for product in loaded:
+                over = [l > c for l, c in zip(load, capacity)]
+                if self.exhausted(stop_at) or not any(over):
+                    break
+                self.evaluations += 1
+                # Só descarrega quem alivia uma dimensão ainda excedida
+                if any(w > 0 for w, o in zip(self._weights[product], over) if o):
+                    self._move(genes, loads, product, 0)
+                    unloaded.append(product)
+
+        unloaded.sort(key=lambda i: -self._density[i])
+        for product in unloaded:
+            if self._values[product] <= 0:
+                continue
+            for truck in range(len(self._capacities)):
+                if self.exhausted(stop_at):
+                    return
+                if self._fits(loads[truck], truck, product):
+                    self._move(genes, loads, product, truck + 1)
+                    break
+
+    def improve(
+        self, chromosome: np.ndarray, loads: np.ndarray, evaluations: int
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        Hill-climbs one chromosome within its share of the generation budget.
+
+        Args:
+            chromosome: Chromosome to improve.
+            loads: Load of each truck in each dimension of the chromosome.
+            evaluations: Move evaluations allowed for this chromosome.
+
+        Returns:
+            Tuple[np.ndarray, bool]: The improved chromosome and whether any
+            gene changed.
+        """
+        genes = chromosome.tolist()
+        current_loads = loads.tolist()
+        original = list(genes)
+        stop_at = min(self.max_evaluations, self.evaluations + evaluations)
+        self._repair(genes, current_loads, stop_at)
+
+        products = len(genes)
+        trucks = len(self._capacities)
+        while products and not self.exhausted(stop_at):
+            product = int(self.rng.integers(products))
+            truck = genes[product]
+            if truck == 0:
+                # 1-flip: carrega o produto no primeiro caminhão onde couber
+                if self._values[product] <= 0:
+                    self.evaluations += 1
+                    continue
+                start = int(self.rng.integers(trucks))
+                for offset in range(trucks):
+                    target = (start + offset) % trucks
+                    if self._fits(current_loads[target], target, product):
+                        self._move(genes, current_loads, product, target + 1)
+                        break
+            else:
+                # Swap: troca por um produto fora da carga que valha mais
+                other = int(self.rng.integers(products))
+                if genes[other] != 0 or self._values[other] <= self._values[product]:
+                    self.evaluations += 1
+                    continue
+                if self._fits(current_loads[truck - 1], truck - 1, other, product):
+                    self._move(genes, current_loads, product, 0)
+                    self._move(genes, current_loads, other, truck)
+
+        changed = genes != original
+        return np.asarray(genes, dtype=chromosome.dtype), changed
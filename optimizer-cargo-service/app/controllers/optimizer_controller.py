@@ -2,27 +2,92 @@
 Optimizer Controller Module.
 
 This module contains the business logic controller for cargo optimization
-operations, providing the interface between API routes and the genetic
-algorithm.
+operations, providing the interface between API routes and the
+optimization engines.
 """
 
-from typing import List
+import asyncio
+from itertools import repeat
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
-from app.schemas.optimize import OptimizeRequest, OptimizeResponse
-from app.schemas.product import ProductOutput
-from .genetic_algorithm import GeneticAlgorithm
+import httpx
+import numpy as np
+
+from fastapi import HTTPException, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from app.models.problem import Problem
+from app.schemas.optimize import (
+    CompactOptimizeResponse,
+    DiversityStats,
+    OptimizeBatchRequest,
+    OptimizeByIdRequest,
+    OptimizeRequest,
+    OptimizeScenario,
+    OptimizeStats,
+    PortfolioEntry,
+    check_capacities,
+)
+from app.services.metrics import observe_solve
+from app.services.product_catalog import UnknownProductsError, product_catalog
+from app.solvers.base import SolverResult
+from app.solvers.pool import submit
+from app.solvers.registry import get_solver
+from .result_store import result_store
+
+# Product columns of a columnar optimization request
+COLUMNS = ("names", "spaces", "values", "amounts", "resources")
+
+
+def _solve_scenario(problem: Problem, scenario: OptimizeScenario) -> Dict[str, Any]:
+    """
+    Solve one scenario; module-level so it can run in a worker process.
+
+    Args:
+        problem: Preprocessed problem shared by all scenarios
+        scenario: Limit and genetic algorithm parameters for this run
+
+    Returns:
+        Dict[str, Any]: Optimization results in the OptimizeResponse format
+    """
+    return OptimizerController.solve(problem, scenario)
+
+
+def _dispatch(
+    problem: Problem, scenario: OptimizeScenario
+) -> "asyncio.Future[Dict[str, Any]]":
+    """
+    Start solving a batch scenario on the executor it runs on.
+
+    Portfolio scenarios only wait on engines they dispatch to the process
+    pool themselves, so they run on the default thread pool instead.
+
+    Args:
+        problem: Preprocessed problem shared by all scenarios
+        scenario: Scenario to dispatch
+
+    Returns:
+        asyncio.Future[Dict[str, Any]]: Optimization results for the scenario,
+        in the OptimizeResponse format
+    """
+    if scenario.engine == "portfolio":
+        return asyncio.get_running_loop().run_in_executor(
+            None, _solve_scenario, problem, scenario
+        )
+    return asyncio.wrap_future(submit(_solve_scenario, problem, scenario))
 
 
 class OptimizerController:
     """
     Controller for cargo optimization operations.
 
-    Provides business logic for genetic algorithm optimization,
-    handling request processing and response formatting.
+    Provides business logic for cargo optimization, dispatching to the
+    requested engine and handling request processing and response formatting.
     """
 
     @staticmethod
-    def optimize(data: OptimizeRequest) -> OptimizeResponse:
+    def optimize(data: OptimizeRequest) -> Dict[str, Any]:
         """
         Optimize cargo loading using genetic algorithm.
 
@@ -30,48 +95,509 @@ class OptimizerController:
             data: Optimization request containing products and constraints
 
         Returns:
-            OptimizeResponse: Optimization results with selected products and metrics
+            Dict[str, Any]: Optimization results in the OptimizeResponse
+            format, ready to be encoded
 
         Raises:
             HTTPException: If optimization fails or constraints are invalid
         """
-        # Use default values for optional parameters
-        population_size = data.population_size or 200
-        number_generations = data.number_generations or 100
-        mutation_rate = data.mutation_rate or 0.01
-
-        ga = GeneticAlgorithm(
-            data.products,
-            data.limit,
-            population_size,
-            number_generations,
-            mutation_rate=mutation_rate
+        problem = Problem.from_products(data.products)
+        scenario = OptimizerController.resolve_warm_start(
+            OptimizeScenario.model_validate(data.model_dump(exclude={"products"}))
+        )
+        return OptimizerController.optimize_problem(problem, scenario)
+
+    @staticmethod
+    async def optimize_by_id(data: OptimizeByIdRequest) -> Dict[str, Any]:
+        """
+        Optimize cargo loading over products registered in products-service.
+
+        The product records are resolved through the cached catalog client,
+        then the search runs on the default thread pool.
+
+        Args:
+            data: Optimization request with product ids and amounts
+
+        Returns:
+            Dict[str, Any]: Optimization results in the OptimizeResponse
+            format, ready to be encoded
+
+        Raises:
+            HTTPException: If some product ids are unknown, products-service
+                is unreachable, or the warm start is unknown
+        """
+        try:
+            records = await product_catalog.resolve(data.items)
+        except UnknownProductsError as error:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown products: {', '.join(error.ids)}",
+            ) from None
+        except httpx.HTTPError:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Products service unavailable",
+            ) from None
+
+        problem = Problem(
+            [record.name for record in records],
+            [record.space for record in records],
+            [record.value for record in records],
+            [data.items[record.id] for record in records],
+        )
+        scenario = OptimizerController.resolve_warm_start(
+            OptimizeScenario.model_validate(data.model_dump(exclude={"items"}))
+        )
+        return await asyncio.get_running_loop().run_in_executor(
+            None, OptimizerController.optimize_problem, problem, scenario
+        )
+
+    @staticmethod
+    def optimize_problem(
+        problem: Problem, scenario: OptimizeScenario
+    ) -> Dict[str, Any]:
+        """
+        Solve a preprocessed problem and remember the result for warm starts.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            scenario: Scenario with its warm start already resolved
+
+        Returns:
+            Dict[str, Any]: Optimization results in the OptimizeResponse
+            format, ready to be encoded
+        """
+        result = OptimizerController.run(problem, scenario)
+        content = OptimizerController.build_content(problem, scenario, result)
+        OptimizerController.observe(scenario.engine, content["stats"])
+        content["result_id"] = OptimizerController.remember_selection(
+            problem, result.chromosome
         )
-        result = ga.run()
-
-        # Serialize the result into the response format
-        products: List[ProductOutput] = []
-        total_space: float = 0
-        total_value: float = 0
-
-        if result and hasattr(result, 'chromosome'):
-            for idx, gene in enumerate(result.chromosome):
-                if gene == '1':
-                    product = ga.products[idx]
-                    products.append(ProductOutput(
-                        name=product.name,
-                        space=product.space,
-                        value=product.value,
-                        amount=product.amount,
-                        total_space=product.space * product.amount,
-                        total_value=product.value * product.amount
-                    ))
-                    total_space += product.space * product.amount
-                    total_value += product.value * product.amount
-
-        return OptimizeResponse(
-            products=products,
-            total_space=total_space,
-            total_value=total_value
+        return content
+
+    @staticmethod
+    def resolve_warm_start(scenario: OptimizeScenario) -> OptimizeScenario:
+        """
+        Replace a warm start given by result id with the stored selection.
+
+        Runs before dispatching to worker processes, which do not share the
+        result store.
+
+        Args:
+            scenario: Scenario that may reference a previous result
+
+        Returns:
+            OptimizeScenario: Scenario whose warm start, if any, is a selection
+
+        Raises:
+            HTTPException: If the referenced result is unknown or expired
+        """
+        warm_start = scenario.warm_start
+        if warm_start is None or warm_start.result_id is None:
+            return scenario
+        selection = result_store.get(warm_start.result_id)
+        if selection is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Result not found"
+            )
+        return scenario.model_copy(
+            update={
+                "warm_start": warm_start.model_copy(
+                    update={"result_id": None, "selection": selection}
+                )
+            }
         )
 
+    @staticmethod
+    def remember(content: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a result so later requests can warm-start from it.
+
+        Args:
+            content: Optimization results in the OptimizeResponse format
+
+        Returns:
+            Dict[str, Any]: The same results, tagged with their result id
+        """
+        if content["trucks"] is not None:
+            selection = {
+                product["name"]: truck["truck"]
+                for truck in content["trucks"]
+                for product in truck["products"]
+            }
+        else:
+            selection = {product["name"]: 0 for product in content["products"]}
+        content["result_id"] = result_store.save(selection)
+        return content
+
+    @staticmethod
+    def remember_selection(problem: Problem, chromosome: np.ndarray) -> str:
+        """
+        Store a solution chromosome so later requests can warm-start from it.
+
+        Args:
+            problem: Preprocessed problem the chromosome refers to
+            chromosome: Truck of each product, counting from 1, or 0 when left out
+
+        Returns:
+            str: Result id of the stored selection
+        """
+        selected = np.flatnonzero(chromosome)
+        return result_store.save(
+            {problem.names[index]: int(chromosome[index]) - 1 for index in selected}
+        )
+
+    @staticmethod
+    def optimize_columnar(
+        payload: Dict[str, Any], compact: bool = False
+    ) -> Union[Dict[str, Any], CompactOptimizeResponse]:
+        """
+        Optimize a columnar request: parallel product arrays plus parameters.
+
+        The columns are validated in bulk and converted straight into the
+        problem arrays, without building a model per product.
+
+        Args:
+            payload: Decoded request body with the ``names``, ``spaces``,
+                ``values``, ``amounts`` and optional ``resources`` columns
+                next to the optimization parameters
+            compact: Return only the selected positions and totals
+
+        Returns:
+            Union[Dict[str, Any], CompactOptimizeResponse]: Optimization
+            results, in the OptimizeResponse format ready to be encoded
+            unless compact
+
+        Raises:
+            HTTPException: If the columns are missing or invalid, or the
+                referenced warm start is unknown
+            RequestValidationError: If the optimization parameters are invalid
+        """
+        columns = {
+            column: payload.pop(column) for column in COLUMNS if column in payload
+        }
+        missing = [column for column in COLUMNS[:4] if column not in columns]
+        try:
+            if missing:
+                raise ValueError(f"Missing columns: {', '.join(missing)}")
+            problem = Problem.from_columns(**columns)
+            scenario = OptimizeScenario.model_validate(payload)
+            check_capacities(problem.resources.shape[1], [scenario])
+        except ValidationError as error:
+            raise RequestValidationError(error.errors()) from None
+        except ValueError as error:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(error)
+            ) from None
+
+        scenario = OptimizerController.resolve_warm_start(scenario)
+        result = OptimizerController.run(problem, scenario)
+        result_id = OptimizerController.remember_selection(problem, result.chromosome)
+        if not compact:
+            content = OptimizerController.build_content(problem, scenario, result)
+            OptimizerController.observe(scenario.engine, content["stats"])
+            content["result_id"] = result_id
+            return content
+
+        stats = OptimizerController._stats(result)
+        OptimizerController.observe(scenario.engine, stats.model_dump())
+
+        selected = np.flatnonzero(result.chromosome)
+        return CompactOptimizeResponse(
+            selected=selected.tolist(),
+            trucks=(
+                (result.chromosome[selected] - 1).tolist()
+                if scenario.limits is not None
+                else None
+            ),
+            total_space=float(result.loads[:, 0].sum()),
+            total_value=result.value,
+            total_resources=(
+                result.loads[:, 1:].sum(axis=0).tolist()
+                if scenario.capacities
+                else None
+            ),
+            result_id=result_id,
+            stats=stats,
+        )
+
+    @staticmethod
+    def run(problem: Problem, scenario: OptimizeScenario) -> SolverResult:
+        """
+        Run the requested engine for one scenario over a preprocessed problem.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            scenario: Limit, engine and engine parameters
+
+        Returns:
+            SolverResult: Solution, statistics and bounds from the engine
+        """
+        seeds = None
+        if (
+            scenario.warm_start is not None
+            and scenario.warm_start.selection is not None
+        ):
+            seeds = problem.chromosome_from_selection(
+                scenario.warm_start.selection, len(scenario.truck_limits)
+            )
+        return get_solver(scenario.engine).solve(problem, scenario, seeds)
+
+    @staticmethod
+    def observe(engine: str, stats: Dict[str, Any]) -> None:
+        """
+        Record the metrics of a solve from its serialized statistics.
+
+        Args:
+            engine: Engine requested for the solve
+            stats: Engine instrumentation of the solve, in the OptimizeStats
+                format
+        """
+        observe_solve(
+            engine,
+            stats["elapsed_ms"] / 1000,
+            stats["iterations"],
+            stats["evaluations"],
+            stats["stop_reason"],
+        )
+
+    @staticmethod
+    def solve(problem: Problem, scenario: OptimizeScenario) -> Dict[str, Any]:
+        """
+        Run the requested engine and serialize its result.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            scenario: Limit, engine and engine parameters
+
+        Returns:
+            Dict[str, Any]: Optimization results in the OptimizeResponse
+            format, ready to be encoded
+        """
+        result = OptimizerController.run(problem, scenario)
+        return OptimizerController.build_content(problem, scenario, result)
+
+    @staticmethod
+    def build_content(
+        problem: Problem, scenario: OptimizeScenario, result: SolverResult
+    ) -> Dict[str, Any]:
+        """
+        Serialize a solver result straight into response content.
+
+        The OptimizeResponse format is assembled from the precomputed problem
+        arrays as plain dictionaries, with no model per product, to be
+        encoded without re-validation.
+
+        Args:
+            problem: Preprocessed problem the result refers to
+            scenario: Scenario the result was solved for
+            result: Solution, statistics and bounds from the engine
+
+        Returns:
+            Dict[str, Any]: Optimization results in the OptimizeResponse format
+        """
+        chromosome = result.chromosome
+        loads = result.loads
+        with_resources = bool(scenario.capacities)
+        trucks: Optional[List[Dict[str, Any]]] = None
+        if scenario.limits is not None:
+            trucks = []
+            for truck, limit in enumerate(scenario.limits):
+                indices = np.flatnonzero(chromosome == truck + 1)
+                trucks.append(
+                    {
+                        "truck": truck,
+                        "limit": limit,
+                        "products": OptimizerController._product_content(
+                            problem, indices
+                        ),
+                        "total_space": float(loads[truck, 0]),
+                        "total_value": float(problem.total_values[indices].sum()),
+                        "total_resources": (
+                            loads[truck, 1:].tolist() if with_resources else None
+                        ),
+                    }
+                )
+
+        return {
+            "products": OptimizerController._product_content(
+                problem, np.flatnonzero(chromosome)
+            ),
+            "total_space": float(loads[:, 0].sum()),
+            "total_value": result.value,
+            "total_resources": (
+                loads[:, 1:].sum(axis=0).tolist() if with_resources else None
+            ),
+            "trucks": trucks,
+            "generations": (
+                result.stats.iterations if result.stats.engine == "genetic" else None
+            ),
+            "result_id": None,
+            "stats": OptimizerController._stats(result).model_dump(),
+        }
+
+    @staticmethod
+    def _product_content(problem: Problem, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Build the response entries of the selected products as dictionaries.
+
+        Args:
+            problem: Preprocessed problem the indices refer to
+            indices: Indices of the selected products
+
+        Returns:
+            List[Dict[str, Any]]: One ProductOutput-shaped entry per product
+        """
+        names = problem.names
+        resources = (
+            problem.resources[indices].tolist()
+            if problem.resources.shape[1]
+            else repeat(None)
+        )
+        return [
+            {
+                "name": names[index],
+                "space": space,
+                "value": value,
+                "amount": amount,
+                "total_space": total_space,
+                "total_value": total_value,
+                "resources": product_resources,
+            }
+            for (
+                index,
+                space,
+                value,
+                amount,
+                total_space,
+                total_value,
+                product_resources,
+            ) in zip(
+                indices.tolist(),
+                problem.spaces[indices].tolist(),
+                problem.values[indices].tolist(),
+                problem.amounts[indices].tolist(),
+                problem.total_spaces[indices].tolist(),
+                problem.total_values[indices].tolist(),
+                resources,
+            )
+        ]
+
+    @staticmethod
+    def _stats(result: SolverResult) -> OptimizeStats:
+        """
+        Serialize the instrumentation and bounds of a solver result.
+
+        Args:
+            result: Solution, statistics and bounds from the engine
+
+        Returns:
+            OptimizeStats: Engine instrumentation and bounds
+        """
+        stats = result.stats
+        return OptimizeStats(
+            engine=stats.engine,
+            iterations=stats.iterations,
+            evaluations=stats.evaluations,
+            elapsed_ms=stats.elapsed * 1000,
+            stop_reason=stats.stop_reason,
+            lower_bound=result.lower_bound,
+            upper_bound=result.upper_bound,
+            optimal=result.optimal,
+            portfolio=(
+                [
+                    PortfolioEntry(
+                        engine=run.engine,
+                        status=run.status,
+                        value=run.value,
+                        elapsed_ms=(
+                            run.elapsed * 1000 if run.elapsed is not None else None
+                        ),
+                        optimal=run.optimal,
+                    )
+                    for run in result.portfolio
+                ]
+                if result.portfolio is not None
+                else None
+            ),
+            diversity=(
+                DiversityStats(
+                    hamming=[hamming for hamming, _ in stats.diversity],
+                    unique_ratio=[unique for _, unique in stats.diversity],
+                    restarts=stats.restarts,
+                )
+                if stats.diversity
+                else None
+            ),
+            tuned=stats.tuned,
+        )
+
+    @staticmethod
+    async def optimize_batch(data: OptimizeBatchRequest) -> Dict[str, Any]:
+        """
+        Optimize several scenarios over the same products in parallel.
+
+        Args:
+            data: Batch request with the shared products and the scenarios
+
+        Returns:
+            Dict[str, Any]: One result per scenario, in request order, in the
+            OptimizeBatchResponse format
+        """
+        problem = Problem.from_products(data.products)
+        scenarios = [
+            OptimizerController.resolve_warm_start(scenario)
+            for scenario in data.scenarios
+        ]
+        results = await asyncio.gather(
+            *(_dispatch(problem, scenario) for scenario in scenarios)
+        )
+        for scenario, result in zip(scenarios, results):
+            OptimizerController.observe(scenario.engine, result["stats"])
+        return {
+            "results": [
+                {"index": index, "result": OptimizerController.remember(result)}
+                for index, result in enumerate(results)
+            ]
+        }
+
+    @staticmethod
+    def stream_batch(data: OptimizeBatchRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Optimize several scenarios in parallel, yielding each as it finishes.
+
+        Warm starts are resolved before the iterator is returned, so invalid
+        requests fail before any result is streamed.
+
+        Args:
+            data: Batch request with the shared products and the scenarios
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Scenario results tagged with their
+            request index, in completion order, in the OptimizeBatchItem
+            format
+        """
+        problem = Problem.from_products(data.products)
+        scenarios = [
+            OptimizerController.resolve_warm_start(scenario)
+            for scenario in data.scenarios
+        ]
+
+        async def run(index: int, scenario: OptimizeScenario) -> Dict[str, Any]:
+            result = await _dispatch(problem, scenario)
+            OptimizerController.observe(scenario.engine, result["stats"])
+            return {"index": index, "result": OptimizerController.remember(result)}
+
+        async def completed() -> AsyncIterator[Dict[str, Any]]:
+            tasks = [
+                asyncio.ensure_future(run(index, scenario))
+                for index, scenario in enumerate(scenarios)
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return completed()
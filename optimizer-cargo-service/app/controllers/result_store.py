@@ -0,0 +1,83 @@
+"""
+Result Store Module.
+
+This module keeps the most recent optimization results in memory so that a
+later request can warm-start from them by id.
+"""
+
+import os
+import uuid
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional
+
+# Maximum number of results remembered for warm starts
+RESULT_STORE_SIZE: int = int(os.getenv("RESULT_STORE_SIZE", "256"))
+
+
+class ResultStore:
+    """
+    Bounded, least-recently-used store of optimization results.
+
+    Only the assignment of each product (product name to truck position) is
+    kept, which is all a warm start needs.
+
+    Attributes:
+        max_size: Maximum number of results kept
+        hits: Lookups that found their result
+        misses: Lookups of unknown or evicted results
+    """
+
+    def __init__(self, max_size: int = RESULT_STORE_SIZE) -> None:
+        """
+        Initialize the result store.
+
+        Args:
+            max_size: Maximum number of results kept before evicting the
+                least recently used one
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._results: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+        self._lock = Lock()
+
+    def save(self, selection: Dict[str, int]) -> str:
+        """
+        Store a result and return its id.
+
+        Args:
+            selection: Truck position of each loaded product, by name
+
+        Returns:
+            str: Id to reference the result in later requests
+        """
+        result_id = uuid.uuid4().hex
+        with self._lock:
+            self._results[result_id] = selection
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        return result_id
+
+    def get(self, result_id: str) -> Optional[Dict[str, int]]:
+        """
+        Retrieve a stored result.
+
+        Args:
+            result_id: Id returned when the result was saved
+
+        Returns:
+            Optional[Dict[str, int]]: Truck position of each loaded product,
+            or None if the id is unknown or was evicted
+        """
+        with self._lock:
+            selection = self._results.get(result_id)
+            if selection is not None:
+                self.hits += 1
+                self._results.move_to_end(result_id)
+            else:
+                self.misses += 1
+            return selection
+
+
+result_store = ResultStore()
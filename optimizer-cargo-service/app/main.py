@@ -6,8 +6,12 @@ service. It handles route registration for the genetic algorithm optimizer
 and provides endpoints for cargo optimization using genetic algorithms.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from .services.metrics import MetricsMiddleware
+from .services.product_catalog import product_catalog
+from .solvers.pool import shutdown_executor
 from .routers.optimizer_router import router as optimizer_router
 
 
@@ -16,6 +20,7 @@ app = FastAPI(
     description="Service for optimizing cargo loading using genetic algorithms",
     version="1.0.0"
 )
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/health/")
 async def health_check():
@@ -27,4 +32,28 @@ async def health_check():
     """
     return {"status": "healthy", "service": "optimizer-cargo-service"}
 
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """
+    Prometheus metrics endpoint.
+
+    Returns:
+        Response: Current metrics in the Prometheus text format
+    """
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    """
+    Application shutdown event handler.
+
+    Stops the worker processes used by batch and portfolio optimizations
+    and closes the connection pool to products-service.
+    """
+    shutdown_executor()
+    await product_catalog.close()
+
+
 app.include_router(optimizer_router)
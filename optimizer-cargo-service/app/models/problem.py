@@ -0,0 +1,414 @@
+"""
+problem.py
+
+This module implements the Problem class, the preprocessed representation of a
+product catalog shared by every optimization run over the same products.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.product import ProductInput
+
+
+class Problem:
+    """
+    Preprocessed optimization problem built once from a product list.
+
+    Holds per-product totals (unit figure multiplied by the amount) as numpy
+    arrays so that a whole population can be scored at once, and so that
+    several scenarios can reuse the same instance, including across worker
+    processes.
+
+    Attributes:
+        names (Tuple[str, ...]): Product names.
+        spaces (np.ndarray): Unit space of each product.
+        values (np.ndarray): Unit value of each product.
+        amounts (np.ndarray): Quantity of each product.
+        total_spaces (np.ndarray): Space of each product times its amount.
+        total_values (np.ndarray): Value of each product times its amount.
+        resources (np.ndarray): Unit consumption of each extra resource,
+            shape (products, resources).
+        weights (np.ndarray): Constraint matrix with the total consumption of
+            every dimension, space first, shape (products, 1 + resources).
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        spaces: List[float],
+        values: List[float],
+        amounts: List[int],
+        resources: Optional[List[List[float]]] = None,
+    ) -> None:
+        """
+        Initializes a Problem instance and precomputes the product totals.
+
+        Args:
+            names (List[str]): Product names.
+            spaces (List[float]): Unit space of each product.
+            values (List[float]): Unit value of each product.
+            amounts (List[int]): Quantity of each product.
+            resources (Optional[List[List[float]]]): Unit consumption of the
+                extra resources (weight, volume, ...) of each product, all of
+                the same length. Defaults to no extra resources.
+        """
+        self.names: Tuple[str, ...] = tuple(names)
+        self.spaces = np.asarray(spaces, dtype=np.float64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.amounts = np.asarray(amounts, dtype=np.int64)
+        self.total_spaces = self.spaces * self.amounts
+        self.total_values = self.values * self.amounts
+        width = len(resources[0]) if resources is not None and len(resources) else 0
+        self.resources = np.asarray(
+            resources if width else np.zeros((len(self.names), 0)), dtype=np.float64
+        ).reshape(len(self.names), width)
+        self.weights = np.column_stack(
+            [self.total_spaces, self.resources * self.amounts[:, np.newaxis]]
+        )
+
+    @classmethod
+    def from_products(cls, products: List[ProductInput]) -> "Problem":
+        """
+        Builds a Problem from the products of an optimization request.
+
+        Args:
+            products (List[ProductInput]): Products to optimize.
+
+        Returns:
+            Problem: The preprocessed problem.
+        """
+        dimensions = {len(p.resources or []) for p in products}
+        if len(dimensions) > 1:
+            raise ValueError("All products must declare the same resources")
+        return cls(
+            [p.name for p in products],
+            [p.space for p in products],
+            [p.value for p in products],
+            [p.amount for p in products],
+            [p.resources or [] for p in products],
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        names: Sequence[str],
+        spaces: Sequence[float],
+        values: Sequence[float],
+        amounts: Sequence[int],
+        resources: Optional[Sequence[Sequence[float]]] = None,
+    ) -> "Problem":
+        """
+        Builds a Problem from parallel product columns, validating them in bulk.
+
+        Args:
+            names (Sequence[str]): Product names.
+            spaces (Sequence[float]): Unit space of each product.
+            values (Sequence[float]): Unit value of each product.
+            amounts (Sequence[int]): Quantity of each product.
+            resources (Optional[Sequence[Sequence[float]]]): Unit consumption
+                of the extra resources of each product, one row per product.
+
+        Returns:
+            Problem: The preprocessed problem.
+
+        Raises:
+            ValueError: If the columns differ in length, or hold non-string
+                names, non-finite numbers or non-integer amounts.
+        """
+        if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+            raise ValueError("'names' must be a list of strings")
+        count = len(names)
+        columns = {}
+        for column, data in (
+            ("spaces", spaces),
+            ("values", values),
+            ("amounts", amounts),
+        ):
+            try:
+                array = np.asarray(data, dtype=np.float64)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{column}' must be a list of numbers") from None
+            if array.shape != (count,):
+                raise ValueError(f"'{column}' must have one number per name ({count})")
+            if not np.all(np.isfinite(array)):
+                raise ValueError(f"'{column}' must hold finite numbers")
+            columns[column] = array
+        if not np.all(columns["amounts"] == np.round(columns["amounts"])):
+            raise ValueError("'amounts' must hold integers")
+
+        matrix = None
+        if resources is not None and count:
+            try:
+                matrix = np.asarray(resources, dtype=np.float64)
+            except (TypeError, ValueError):
+                raise ValueError(
+                    "'resources' must be a list of rows of numbers"
+                ) from None
+            if matrix.ndim != 2 or len(matrix) != count:
+                raise ValueError(f"'resources' must have one row per name ({count})")
+            if not np.all(np.isfinite(matrix)):
+                raise ValueError("'resources' must hold finite numbers")
+        return cls(
+            names,
+            columns["spaces"],
+            columns["values"],
+            columns["amounts"].astype(np.int64),
+            matrix,
+        )
+
+    def __len__(self) -> int:
+        """
+        Returns the number of products in the problem.
+
+        Returns:
+            int: Number of products.
+        """
+        return len(self.names)
+
+    @property
+    def dimensions(self) -> int:
+        """
+        Returns the number of capacity dimensions, space included.
+
+        Returns:
+            int: Number of columns of the constraint matrix.
+        """
+        return self.weights.shape[1]
+
+    @staticmethod
+    def capacity_matrix(
+        limits: Sequence[float], capacities: Optional[Sequence[float]] = None
+    ) -> np.ndarray:
+        """
+        Builds the capacity of every truck in every dimension.
+
+        Args:
+            limits (Sequence[float]): Space limit of each truck.
+            capacities (Optional[Sequence[float]]): Capacity of each extra
+                resource, shared by all trucks. Defaults to space only.
+
+        Returns:
+            np.ndarray: Capacities, shape (trucks, dimensions).
+        """
+        limits = np.atleast_1d(np.asarray(limits, dtype=np.float64))
+        extra = np.asarray(capacities or [], dtype=np.float64)
+        return np.column_stack([limits, np.tile(extra, (len(limits), 1))])
+
+    def chromosome_from_selection(
+        self, selection: Dict[str, int], trucks: int
+    ) -> np.ndarray:
+        """
+        Remaps a previous solution onto the products of this problem.
+
+        Products are matched by name; products missing from the selection, or
+        assigned to a truck the fleet no longer has, start unloaded.
+
+        Args:
+            selection (Dict[str, int]): Truck position (counting from 0) of
+                each loaded product, by name.
+            trucks (int): Number of trucks in the fleet.
+
+        Returns:
+            np.ndarray: Chromosome with the truck of each product, counting
+            from 1, or 0 when left out.
+        """
+        chromosome = np.zeros(len(self), dtype=np.int16)
+        for index, name in enumerate(self.names):
+            truck = selection.get(name)
+            if truck is not None and 0 <= truck < trucks:
+                chromosome[index] = truck + 1
+        return chromosome
+
+    def densities(self, capacities: np.ndarray) -> np.ndarray:
+        """
+        Computes the value density of every product.
+
+        The density is the total value per unit of consumption, with each
+        dimension normalized by its largest capacity so they can be summed;
+        products that consume nothing get an infinite density.
+
+        Args:
+            capacities (np.ndarray): Capacity of each truck in each checked
+                dimension, shape (trucks, dimensions).
+
+        Returns:
+            np.ndarray: Density of each product, shape (products,).
+        """
+        weights = self.weights[:, : capacities.shape[1]]
+        # Normaliza cada dimensão pela maior capacidade para somá-las
+        scale = np.maximum(capacities.max(axis=0), np.finfo(np.float64).tiny)
+        consumption = (weights / scale).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(consumption > 0, self.total_values / consumption, np.inf)
+
+    def greedy_chromosome(self, capacities: np.ndarray) -> np.ndarray:
+        """
+        Builds a feasible solution by value density.
+
+        Products are taken in decreasing order of value per unit of
+        (normalized) consumption and placed in the first truck where they fit.
+
+        Args:
+            capacities (np.ndarray): Capacity of each truck in each checked
+                dimension, shape (trucks, dimensions).
+
+        Returns:
+            np.ndarray: Chromosome with the truck of each product, counting
+            from 1, or 0 when left out.
+        """
+        chromosome = np.zeros(len(self), dtype=np.int16)
+        self._fill(chromosome, capacities, self.densities(capacities))
+        return chromosome
+
+    def _fill(
+        self, chromosome: np.ndarray, capacities: np.ndarray, density: np.ndarray
+    ) -> None:
+        """
+        Loads the unloaded products, in place, by decreasing density.
+
+        Each product with a positive value goes to the first truck where it
+        still fits; the chromosome must already be feasible.
+
+        Args:
+            chromosome (np.ndarray): Feasible chromosome to complete.
+            capacities (np.ndarray): Capacity of each truck in each checked
+                dimension, shape (trucks, dimensions).
+            density (np.ndarray): Density of each product.
+        """
+        weights = self.weights[:, : capacities.shape[1]]
+        remaining = capacities.copy()
+        for truck in range(len(capacities)):
+            remaining[truck] -= weights[chromosome == truck + 1].sum(axis=0)
+        remaining = remaining.tolist()
+        rows = weights.tolist()
+        values = self.total_values.tolist()
+        for index in np.argsort(-density, kind="stable").tolist():
+            if chromosome[index] or values[index] <= 0:
+                continue
+            row = rows[index]
+            for truck, free in enumerate(remaining):
+                if all(w <= f for w, f in zip(row, free)):
+                    remaining[truck] = [f - w for w, f in zip(row, free)]
+                    chromosome[index] = truck + 1
+                    break
+
+    def repair(self, chromosome: np.ndarray, capacities: np.ndarray) -> np.ndarray:
+        """
+        Makes a chromosome feasible by unloading its least dense products.
+
+        Products are unloaded from each overloaded truck in increasing order
+        of value density, skipping those that do not consume any dimension
+        still over capacity, until every dimension fits. The space freed is
+        then refilled greedily by density, so unloading more than needed (or
+        a product that alone exceeds a truck) does not empty the load.
+
+        Args:
+            chromosome (np.ndarray): Chromosome to repair.
+            capacities (np.ndarray): Capacity of each truck in each checked
+                dimension, shape (trucks, dimensions).
+
+        Returns:
+            np.ndarray: A feasible copy of the chromosome.
+        """
+        repaired = chromosome.copy()
+        weights = self.weights[:, : capacities.shape[1]]
+        density = self.densities(capacities)
+        for truck, capacity in enumerate(capacities, start=1):
+            loaded = np.flatnonzero(repaired == truck)
+            load = weights[loaded].sum(axis=0)
+            for product in loaded[np.argsort(density[loaded], kind="stable")]:
+                over = load > capacity
+                if not over.any():
+                    break
+                # Só descarrega quem alivia uma dimensão ainda excedida
+                if np.any(weights[product][over] > 0):
+                    repaired[product] = 0
+                    load = load - weights[product]
+        self._fill(repaired, capacities, density)
+        return repaired
+
+    def upper_bound(self, capacities: np.ndarray) -> float:
+        """
+        Computes an upper bound on the value of any feasible load.
+
+        For each dimension the trucks are merged into one knapsack with the
+        summed capacity and solved as a linear relaxation (fractional
+        knapsack by value density); every such relaxation bounds the real
+        problem, so the smallest one is returned.
+
+        Args:
+            capacities (np.ndarray): Capacity of each truck in each checked
+                dimension, shape (trucks, dimensions).
+
+        Returns:
+            float: Upper bound on the total value.
+        """
+        values = np.maximum(self.total_values, 0.0)
+        bound = float(values.sum())
+        for dimension, capacity in enumerate(capacities.sum(axis=0)):
+            weights = self.weights[:, dimension]
+            free = weights <= 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                density = np.where(free, np.inf, values / weights)
+            order = np.argsort(-density, kind="stable")
+            cumulative = np.cumsum(np.where(free, 0.0, weights)[order])
+            # Itens inteiros até a capacidade, depois a fração do próximo
+            whole = int(np.searchsorted(cumulative, capacity, side="right"))
+            relaxed = float(values[order[:whole]].sum())
+            if whole < len(order):
+                used = cumulative[whole - 1] if whole else 0.0
+                relaxed += float(density[order[whole]] * (capacity - used))
+            bound = min(bound, relaxed)
+        return bound
+
+    def evaluate(
+        self, population: np.ndarray, capacities: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Scores a whole population of chromosomes in one vectorized pass.
+
+        Each gene holds the truck a product is assigned to, counting from 1,
+        or 0 when the product is left out. The load of every truck in every
+        dimension comes from a product with the constraint matrix, and a
+        chromosome that exceeds any capacity gets the penalty note 1.
+
+        Args:
+            population (np.ndarray): Chromosomes, shape (subjects, products).
+            capacities (np.ndarray): Capacity of each truck in each checked
+                dimension, shape (trucks, dimensions); dimensions beyond its
+                width are ignored.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Evaluation notes, shape (subjects,),
+            and load per truck and dimension, shape (subjects, trucks, dimensions).
+        """
+        subjects = population.shape[0]
+        trucks, dimensions = capacities.shape
+        weights = self.weights[:, :dimensions]
+        values = (population > 0) @ self.total_values
+        if trucks == 1:
+            # Uma única multiplicação de matrizes:
+            # (indivíduos x produtos) @ (produtos x dimensões)
+            loads = ((population == 1) @ weights)[:, np.newaxis, :]
+        else:
+            # Soma cada dimensão por (indivíduo, caminhão) com um único bincount
+            index = (
+                np.arange(subjects)[:, np.newaxis] * (trucks + 1) + population
+            ).ravel()
+            loads = np.stack(
+                [
+                    np.bincount(
+                        index,
+                        weights=np.tile(weights[:, dimension], subjects),
+                        minlength=subjects * (trucks + 1),
+                    ).reshape(subjects, trucks + 1)[:, 1:]
+                    for dimension in range(dimensions)
+                ],
+                axis=-1,
+            )
+        feasible = np.all(loads <= capacities, axis=(1, 2))
+        # Penalidade: carga que excede alguma capacidade recebe nota 1
+        notes = np.where(feasible, values, 1.0)
+        return notes, loads
@@ -5,23 +5,79 @@ This module contains the FastAPI router for optimization endpoints.
 It provides the main optimization endpoint using genetic algorithms.
 """
 
-from fastapi import APIRouter
+import json
+from typing import Any, AsyncIterator, Dict, Union
 
-from app.controllers.optimizer_controller import OptimizerController
-from app.schemas.optimize import OptimizeRequest, OptimizeResponse
+import msgpack
+import orjson
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
+from app.controllers.optimizer_controller import OptimizerController
+from app.schemas.optimize import (
+    CompactOptimizeResponse,
+    OptimizeBatchRequest,
+    OptimizeBatchResponse,
+    OptimizeByIdRequest,
+    OptimizeRequest,
+    OptimizeResponse,
+)
 
 router = APIRouter(prefix="/optimize", tags=["optimize"])
 
+# Content types decoded as MessagePack by the columnar endpoint
+MSGPACK_TYPES = (
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/vnd.msgpack",
+)
+
+
+async def _decode_body(request: Request) -> Dict[str, Any]:
+    """
+    Decode a JSON or MessagePack request body into a dictionary.
+
+    Args:
+        request: Incoming request; its content type selects the decoder.
+
+    Returns:
+        Dict[str, Any]: Decoded body.
 
-@router.post("/", response_model=OptimizeResponse)
-async def optimize(data: OptimizeRequest) -> OptimizeResponse:
+    Raises:
+        HTTPException: If the body cannot be decoded or is not an object.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        if content_type in MSGPACK_TYPES:
+            payload = msgpack.unpackb(body, raw=False)
+        else:
+            payload = json.loads(body)
+    except (ValueError, msgpack.UnpackException):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed request body"
+        ) from None
+    if not isinstance(payload, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request body must be an object",
+        )
+    return payload
+
+
+@router.post("/", response_model=OptimizeResponse, response_class=ORJSONResponse)
+def optimize(data: OptimizeRequest) -> ORJSONResponse:
     """
     Optimize cargo loading using genetic algorithm.
 
     This endpoint receives a list of products with quantities and space
     constraints, then uses a genetic algorithm to find the optimal
     combination that maximizes value while respecting space limits.
+    Declared synchronous so that FastAPI runs the search on its thread
+    pool instead of blocking the event loop. The response is assembled from
+    the result arrays and encoded with orjson, skipping the re-validation
+    of ``response_model`` (kept for the documentation).
 
     Args:
         data: Optimization request containing products and constraints.
@@ -33,4 +89,91 @@ async def optimize(data: OptimizeRequest) -> OptimizeResponse:
     Raises:
         HTTPException: If optimization fails or invalid data is provided.
     """
-    return OptimizerController.optimize(data)
+    return ORJSONResponse(OptimizerController.optimize(data))
+
+
+@router.post("/by-id", response_model=OptimizeResponse, response_class=ORJSONResponse)
+async def optimize_by_id(data: OptimizeByIdRequest) -> ORJSONResponse:
+    """
+    Optimize cargo loading over products registered in products-service.
+
+    Only product ids and amounts are sent; the optimizer resolves the
+    product records from its cached copy of the catalog.
+
+    Args:
+        data: Optimization request with product ids, amounts and parameters.
+
+    Returns:
+        OptimizeResponse: Optimization results, encoded with orjson.
+
+    Raises:
+        HTTPException: If product ids are unknown or products-service is
+            unavailable.
+    """
+    return ORJSONResponse(await OptimizerController.optimize_by_id(data))
+
+
+@router.post(
+    "/columnar",
+    response_model=Union[CompactOptimizeResponse, OptimizeResponse],
+    response_class=ORJSONResponse,
+)
+async def optimize_columnar(
+    request: Request, compact: bool = False
+) -> Union[CompactOptimizeResponse, ORJSONResponse]:
+    """
+    Optimize a large catalog sent as parallel product columns.
+
+    The body holds ``names``, ``spaces``, ``values``, ``amounts`` and
+    optionally ``resources`` (one row per product) next to the usual
+    optimization parameters. It is read as MessagePack when sent with a
+    MessagePack content type and as JSON otherwise.
+
+    Args:
+        request: Request with the columnar body.
+        compact: When true, return only the positions of the loaded
+            products and the totals.
+
+    Returns:
+        Union[CompactOptimizeResponse, OptimizeResponse]: Optimization results.
+    """
+    payload = await _decode_body(request)
+    result = await run_in_threadpool(
+        OptimizerController.optimize_columnar, payload, compact
+    )
+    return result if compact else ORJSONResponse(result)
+
+
+@router.post(
+    "/batch", response_model=OptimizeBatchResponse, response_class=ORJSONResponse
+)
+async def optimize_batch(
+    data: OptimizeBatchRequest, stream: bool = False
+) -> Union[ORJSONResponse, StreamingResponse]:
+    """
+    Optimize several what-if scenarios over the same products.
+
+    The products are preprocessed once and every scenario (limit, genetic
+    algorithm parameters and seed) runs in parallel on a worker pool. Results
+    are assembled as plain dictionaries and encoded with orjson, like the
+    single-scenario endpoint.
+
+    Args:
+        data: Batch request with the shared products and the scenarios.
+        stream: When true, stream results as NDJSON in completion order,
+            each line tagged with its scenario index.
+
+    Returns:
+        OptimizeBatchResponse: Results in request order, or a streaming
+        NDJSON response when ``stream`` is set.
+    """
+    if not stream:
+        return ORJSONResponse(await OptimizerController.optimize_batch(data))
+
+    items = OptimizerController.stream_batch(data)
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for item in items:
+            yield orjson.dumps(item) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
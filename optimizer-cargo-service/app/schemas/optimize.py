@@ -5,14 +5,212 @@ This module contains Pydantic models for optimization request and response
 data structures used in the genetic algorithm optimization process.
 """
 
-from typing import List, Optional
+from typing import Annotated, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from .product import ProductInput, ProductOutput
 
 
-class OptimizeRequest(BaseModel):
+class WarmStart(BaseModel):
+    """
+    Previous solution used to seed the genetic algorithm.
+
+    Exactly one of ``result_id`` or ``selection`` must be given. Products are
+    matched by name, so the previous solution is remapped onto the current
+    product list: new products start unloaded and removed ones are dropped.
+
+    Attributes:
+        result_id: Id of a previous result returned by the service
+        selection: Truck position (0 for a single truck) of each loaded
+            product, by product name
+    """
+
+    result_id: Optional[str] = None
+    selection: Optional[Dict[str, int]] = None
+
+    @model_validator(mode="after")
+    def check_source(self) -> "WarmStart":
+        """
+        Ensure the previous solution comes from exactly one source.
+
+        Returns:
+            WarmStart: The validated warm start
+
+        Raises:
+            ValueError: If both or neither of result_id and selection are set
+        """
+        if (self.result_id is None) == (self.selection is None):
+            raise ValueError("Provide either 'result_id' or 'selection', not both")
+        return self
+
+
+class LocalSearchParameters(BaseModel):
+    """
+    Memetic local search applied to the best subjects of each generation.
+
+    Attributes:
+        elite: Number of top subjects improved per generation (default: 5)
+        max_evaluations: Move evaluations allowed per generation (default: 1000)
+        time_budget_ms: Milliseconds allowed per generation (default: no limit)
+    """
+
+    elite: int = Field(default=5, ge=1)
+    max_evaluations: int = Field(default=1000, ge=1)
+    time_budget_ms: Optional[float] = Field(default=None, gt=0)
+
+
+class RestartParameters(BaseModel):
+    """
+    Partial restarts of the genetic algorithm when its population converges.
+
+    Attributes:
+        min_diversity: Mean Hamming distance between subjects, as a share of
+            the products, below which the population restarts (default: 0.05)
+        keep: Share of the best subjects kept on a restart (default: 0.1)
+    """
+
+    min_diversity: float = Field(default=0.05, gt=0, lt=1)
+    keep: float = Field(default=0.1, gt=0, lt=1)
+
+
+class OptimizeParameters(BaseModel):
+    """
+    Capacity and genetic algorithm parameters of an optimization run.
+
+    Exactly one of ``limit`` (single truck) or ``limits`` (fleet, one limit
+    per truck) must be given. ``capacities`` adds further dimensions (weight,
+    volume, ...) checked against the product ``resources`` of every truck.
+
+    Attributes:
+        limit: Maximum space limit for the cargo of a single truck
+        limits: Maximum space limit of each truck of a fleet
+        capacities: Capacity of each extra resource, shared by all trucks
+        mutation_rate: Genetic algorithm mutation rate (default: 0.01)
+        number_generations: Number of generations to run (default: 100)
+        population_size: Size of the population (default: 200)
+        seed: Random seed for reproducible runs (default: unseeded)
+        warm_start: Previous solution to seed the initial population
+        stall_generations: Stop after this many generations without
+            improving the best solution (default: run every generation)
+        local_search: Hill climbing on the elite of each generation
+            (default: disabled)
+        restarts: Partial restarts when the population converges
+            (default: disabled)
+        track_diversity: Return the population diversity of every generation
+            of the genetic engine; always returned when restarts are enabled
+            (default: False)
+        auto_tune: Choose population_size, number_generations and
+            mutation_rate from the products, the capacities and the latency
+            target, ignoring the values given (default: False)
+        latency_target_ms: Latency the auto-tuned run aims for (default:
+            time_limit_ms, or AUTO_TUNE_LATENCY_MS)
+        engine: Optimization engine: "genetic", "annealing", "tabu",
+            "greedy", "exact" (single truck only) or "portfolio", which races
+            greedy, exact and genetic (default: "genetic")
+        max_iterations: Iterations of the annealing and tabu engines
+            (default: chosen from the number of products)
+        time_limit_ms: Wall-time limit of the run, for every engine
+            (default: no limit, or PORTFOLIO_TIME_LIMIT_MS for the portfolio)
+        initial_temperature: Starting temperature of simulated annealing
+            (default: 10% of the mean product value)
+        tabu_tenure: Iterations a moved product stays tabu
+            (default: chosen from the number of products)
+    """
+
+    limit: Optional[float] = Field(default=None, gt=0)
+    limits: Optional[List[Annotated[float, Field(gt=0)]]] = Field(
+        default=None, min_length=1
+    )
+    capacities: Optional[List[float]] = None
+    mutation_rate: Optional[float] = Field(default=0.01, ge=0, le=1)
+    number_generations: Optional[int] = Field(default=100, ge=1)
+    population_size: Optional[int] = Field(default=200, ge=1)
+    seed: Optional[int] = None
+    warm_start: Optional[WarmStart] = None
+    stall_generations: Optional[int] = Field(default=None, ge=1)
+    local_search: Optional[LocalSearchParameters] = None
+    restarts: Optional[RestartParameters] = None
+    track_diversity: bool = False
+    auto_tune: bool = False
+    latency_target_ms: Optional[float] = Field(default=None, gt=0)
+    engine: Literal["genetic", "annealing", "tabu", "greedy", "exact", "portfolio"] = (
+        "genetic"
+    )
+    max_iterations: Optional[int] = Field(default=None, ge=1)
+    time_limit_ms: Optional[float] = Field(default=None, gt=0)
+    initial_temperature: Optional[float] = Field(default=None, gt=0)
+    tabu_tenure: Optional[int] = Field(default=None, ge=1)
+
+    @model_validator(mode="after")
+    def check_limits(self) -> "OptimizeParameters":
+        """
+        Ensure a single truck limit or a fleet of limits is provided.
+
+        Returns:
+            OptimizeParameters: The validated parameters
+
+        Raises:
+            ValueError: If both or neither of limit and limits are set, or
+                the exact engine is requested for a fleet
+        """
+        if (self.limit is None) == (self.limits is None):
+            raise ValueError("Provide either 'limit' or 'limits', not both")
+        if self.engine == "exact" and len(self.truck_limits) > 1:
+            raise ValueError("The 'exact' engine supports a single truck")
+        return self
+
+    @property
+    def truck_limits(self) -> List[float]:
+        """
+        Space limit of each truck, a single-item list for one truck.
+
+        Returns:
+            List[float]: Truck limits
+        """
+        return self.limits if self.limits is not None else [self.limit]
+
+
+def check_resources(
+    products: List[ProductInput], parameters: List[OptimizeParameters]
+) -> None:
+    """
+    Ensure the product resources match the requested capacities.
+
+    Args:
+        products: Products of the request
+        parameters: Capacity parameters the products will be checked against
+
+    Raises:
+        ValueError: If products declare different numbers of resources, or a
+            capacity vector does not match the declared resources
+    """
+    dimensions = {len(p.resources or []) for p in products}
+    if len(dimensions) > 1:
+        raise ValueError("All products must declare the same number of resources")
+    check_capacities(dimensions.pop() if dimensions else 0, parameters)
+
+
+def check_capacities(declared: int, parameters: List[OptimizeParameters]) -> None:
+    """
+    Ensure every capacity vector matches the number of declared resources.
+
+    Args:
+        declared: Number of extra resources declared by the products
+        parameters: Capacity parameters the products will be checked against
+
+    Raises:
+        ValueError: If a capacity vector does not match the declared resources
+    """
+    for item in parameters:
+        if item.capacities and len(item.capacities) != declared:
+            raise ValueError(
+                f"'capacities' has {len(item.capacities)} entries but products "
+                f"declare {declared} resources"
+            )
+
+
+class OptimizeRequest(OptimizeParameters):
     """
     Request model for cargo optimization.
 
@@ -21,17 +219,138 @@ class OptimizeRequest(BaseModel):
 
     Attributes:
         products: List of products to optimize
-        limit: Maximum space limit for the cargo
-        mutation_rate: Genetic algorithm mutation rate (default: 0.01)
-        number_generations: Number of generations to run (default: 100)
-        population_size: Size of the population (default: 200)
     """
 
     products: List[ProductInput]
+
+    @model_validator(mode="after")
+    def check_products(self) -> "OptimizeRequest":
+        """
+        Ensure the product resources match the requested capacities.
+
+        Returns:
+            OptimizeRequest: The validated request
+        """
+        check_resources(self.products, [self])
+        return self
+
+
+class OptimizeByIdRequest(OptimizeParameters):
+    """
+    Request model for cargo optimization over registered products.
+
+    The product records are resolved by the optimizer from products-service.
+
+    Attributes:
+        items: Amount of each product to load, by product id
+    """
+
+    items: Dict[str, int] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def check_items(self) -> "OptimizeByIdRequest":
+        """
+        Ensure amounts are positive; registered products have no resources.
+
+        Returns:
+            OptimizeByIdRequest: The validated request
+
+        Raises:
+            ValueError: If an amount is not positive, or capacities are given
+        """
+        if any(amount < 1 for amount in self.items.values()):
+            raise ValueError("Every amount in 'items' must be at least 1")
+        check_capacities(0, [self])
+        return self
+
+
+class TruckLoad(BaseModel):
+    """
+    Products assigned to one truck of a fleet optimization.
+
+    Attributes:
+        truck: Position of the truck in the request ``limits``
+        limit: Maximum space limit of the truck
+        products: Products loaded in the truck
+        total_space: Space used in the truck
+        total_value: Value loaded in the truck
+        total_resources: Consumption of each extra resource in the truck
+    """
+
+    truck: int
     limit: float
-    mutation_rate: Optional[float] = 0.01
-    number_generations: Optional[int] = 100
-    population_size: Optional[int] = 200
+    products: List[ProductOutput]
+    total_space: float
+    total_value: float
+    total_resources: Optional[List[float]] = None
+
+
+class PortfolioEntry(BaseModel):
+    """
+    How one engine raced by the portfolio engine did.
+
+    Attributes:
+        engine: Name of the engine
+        status: "finished", "failed", "timed_out" (still running at the
+            deadline), "superseded" (still running when another engine proved
+            optimality) or "cancelled" (never started)
+        value: Value of the engine's load, when it finished
+        elapsed_ms: Wall time of the engine's run, when it finished
+        optimal: Whether the engine proved its load optimal
+    """
+
+    engine: str
+    status: str
+    value: Optional[float] = None
+    elapsed_ms: Optional[float] = None
+    optimal: bool = False
+
+
+class DiversityStats(BaseModel):
+    """
+    Population diversity of a genetic algorithm run, one entry per generation.
+
+    Attributes:
+        hamming: Mean Hamming distance between subjects, as a share of the
+            products
+        unique_ratio: Share of distinct chromosomes in the population
+        restarts: Partial restarts performed
+    """
+
+    hamming: List[float]
+    unique_ratio: List[float]
+    restarts: int
+
+
+class OptimizeStats(BaseModel):
+    """
+    Instrumentation and bounds of the engine that produced a result.
+
+    Attributes:
+        engine: Engine that produced the result (the winner, for the portfolio)
+        iterations: Iterations executed (generations for the genetic algorithm)
+        evaluations: Candidate solutions or moves evaluated
+        elapsed_ms: Wall time of the run in milliseconds
+        stop_reason: Why the run ended
+        lower_bound: Value of the returned feasible load
+        upper_bound: Bound no feasible load can exceed
+        optimal: Whether the result is proven optimal
+        portfolio: Engines raced by the portfolio engine, when it was used
+        diversity: Population diversity, for the genetic engine
+        tuned: Genetic algorithm parameters chosen by the automatic tuning
+    """
+
+    engine: str
+    iterations: int
+    evaluations: int
+    elapsed_ms: float
+    stop_reason: str
+    lower_bound: float
+    upper_bound: float
+    optimal: bool
+    portfolio: Optional[List[PortfolioEntry]] = None
+    diversity: Optional[DiversityStats] = None
+    tuned: Optional[Dict[str, Union[int, float]]] = None
 
 
 class OptimizeResponse(BaseModel):
@@ -45,8 +364,105 @@ class OptimizeResponse(BaseModel):
         products: List of selected products with quantities
         total_space: Total space used by selected products
         total_value: Total value of selected products
+        trucks: Per-truck selections, only for fleet optimizations
+        total_resources: Consumption of each extra resource, when requested
+        generations: Number of generations actually executed, for the
+            genetic engine
+        result_id: Id to warm-start later requests from this result
+        stats: Engine instrumentation and bounds
     """
 
     products: List[ProductOutput]
     total_space: float
     total_value: float
+    total_resources: Optional[List[float]] = None
+    trucks: Optional[List[TruckLoad]] = None
+    generations: Optional[int] = None
+    result_id: Optional[str] = None
+    stats: Optional[OptimizeStats] = None
+
+
+class CompactOptimizeResponse(BaseModel):
+    """
+    Compact response for columnar optimization requests.
+
+    Products are identified by their position in the request columns instead
+    of being echoed back.
+
+    Attributes:
+        selected: Positions of the loaded products, in ascending order
+        trucks: Truck (position in ``limits``) of each loaded product, only
+            for fleet optimizations
+        total_space: Total space used by the loaded products
+        total_value: Total value of the loaded products
+        total_resources: Consumption of each extra resource, when requested
+        result_id: Id to warm-start later requests from this result
+        stats: Engine instrumentation and bounds
+    """
+
+    selected: List[int]
+    trucks: Optional[List[int]] = None
+    total_space: float
+    total_value: float
+    total_resources: Optional[List[float]] = None
+    result_id: Optional[str] = None
+    stats: Optional[OptimizeStats] = None
+
+
+class OptimizeScenario(OptimizeParameters):
+    """
+    A single what-if variant inside a batch optimization request.
+
+    Holds everything that may change between runs over the same catalog.
+    """
+
+
+class OptimizeBatchRequest(BaseModel):
+    """
+    Request model for batch cargo optimization.
+
+    Contains one product list shared by every scenario, so the products are
+    parsed and preprocessed only once.
+
+    Attributes:
+        products: List of products to optimize
+        scenarios: Variants to solve over the same products
+    """
+
+    products: List[ProductInput]
+    scenarios: List[OptimizeScenario] = Field(..., min_length=1)
+
+    @model_validator(mode="after")
+    def check_products(self) -> "OptimizeBatchRequest":
+        """
+        Ensure the product resources match the capacities of every scenario.
+
+        Returns:
+            OptimizeBatchRequest: The validated request
+        """
+        check_resources(self.products, self.scenarios)
+        return self
+
+
+class OptimizeBatchItem(BaseModel):
+    """
+    Result of one scenario in a batch optimization.
+
+    Attributes:
+        index: Position of the scenario in the request
+        result: Optimization results for the scenario
+    """
+
+    index: int
+    result: OptimizeResponse
+
+
+class OptimizeBatchResponse(BaseModel):
+    """
+    Response model for batch cargo optimization.
+
+    Attributes:
+        results: One result per scenario, in request order
+    """
+
+    results: List[OptimizeBatchItem]
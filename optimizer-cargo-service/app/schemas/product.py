@@ -5,6 +5,8 @@ This module contains Pydantic models for product data structures
 used in the optimization process.
 """
 
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -20,12 +22,15 @@ class ProductInput(BaseModel):
         space: Space occupied by the product
         value: Product value
         amount: Quantity of the product
+        resources: Unit consumption of extra resources (weight, volume, ...),
+            matching the request ``capacities``
     """
 
     name: str
     space: float
     value: float
     amount: int
+    resources: Optional[List[float]] = None
 
 
 class ProductOutput(BaseModel):
@@ -42,6 +47,7 @@ class ProductOutput(BaseModel):
         amount: Quantity of the product
         total_space: Total space for this product (space * amount)
         total_value: Total value for this product (value * amount)
+        resources: Unit consumption of extra resources, when declared
     """
 
     name: str
@@ -50,3 +56,4 @@ class ProductOutput(BaseModel):
     amount: int
     total_space: float
     total_value: float
+    resources: Optional[List[float]] = None
@@ -0,0 +1,222 @@
+"""
+Metrics Module.
+
+This module defines the Prometheus metrics exposed at ``/metrics``. Nothing
+is recorded inside the engines' loops: each solve is recorded once, from its
+statistics, after it returns; HTTP latency is recorded by a plain ASGI
+middleware; pool and cache figures are only read when the metrics are
+scraped.
+"""
+
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, Tuple
+
+from prometheus_client import Counter, Histogram, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from app.controllers.result_store import result_store
+from app.solvers.pool import pool_tasks, pool_workers
+from .product_catalog import product_catalog
+
+# Buckets of the latency histograms, in seconds
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Buckets of the evaluation throughput histogram, in evaluations per second
+THROUGHPUT_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+REQUEST_DURATION = Histogram(
+    "optimizer_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+SOLVE_DURATION = Histogram(
+    "optimizer_solve_duration_seconds",
+    "Wall time of each solve by requested engine",
+    ["engine"],
+    buckets=LATENCY_BUCKETS,
+)
+EVALUATION_RATE = Histogram(
+    "optimizer_evaluations_per_second",
+    "Candidate evaluations per second of each solve by requested engine",
+    ["engine"],
+    buckets=THROUGHPUT_BUCKETS,
+)
+GENERATIONS = Counter(
+    "optimizer_generations",
+    "Generations executed (iterations for non-genetic engines)",
+    ["engine"],
+)
+EVALUATIONS = Counter(
+    "optimizer_evaluations", "Candidate solutions or moves evaluated", ["engine"]
+)
+STOPS = Counter(
+    "optimizer_stops",
+    "Solves by requested engine and stop reason",
+    ["engine", "reason"],
+)
+
+# Series of each engine, resolved once: looking up labels takes as long as
+# updating the series
+_engine_series: Dict[str, Tuple[Any, Any, Any, Any]] = {}
+
+
+def observe_solve(
+    engine: str, elapsed: float, iterations: int, evaluations: int, stop_reason: str
+) -> None:
+    """
+    Record one finished solve.
+
+    Args:
+        engine: Engine requested for the solve
+        elapsed: Wall time of the solve, in seconds
+        iterations: Generations or iterations executed
+        evaluations: Candidate solutions or moves evaluated
+        stop_reason: Why the solve ended
+    """
+    series = _engine_series.get(engine)
+    if series is None:
+        series = _engine_series[engine] = (
+            SOLVE_DURATION.labels(engine),
+            EVALUATION_RATE.labels(engine),
+            GENERATIONS.labels(engine),
+            EVALUATIONS.labels(engine),
+        )
+    duration, rate, generations, evaluated = series
+    duration.observe(elapsed)
+    generations.inc(iterations)
+    evaluated.inc(evaluations)
+    STOPS.labels(engine, stop_reason).inc()
+    if elapsed > 0:
+        rate.observe(evaluations / elapsed)
+
+
+class RuntimeCollector(Collector):
+    """
+    Worker pool and cache metrics, read from their owners at scrape time.
+    """
+
+    def collect(self) -> Iterator[Any]:
+        """
+        Yield the current pool and cache metrics.
+
+        Yields:
+            Metric families for the worker pool and the caches
+        """
+        workers = pool_workers()
+        tasks = pool_tasks()
+        busy = min(tasks, workers)
+        yield GaugeMetricFamily(
+            "optimizer_pool_workers",
+            "Worker processes of the shared pool",
+            value=workers,
+        )
+        yield GaugeMetricFamily(
+            "optimizer_pool_busy_workers", "Workers running a task", value=busy
+        )
+        yield GaugeMetricFamily(
+            "optimizer_pool_queue_depth",
+            "Tasks waiting for a free worker",
+            value=tasks - busy,
+        )
+        yield GaugeMetricFamily(
+            "optimizer_pool_utilization",
+            "Share of the workers running a task",
+            value=busy / workers,
+        )
+
+        caches = {
+            "products": (product_catalog.hits, product_catalog.misses),
+            "results": (result_store.hits, result_store.misses),
+        }
+        hits = CounterMetricFamily(
+            "optimizer_cache_hits",
+            "Cache lookups served from the cache",
+            labels=["cache"],
+        )
+        misses = CounterMetricFamily(
+            "optimizer_cache_misses", "Cache lookups that missed", labels=["cache"]
+        )
+        ratio = GaugeMetricFamily(
+            "optimizer_cache_hit_ratio",
+            "Share of the cache lookups that hit",
+            labels=["cache"],
+        )
+        for cache, (cache_hits, cache_misses) in caches.items():
+            hits.add_metric([cache], cache_hits)
+            misses.add_metric([cache], cache_misses)
+            lookups = cache_hits + cache_misses
+            ratio.add_metric([cache], cache_hits / lookups if lookups else 0.0)
+        yield hits
+        yield misses
+        yield ratio
+
+
+REGISTRY.register(RuntimeCollector())
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency of every HTTP request.
+
+    Requests are labelled with their route template rather than their path,
+    so path parameters and unknown URLs do not create new series.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        """
+        Wrap an ASGI application.
+
+        Args:
+            app: Application to instrument
+        """
+        self.app = app
+
+    async def __call__(
+        self, scope: Dict[str, Any], receive: Callable, send: Callable
+    ) -> None:
+        """
+        Handle a request, timing it until the response is sent.
+
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status_code),
+            ).observe(time.perf_counter() - started)
@@ -0,0 +1,205 @@
+"""
+Product Catalog Module.
+
+This module provides the client the optimizer uses to resolve product ids
+against products-service. Requests go through a keep-alive async HTTP
+connection pool, and the catalog is cached locally: it is revalidated with
+``If-None-Match`` when products-service sends an ETag (an unchanged catalog
+then costs a 304 with no body) and kept for a fixed time otherwise.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+# Product collection of products-service
+PRODUCTS_SERVICE_URL: str = os.getenv(
+    "PRODUCTS_SERVICE_URL", "http://localhost:8000/products"
+)
+
+# Seconds a catalog without ETag is reused before being downloaded again
+CATALOG_CACHE_TTL: float = float(os.getenv("CATALOG_CACHE_TTL", "30"))
+
+# Keep-alive connections kept open to products-service
+PRODUCTS_CLIENT_CONNECTIONS: int = int(os.getenv("PRODUCTS_CLIENT_CONNECTIONS", "10"))
+
+# Timeout of each call to products-service, in seconds
+PRODUCTS_CLIENT_TIMEOUT: float = float(os.getenv("PRODUCTS_CLIENT_TIMEOUT", "10"))
+
+
+@dataclass
+class CatalogProduct:
+    """
+    Product record as registered in products-service.
+
+    Attributes:
+        id: Product id
+        name: Product name
+        space: Unit space of the product
+        value: Unit value of the product
+    """
+
+    id: str
+    name: str
+    space: float
+    value: float
+
+
+class UnknownProductsError(KeyError):
+    """
+    Raised when product ids are not registered in products-service.
+
+    Attributes:
+        ids: The unknown product ids
+    """
+
+    def __init__(self, ids: List[str]) -> None:
+        """
+        Initialize the error with the unknown ids.
+
+        Args:
+            ids: The unknown product ids
+        """
+        super().__init__(ids)
+        self.ids = ids
+
+
+class ProductCatalog:
+    """
+    Cached, pooled view of the products-service catalog.
+
+    Attributes:
+        base_url: Product collection URL of products-service
+        ttl: Seconds a catalog without ETag is reused
+        hits: Lookups served from the cache (including 304 revalidations)
+        misses: Lookups that downloaded the catalog
+    """
+
+    def __init__(
+        self,
+        base_url: str = PRODUCTS_SERVICE_URL,
+        ttl: float = CATALOG_CACHE_TTL,
+        max_connections: int = PRODUCTS_CLIENT_CONNECTIONS,
+    ) -> None:
+        """
+        Initialize an empty catalog; nothing is fetched until first use.
+
+        Args:
+            base_url: Product collection URL of products-service
+            ttl: Seconds a catalog without ETag is reused
+            max_connections: Keep-alive connections kept open
+        """
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.max_connections = max_connections
+        self.hits = 0
+        self.misses = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._products: Dict[str, CatalogProduct] = {}
+        self._etag: Optional[str] = None
+        self._fetched_at = float("-inf")
+        self._lock: Optional[asyncio.Lock] = None
+
+    def client(self) -> httpx.AsyncClient:
+        """
+        Return the pooled HTTP client, creating it on first use.
+
+        Returns:
+            httpx.AsyncClient: Keep-alive client for products-service
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=PRODUCTS_CLIENT_TIMEOUT,
+            )
+        return self._client
+
+    async def products(self) -> Dict[str, CatalogProduct]:
+        """
+        Return the catalog by product id, refreshing it when needed.
+
+        Concurrent callers share a single refresh.
+
+        Returns:
+            Dict[str, CatalogProduct]: Registered products by id
+
+        Raises:
+            httpx.HTTPError: If products-service cannot be reached or fails
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            fresh = time.monotonic() - self._fetched_at < self.ttl
+            if self._etag is None and fresh:
+                self.hits += 1
+                return self._products
+
+            headers = {"If-None-Match": self._etag} if self._etag else {}
+            # O catálogo inteiro, na listagem sem paginação
+            response = await self.client().get(
+                f"{self.base_url}/", params={"paginate": "false"}, headers=headers
+            )
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                self.hits += 1
+                self._fetched_at = time.monotonic()
+                return self._products
+            response.raise_for_status()
+
+            self.misses += 1
+            self._products = {
+                str(item["id"]): CatalogProduct(
+                    id=str(item["id"]),
+                    name=item["nome"],
+                    space=float(item["espaco"]),
+                    value=float(item["valor"]),
+                )
+                for item in response.json()
+            }
+            self._etag = response.headers.get("etag")
+            self._fetched_at = time.monotonic()
+            return self._products
+
+    async def resolve(self, ids: Iterable[str]) -> List[CatalogProduct]:
+        """
+        Look up products by id.
+
+        Args:
+            ids: Product ids to resolve
+
+        Returns:
+            List[CatalogProduct]: The products, in the order of the ids
+
+        Raises:
+            UnknownProductsError: If some ids are not registered
+            httpx.HTTPError: If products-service cannot be reached or fails
+        """
+        ids = list(ids)
+        downloads = self.misses
+        catalog = await self.products()
+        unknown = [product_id for product_id in ids if product_id not in catalog]
+        if unknown and self._etag is None and self.misses == downloads:
+            # Sem ETag o cache pode estar velho: um produto novo força o download
+            self._fetched_at = float("-inf")
+            catalog = await self.products()
+            unknown = [product_id for product_id in ids if product_id not in catalog]
+        if unknown:
+            raise UnknownProductsError(unknown)
+        return [catalog[product_id] for product_id in ids]
+
+    async def close(self) -> None:
+        """
+        Close the pooled HTTP client, if it was ever opened.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+product_catalog = ProductCatalog()
@@ -0,0 +1,100 @@
+"""
+Simulated Annealing Solver Module.
+
+This module implements simulated annealing over the compact assignment state:
+random feasible neighbour moves are always accepted when they improve the
+load and accepted with a temperature-dependent probability otherwise.
+"""
+
+import math
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeScenario
+from .base import SearchSolver, SolverStats
+from .state import AssignmentState
+
+
+class AnnealingSolver(SearchSolver):
+    """
+    Simulated annealing engine with geometric cooling.
+
+    The temperature starts at ``initial_temperature`` (by default 10% of the
+    mean product value) and cools geometrically to a thousandth of it over
+    ``max_iterations`` iterations.
+    """
+
+    name = "annealing"
+
+    def search(
+        self,
+        problem: Problem,
+        capacities: np.ndarray,
+        scenario: OptimizeScenario,
+        seeds: Optional[np.ndarray],
+        deadline: Optional[float],
+        stats: SolverStats,
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        Run simulated annealing from the seed or greedy solution.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            capacities: Capacity of each truck in each dimension
+            scenario: Iteration, time and temperature parameters
+            seeds: Chromosomes of a previous solution to start from
+            deadline: ``time.perf_counter()`` value at which to stop, if any
+            stats: Statistics to update while searching
+
+        Returns:
+            Tuple[np.ndarray, bool]: Best chromosome found, never proven optimal
+        """
+        state = AssignmentState(
+            problem, capacities, self.initial_chromosome(problem, capacities, seeds)
+        )
+        best_genes, best_value = list(state.genes), state.value
+        stats.record(best_value)
+        products = len(problem)
+        if products == 0:
+            return state.chromosome(), False
+
+        iterations = scenario.max_iterations or max(10000, 20 * products)
+        positive = problem.total_values[problem.total_values > 0]
+        temperature = scenario.initial_temperature or (
+            0.1 * float(positive.mean()) if len(positive) else 1.0
+        )
+        cooling = 1e-3 ** (1 / iterations)
+
+        rng = np.random.default_rng(scenario.seed)
+        # Sorteios em lote: um produto, um caminhão e dois uniformes por iteração
+        chosen = rng.integers(products, size=iterations).tolist()
+        targets = rng.integers(1, state.trucks + 1, size=iterations).tolist()
+        picks = rng.random(iterations).tolist()
+        draws = rng.random(iterations).tolist()
+
+        for iteration in range(iterations):
+            if (
+                deadline is not None
+                and iteration % 256 == 0
+                and time.perf_counter() >= deadline
+            ):
+                stats.stop_reason = "time_limit"
+                break
+            stats.iterations = iteration + 1
+            stats.evaluations += 1
+            move = state.propose(
+                chosen[iteration], targets[iteration], picks[iteration]
+            )
+            if move is not None:
+                assignments, delta = move
+                if delta >= 0 or draws[iteration] < math.exp(delta / temperature):
+                    state.apply(assignments)
+                    if state.value > best_value:
+                        best_genes, best_value = list(state.genes), state.value
+                        stats.record(best_value)
+            temperature *= cooling
+
+        return np.asarray(best_genes, dtype=np.int16), False
@@ -0,0 +1,238 @@
+"""
+Solver Base Module.
+
+This module defines the Solver interface shared by every optimization engine,
+together with the result and statistics objects they return. Engines built
+on SearchSolver only implement the search itself; timing, final evaluation,
+feasibility repair and bounds are handled here so that all of them are
+instrumented the same way.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeScenario
+
+
+@dataclass
+class SolverStats:
+    """
+    Instrumentation collected while an engine runs.
+
+    Attributes:
+        engine: Name of the engine that produced the result
+        iterations: Iterations executed (generations for the genetic algorithm)
+        evaluations: Candidate solutions or moves evaluated
+        elapsed: Wall time of the run, in seconds
+        stop_reason: Why the run ended ("completed", "stalled", "time_limit"
+            or "optimal")
+        history: Best value found, as (iteration, value) pairs recorded on
+            each improvement
+        diversity: Mean normalized Hamming distance and unique-chromosome
+            ratio of each generation, for population-based engines
+        restarts: Partial restarts of the population
+        tuned: Parameters chosen by the automatic tuning, if it was used
+    """
+
+    engine: str
+    iterations: int = 0
+    evaluations: int = 0
+    elapsed: float = 0.0
+    stop_reason: str = "completed"
+    history: List[Tuple[int, float]] = field(default_factory=list)
+    diversity: List[Tuple[float, float]] = field(default_factory=list)
+    restarts: int = 0
+    tuned: Optional[Dict[str, Union[int, float]]] = None
+
+    def record(self, value: float) -> None:
+        """
+        Record the best value if it improves on the last recorded one.
+
+        Args:
+            value: Best value known at the current iteration
+        """
+        if not self.history or value > self.history[-1][1]:
+            self.history.append((self.iterations, value))
+
+
+@dataclass
+class PortfolioRun:
+    """
+    Outcome of one engine raced by the portfolio engine.
+
+    Attributes:
+        engine: Name of the engine
+        status: "finished", "failed", "timed_out" (still running at the
+            deadline), "superseded" (still running when another engine proved
+            optimality) or "cancelled" (never started)
+        value: Value of the engine's solution, when it finished
+        elapsed: Wall time of the engine's run, in seconds, when it finished
+        optimal: Whether the engine proved its solution optimal
+    """
+
+    engine: str
+    status: str
+    value: Optional[float] = None
+    elapsed: Optional[float] = None
+    optimal: bool = False
+
+
+@dataclass
+class SolverResult:
+    """
+    Solution, statistics and bounds returned by a Solver.
+
+    Attributes:
+        chromosome: Truck assigned to each product, counting from 1, or 0
+            when left out
+        value: Total value of the solution
+        loads: Load of each truck in each dimension, space first
+        stats: Instrumentation of the run
+        lower_bound: Value of the best feasible solution known
+        upper_bound: Bound no feasible solution can exceed
+        optimal: Whether the engine proved the solution optimal
+        portfolio: Engines raced by the portfolio engine, when it was used
+    """
+
+    chromosome: np.ndarray
+    value: float
+    loads: np.ndarray
+    stats: SolverStats
+    lower_bound: float
+    upper_bound: float
+    optimal: bool = False
+    portfolio: Optional[List[PortfolioRun]] = None
+
+
+class Solver(ABC):
+    """
+    Common interface of the optimization engines.
+
+    Attributes:
+        name: Engine name used to select it in requests
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def solve(
+        self,
+        problem: Problem,
+        scenario: OptimizeScenario,
+        seeds: Optional[np.ndarray] = None,
+    ) -> SolverResult:
+        """
+        Solve a problem for one scenario.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            scenario: Capacities and engine parameters
+            seeds: Chromosomes of a previous solution to start from
+
+        Returns:
+            SolverResult: Feasible solution with statistics and bounds
+        """
+
+
+class SearchSolver(Solver):
+    """
+    Base of the engines that run a search of their own.
+
+    Subclasses implement ``search``; ``solve`` wraps it with the shared
+    instrumentation and post-processing.
+    """
+
+    def solve(
+        self,
+        problem: Problem,
+        scenario: OptimizeScenario,
+        seeds: Optional[np.ndarray] = None,
+    ) -> SolverResult:
+        """
+        Solve a problem for one scenario.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            scenario: Capacities and engine parameters
+            seeds: Chromosomes of a previous solution to start from
+
+        Returns:
+            SolverResult: Feasible solution with statistics and bounds
+        """
+        capacities = Problem.capacity_matrix(scenario.truck_limits, scenario.capacities)
+        deadline = (
+            time.perf_counter() + scenario.time_limit_ms / 1000
+            if scenario.time_limit_ms
+            else None
+        )
+        stats = SolverStats(engine=self.name)
+        started = time.perf_counter()
+        chromosome, optimal = self.search(
+            problem, capacities, scenario, seeds, deadline, stats
+        )
+        # Garante uma carga viável, qualquer que seja o motor
+        chromosome = problem.repair(chromosome, capacities)
+        notes, loads = problem.evaluate(chromosome[np.newaxis, :], capacities)
+        stats.elapsed = time.perf_counter() - started
+        value = float(notes[0])
+        stats.record(value)
+        upper_bound = value if optimal else max(value, problem.upper_bound(capacities))
+        return SolverResult(
+            chromosome=chromosome,
+            value=value,
+            loads=loads[0],
+            stats=stats,
+            lower_bound=value,
+            upper_bound=upper_bound,
+            optimal=optimal or upper_bound - value <= 1e-9 * max(1.0, abs(value)),
+        )
+
+    @staticmethod
+    def initial_chromosome(
+        problem: Problem, capacities: np.ndarray, seeds: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """
+        Starting solution for single-solution engines.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            capacities: Capacity of each truck in each dimension
+            seeds: Chromosomes of a previous solution, if any
+
+        Returns:
+            np.ndarray: The first seed made feasible, or the greedy solution
+        """
+        if seeds is not None:
+            return problem.repair(np.atleast_2d(seeds)[0], capacities)
+        return problem.greedy_chromosome(capacities)
+
+    @abstractmethod
+    def search(
+        self,
+        problem: Problem,
+        capacities: np.ndarray,
+        scenario: OptimizeScenario,
+        seeds: Optional[np.ndarray],
+        deadline: Optional[float],
+        stats: SolverStats,
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        Run the engine's search.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            capacities: Capacity of each truck in each dimension
+            scenario: Engine parameters
+            seeds: Chromosomes of a previous solution to start from
+            deadline: ``time.perf_counter()`` value at which to stop, if any
+            stats: Statistics to update while searching
+
+        Returns:
+            Tuple[np.ndarray, bool]: Best chromosome found and whether it is
+            proven optimal
+        """
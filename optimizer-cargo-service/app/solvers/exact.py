@@ -0,0 +1,240 @@
+"""
+Exact Solver Module.
+
+This module implements an exact engine for single-truck problems. Integral
+single-dimension instances are solved by dynamic programming over the
+capacity; anything else is solved by depth-first branch and bound with the
+fractional knapsack bound of the most constrained dimension.
+"""
+
+import os
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeScenario
+from .base import SearchSolver, SolverStats
+
+# Largest dynamic programming table (products x capacity cells) to allocate
+EXACT_DP_CELLS: int = int(os.getenv("EXACT_DP_CELLS", "20000000"))
+
+# Branch and bound nodes explored when the run has no time limit
+EXACT_MAX_NODES: int = int(os.getenv("EXACT_MAX_NODES", "1000000"))
+
+
+class ExactSolver(SearchSolver):
+    """
+    Exact engine for a single truck: dynamic programming or branch and bound.
+
+    The result is proven optimal unless the search runs out of time (or of
+    nodes), in which case the best load found so far is returned.
+    """
+
+    name = "exact"
+
+    @staticmethod
+    def applicable(capacities: np.ndarray) -> bool:
+        """
+        Whether the exact engine can solve a problem with these capacities.
+
+        Args:
+            capacities: Capacity of each truck in each dimension
+
+        Returns:
+            bool: True for a single truck
+        """
+        return capacities.shape[0] == 1
+
+    def search(
+        self,
+        problem: Problem,
+        capacities: np.ndarray,
+        scenario: OptimizeScenario,
+        seeds: Optional[np.ndarray],
+        deadline: Optional[float],
+        stats: SolverStats,
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        Solve a single-truck problem exactly.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            capacities: Capacity of the truck in each dimension
+            scenario: Unused; the exact engine has no parameters
+            seeds: Chromosomes of a previous solution, used as incumbent
+            deadline: ``time.perf_counter()`` value at which to stop, if any
+            stats: Statistics to update while searching
+
+        Returns:
+            Tuple[np.ndarray, bool]: Best chromosome found and whether the
+            search completed, proving it optimal
+
+        Raises:
+            ValueError: If the problem has more than one truck
+        """
+        if not self.applicable(capacities):
+            raise ValueError("The exact engine supports a single truck")
+        weights = problem.weights[:, : capacities.shape[1]]
+        capacity = capacities[0]
+        if weights.shape[1] == 1 and np.all(weights == np.round(weights)):
+            size = int(np.floor(capacity[0])) + 1
+            if len(problem) * size <= EXACT_DP_CELLS:
+                return self._dynamic_programming(
+                    problem, weights[:, 0].astype(np.int64), size, deadline, stats
+                )
+        return self._branch_and_bound(
+            problem, weights, capacity, seeds, deadline, stats
+        )
+
+    def _dynamic_programming(
+        self,
+        problem: Problem,
+        weights: np.ndarray,
+        size: int,
+        deadline: Optional[float],
+        stats: SolverStats,
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        0/1 knapsack by dynamic programming over integral capacities.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            weights: Integral consumption of each product
+            size: Truck capacity plus one (number of table columns)
+            deadline: ``time.perf_counter()`` value at which to stop, if any
+            stats: Statistics to update while searching
+
+        Returns:
+            Tuple[np.ndarray, bool]: Optimal chromosome, or the greedy one
+            when the deadline is reached
+        """
+        values = problem.total_values
+        best = np.zeros(size)
+        # take[i, c]: o produto i entra na melhor carga de capacidade c
+        take = np.zeros((len(problem), size), dtype=bool)
+        for product in range(len(problem)):
+            if deadline is not None and time.perf_counter() >= deadline:
+                stats.stop_reason = "time_limit"
+                capacities = np.array([[size - 1]], dtype=float)
+                return problem.greedy_chromosome(capacities), False
+            stats.iterations = product + 1
+            weight = int(weights[product])
+            if weight >= size or values[product] <= 0:
+                continue
+            candidate = best[: size - weight] + values[product]
+            improved = candidate > best[weight:]
+            take[product, weight:] = improved
+            best[weight:] = np.where(improved, candidate, best[weight:])
+            stats.evaluations += size - weight
+
+        chromosome = np.zeros(len(problem), dtype=np.int16)
+        remaining = size - 1
+        for product in range(len(problem) - 1, -1, -1):
+            if take[product, remaining]:
+                chromosome[product] = 1
+                remaining -= int(weights[product])
+        stats.stop_reason = "optimal"
+        return chromosome, True
+
+    def _branch_and_bound(
+        self,
+        problem: Problem,
+        weights: np.ndarray,
+        capacity: np.ndarray,
+        seeds: Optional[np.ndarray],
+        deadline: Optional[float],
+        stats: SolverStats,
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        Depth-first branch and bound over the products by value density.
+
+        Nodes are pruned with the fractional knapsack bound of the most
+        constrained dimension, a valid relaxation of the full problem.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            weights: Consumption of each product in each checked dimension
+            capacity: Capacity of the truck in each checked dimension
+            seeds: Chromosomes of a previous solution, used as incumbent
+            deadline: ``time.perf_counter()`` value at which to stop, if any
+            stats: Statistics to update while searching
+
+        Returns:
+            Tuple[np.ndarray, bool]: Best chromosome found and whether the
+            search completed
+        """
+        capacities = capacity[np.newaxis, :]
+        incumbent = self.initial_chromosome(problem, capacities, seeds)
+        best_value = float(problem.total_values[incumbent > 0].sum())
+        stats.record(best_value)
+
+        # Só produtos de valor positivo que cabem sozinhos no caminhão
+        values = problem.total_values
+        candidates = np.flatnonzero((values > 0) & np.all(weights <= capacity, axis=1))
+        usage = weights.sum(axis=0) / np.maximum(capacity, 1e-12)
+        primary = int(np.argmax(usage)) if len(usage) else 0
+        with np.errstate(divide="ignore"):
+            density = values[candidates] / weights[candidates, primary]
+        order = candidates[np.argsort(-density, kind="stable")]
+
+        index: List[int] = order.tolist()
+        item_values: List[float] = values[order].tolist()
+        item_weights: List[List[float]] = weights[order].tolist()
+        primary_weights: List[float] = weights[order, primary].tolist()
+        limits: List[float] = capacity.tolist()
+        count = len(index)
+        best_items: Optional[List[int]] = None
+
+        def bound(depth: int, room: float, value: float) -> float:
+            for position in range(depth, count):
+                weight = primary_weights[position]
+                if weight <= room:
+                    room -= weight
+                    value += item_values[position]
+                else:
+                    return value + item_values[position] * room / weight
+            return value
+
+        # Pilha de nós: (próximo item, cargas, valor, itens escolhidos)
+        stack: List[Tuple[int, List[float], float, Tuple[int, ...]]] = [
+            (0, [0.0] * len(limits), 0.0, ())
+        ]
+        node_limit = None if deadline is not None else EXACT_MAX_NODES
+        completed = True
+        while stack:
+            if stats.iterations % 1024 == 0 and (
+                (deadline is not None and time.perf_counter() >= deadline)
+                or (node_limit is not None and stats.iterations >= node_limit)
+            ):
+                stats.stop_reason = "time_limit"
+                completed = False
+                break
+            depth, loads, value, chosen = stack.pop()
+            stats.iterations += 1
+            if depth == count:
+                continue
+            stats.evaluations += 1
+            if (
+                bound(depth, limits[primary] - loads[primary], value)
+                <= best_value + 1e-9
+            ):
+                continue
+
+            stack.append((depth + 1, loads, value, chosen))
+            added = [load + weight for load, weight in zip(loads, item_weights[depth])]
+            if all(load <= limit for load, limit in zip(added, limits)):
+                value += item_values[depth]
+                chosen = chosen + (depth,)
+                if value > best_value:
+                    best_value, best_items = value, list(chosen)
+                    stats.record(best_value)
+                stack.append((depth + 1, added, value, chosen))
+
+        if best_items is not None:
+            incumbent = np.zeros(len(problem), dtype=np.int16)
+            incumbent[[index[position] for position in best_items]] = 1
+        if completed:
+            stats.stop_reason = "optimal"
+        return incumbent, completed
@@ -0,0 +1,107 @@
+"""
+Genetic Solver Module.
+
+This module adapts the GeneticAlgorithm to the Solver interface.
+"""
+
+import time
+from dataclasses import asdict
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.controllers.genetic_algorithm import GeneticAlgorithm
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeScenario
+from .base import SearchSolver, SolverStats
+from .tuning import AUTO_TUNE_LATENCY_MS, tune
+
+
+class GeneticSolver(SearchSolver):
+    """
+    Genetic algorithm engine, optionally memetic (with local search).
+    """
+
+    name = "genetic"
+
+    def search(
+        self,
+        problem: Problem,
+        capacities: np.ndarray,
+        scenario: OptimizeScenario,
+        seeds: Optional[np.ndarray],
+        deadline: Optional[float],
+        stats: SolverStats,
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        Run the genetic algorithm with the scenario parameters.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            capacities: Capacity of each truck in each dimension
+            scenario: Genetic algorithm parameters
+            seeds: Chromosomes of a previous solution to start from
+            deadline: ``time.perf_counter()`` value at which to stop, if any
+            stats: Statistics to update while searching
+
+        Returns:
+            Tuple[np.ndarray, bool]: Best chromosome found, never proven optimal
+        """
+        # Use default values for optional parameters
+        population_size = scenario.population_size or 200
+        number_generations = scenario.number_generations or 100
+        mutation_rate = scenario.mutation_rate or 0.01
+        local_search = scenario.local_search
+        restarts = scenario.restarts
+        if scenario.auto_tune:
+            latency_ms = (
+                scenario.latency_target_ms
+                or scenario.time_limit_ms
+                or AUTO_TUNE_LATENCY_MS
+            )
+            tuned = tune(problem, capacities, latency_ms)
+            population_size = tuned.population_size
+            number_generations = tuned.number_generations
+            mutation_rate = tuned.mutation_rate
+            stats.tuned = asdict(tuned)
+            # A estimativa de gerações é aproximada: o alvo também vira prazo
+            if deadline is None:
+                deadline = time.perf_counter() + latency_ms / 1000
+
+        ga = GeneticAlgorithm(
+            problem,
+            scenario.truck_limits,
+            population_size,
+            number_generations,
+            mutation_rate=mutation_rate,
+            seed=scenario.seed,
+            capacities=scenario.capacities,
+            seeds=seeds,
+            stall_generations=scenario.stall_generations,
+            local_search_elite=local_search.elite if local_search else 0,
+            local_search_evaluations=(
+                local_search.max_evaluations if local_search else 0
+            ),
+            local_search_time=(
+                local_search.time_budget_ms / 1000
+                if local_search and local_search.time_budget_ms
+                else None
+            ),
+            deadline=deadline,
+            restart_diversity=restarts.min_diversity if restarts else None,
+            restart_keep=restarts.keep if restarts else 0.1,
+            track_diversity=scenario.track_diversity,
+        )
+        result = ga.run()
+
+        for generation, note in enumerate(ga.solutions_list):
+            stats.iterations = generation
+            stats.record(note)
+        stats.iterations = ga.generation
+        stats.evaluations = ga.evaluations
+        stats.stop_reason = ga.stop_reason
+        stats.diversity = ga.diversity_list
+        stats.restarts = ga.restarts
+        if result is None:
+            return np.zeros(len(problem), dtype=np.int16), False
+        return result.chromosome, False
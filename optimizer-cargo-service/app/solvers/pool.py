@@ -0,0 +1,151 @@
+"""
+Solver Pool Module.
+
+This module owns the process pool shared by batch optimizations and the
+portfolio engine, and the worker entry point that runs one engine. Worker
+processes never start a pool of their own: tasks they submit run inline.
+"""
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeScenario
+from .base import SolverResult
+
+# Number of worker processes used by batch and portfolio optimization
+# (0 = one per CPU)
+OPTIMIZER_WORKERS: int = int(os.getenv("OPTIMIZER_WORKERS", "0"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_tasks = 0
+_tasks_lock = Lock()
+# Whether this process is a pool worker (of this pool or the batch command)
+_in_worker = False
+
+
+def mark_worker() -> None:
+    """
+    Mark the current process as a pool worker; used as pool initializer.
+
+    A pool started inside a worker would never be shut down and would keep
+    the worker, and so the outer pool, from exiting.
+    """
+    global _in_worker
+    _in_worker = True
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Return the process pool shared by batch and portfolio optimizations.
+
+    The pool is created on first use so that single optimizations never pay
+    for spawning worker processes.
+
+    Returns:
+        ProcessPoolExecutor: Shared worker pool
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=pool_workers(), initializer=mark_worker
+        )
+    return _executor
+
+
+def pool_workers() -> int:
+    """
+    Number of worker processes of the shared pool.
+
+    Returns:
+        int: OPTIMIZER_WORKERS, or the number of CPUs when it is 0
+    """
+    return OPTIMIZER_WORKERS or os.cpu_count() or 1
+
+
+def pool_tasks() -> int:
+    """
+    Tasks submitted to the shared pool that have not finished yet.
+
+    Returns:
+        int: Running plus queued tasks
+    """
+    return _tasks
+
+
+def submit(function: Callable[..., Any], *args: Any) -> Future:
+    """
+    Submit a task to the shared pool, keeping count of unfinished tasks.
+
+    Inside a worker process the task runs inline, before returning, and the
+    returned future is already done.
+
+    Args:
+        function: Module-level function to run in a worker process
+        *args: Arguments of the function
+
+    Returns:
+        Future: Future of the task
+    """
+    global _tasks
+    if _in_worker:
+        future: Future = Future()
+        try:
+            future.set_result(function(*args))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+    with _tasks_lock:
+        _tasks += 1
+    future = get_executor().submit(function, *args)
+    future.add_done_callback(_task_done)
+    return future
+
+
+def _task_done(future: Future) -> None:
+    """
+    Count a task of the shared pool as finished (or cancelled).
+
+    Args:
+        future: Future of the finished task
+    """
+    global _tasks
+    with _tasks_lock:
+        _tasks -= 1
+
+
+def shutdown_executor() -> None:
+    """
+    Shut down the shared process pool, if it was ever started.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def run_solver(
+    engine: str,
+    problem: Problem,
+    scenario: OptimizeScenario,
+    seeds: Optional[np.ndarray] = None,
+) -> SolverResult:
+    """
+    Run one engine; module-level so it can run in a worker process.
+
+    Args:
+        engine: Name of the engine to run
+        problem: Preprocessed problem to optimize
+        scenario: Capacities and engine parameters
+        seeds: Chromosomes of a previous solution to start from
+
+    Returns:
+        SolverResult: Solution, statistics and bounds of the engine
+    """
+    from .registry import get_solver
+
+    return get_solver(engine).solve(problem, scenario, seeds)
@@ -0,0 +1,160 @@
+"""
+Portfolio Solver Module.
+
+This module races several engines on the shared process pool under a single
+deadline and returns the best result, stopping early as soon as one of them
+proves its solution optimal. Inside a pool worker (the batch command) the
+engines run one after the other, each within the time left.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeScenario
+from .base import PortfolioRun, Solver, SolverResult
+from .exact import ExactSolver
+from .greedy import GreedySolver
+from .pool import run_solver, submit
+
+# Engines raced by the portfolio, in tie-breaking order
+PORTFOLIO_ENGINES: Tuple[str, ...] = ("exact", "genetic", "greedy")
+
+# Deadline of a portfolio run without an explicit time limit
+PORTFOLIO_TIME_LIMIT_MS: float = float(os.getenv("PORTFOLIO_TIME_LIMIT_MS", "2000"))
+
+# Share of the deadline given to the engines; the rest covers dispatching
+# to the workers and collecting the results
+PORTFOLIO_ENGINE_SHARE: float = 0.9
+
+
+class PortfolioSolver(Solver):
+    """
+    Portfolio engine racing greedy, exact (single truck only) and genetic.
+
+    The returned result is the winning engine's, so ``stats.engine`` names
+    the winner; ``portfolio`` lists how every raced engine did.
+    """
+
+    name = "portfolio"
+
+    def solve(
+        self,
+        problem: Problem,
+        scenario: OptimizeScenario,
+        seeds: Optional[np.ndarray] = None,
+    ) -> SolverResult:
+        """
+        Race the portfolio engines and return the best result.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            scenario: Capacities, deadline and engine parameters
+            seeds: Chromosomes of a previous solution to start from
+
+        Returns:
+            SolverResult: Result of the winning engine, with the portfolio runs
+        """
+        started = time.perf_counter()
+        time_limit_ms = scenario.time_limit_ms or PORTFOLIO_TIME_LIMIT_MS
+        deadline = started + time_limit_ms / 1000
+        capacities = Problem.capacity_matrix(scenario.truck_limits, scenario.capacities)
+        engines = [
+            engine
+            for engine in PORTFOLIO_ENGINES
+            if engine != "exact" or ExactSolver.applicable(capacities)
+        ]
+
+        futures: Dict[Future, str] = {}
+        runs: Dict[str, PortfolioRun] = {}
+        for engine in engines:
+            # Dentro de um worker os motores rodam em sequência, no prazo que resta
+            remaining_ms = (deadline - time.perf_counter()) * 1000
+            if remaining_ms <= 0 or any(
+                future.done() and not future.exception() and future.result().optimal
+                for future in futures
+            ):
+                runs[engine] = PortfolioRun(engine=engine, status="cancelled")
+                continue
+            future = submit(
+                run_solver,
+                engine,
+                problem,
+                scenario.model_copy(
+                    update={
+                        "engine": engine,
+                        "time_limit_ms": remaining_ms * PORTFOLIO_ENGINE_SHARE,
+                    }
+                ),
+                seeds,
+            )
+            futures[future] = engine
+        results: Dict[str, SolverResult] = {}
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = wait(
+                pending, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                engine = futures[future]
+                try:
+                    result = future.result()
+                except Exception:
+                    runs[engine] = PortfolioRun(engine=engine, status="failed")
+                    continue
+                results[engine] = result
+                runs[engine] = PortfolioRun(
+                    engine=engine,
+                    status="finished",
+                    value=result.value,
+                    elapsed=result.stats.elapsed,
+                    optimal=result.optimal,
+                )
+            if any(result.optimal for result in results.values()):
+                break
+
+        superseded = any(result.optimal for result in results.values())
+        for future in pending:
+            # Motores ainda em execução param sozinhos no próprio prazo
+            if future.cancel():
+                status = "cancelled"
+            else:
+                status = "superseded" if superseded else "timed_out"
+            runs[futures[future]] = PortfolioRun(engine=futures[future], status=status)
+
+        if not results:
+            # Nenhum motor terminou a tempo: a heurística gulosa é instantânea
+            result = GreedySolver().solve(problem, scenario, seeds)
+            results["greedy"] = result
+            runs["greedy"] = PortfolioRun(
+                engine="greedy",
+                status="finished",
+                value=result.value,
+                elapsed=result.stats.elapsed,
+                optimal=result.optimal,
+            )
+
+        winner = max(
+            results,
+            key=lambda engine: (
+                results[engine].optimal,
+                results[engine].value,
+                -engines.index(engine),
+            ),
+        )
+        result = results[winner]
+        result.upper_bound = min(item.upper_bound for item in results.values())
+        result.optimal = (
+            result.optimal
+            or result.upper_bound - result.value <= 1e-9 * max(1.0, abs(result.value))
+        )
+        result.stats.elapsed = time.perf_counter() - started
+        result.portfolio = [runs[engine] for engine in engines]
+        return result
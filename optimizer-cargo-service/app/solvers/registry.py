@@ -0,0 +1,44 @@
+"""
+Solver Registry Module.
+
+This module maps engine names, as accepted in optimization requests, to their
+Solver implementations.
+"""
+
+from typing import Dict
+
+from .annealing import AnnealingSolver
+from .base import Solver
+from .exact import ExactSolver
+from .genetic import GeneticSolver
+from .greedy import GreedySolver
+from .portfolio import PortfolioSolver
+from .tabu import TabuSolver
+
+SOLVERS: Dict[str, Solver] = {
+    solver.name: solver
+    for solver in (
+        GeneticSolver(),
+        AnnealingSolver(),
+        TabuSolver(),
+        GreedySolver(),
+        ExactSolver(),
+        PortfolioSolver(),
+    )
+}
+
+
+def get_solver(name: str) -> Solver:
+    """
+    Return the solver registered under an engine name.
+
+    Args:
+        name: Engine name
+
+    Returns:
+        Solver: The engine implementation
+
+    Raises:
+        KeyError: If no engine is registered under the name
+    """
+    return SOLVERS[name]
@@ -0,0 +1,205 @@
+"""
+Assignment State Module.
+
+This module implements AssignmentState, the compact mutable solution used by
+the single-solution engines (simulated annealing and tabu search). It keeps
+the truck loads and the products of each truck up to date, so every move is
+scored incrementally in O(dimensions).
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.models.problem import Problem
+
+
+class AssignmentState:
+    """
+    Feasible assignment of products to trucks with incremental bookkeeping.
+
+    Attributes:
+        genes (List[int]): Truck of each product, counting from 1, or 0 when
+            left out.
+        loads (List[List[float]]): Load of each truck in each dimension.
+        value (float): Total value of the loaded products.
+        values (List[float]): Total value of each product.
+        weights (List[List[float]]): Consumption of each product in each
+            checked dimension.
+        capacities (List[List[float]]): Capacity of each truck in each dimension.
+        members (List[List[int]]): Products loaded in each truck, index 0
+            holding the products left out.
+    """
+
+    def __init__(
+        self, problem: Problem, capacities: np.ndarray, chromosome: np.ndarray
+    ) -> None:
+        """
+        Initialize the state from a feasible chromosome.
+
+        Args:
+            problem: Preprocessed problem to optimize.
+            capacities: Capacity of each truck in each checked dimension.
+            chromosome: Feasible chromosome to start from.
+        """
+        self.values: List[float] = problem.total_values.tolist()
+        self.weights: List[List[float]] = problem.weights[
+            :, : capacities.shape[1]
+        ].tolist()
+        self.capacities: List[List[float]] = capacities.tolist()
+        self.genes: List[int] = [int(gene) for gene in chromosome]
+        self.loads: List[List[float]] = [
+            [0.0] * capacities.shape[1] for _ in self.capacities
+        ]
+        self.members: List[List[int]] = [[] for _ in range(len(self.capacities) + 1)]
+        self._positions: List[int] = [0] * len(self.genes)
+        self.value = 0.0
+        for product, truck in enumerate(self.genes):
+            self.genes[product] = 0
+            self._add_member(product, 0)
+            if truck:
+                self.move(product, truck)
+
+    @property
+    def trucks(self) -> int:
+        """
+        Number of trucks in the fleet.
+
+        Returns:
+            int: Number of trucks.
+        """
+        return len(self.capacities)
+
+    def _add_member(self, product: int, truck: int) -> None:
+        """
+        Appends a product to the member list of a truck.
+
+        Args:
+            product: Product index.
+            truck: Truck counting from 1, or 0 for products left out.
+        """
+        self._positions[product] = len(self.members[truck])
+        self.members[truck].append(product)
+
+    def _remove_member(self, product: int, truck: int) -> None:
+        """
+        Removes a product from the member list of a truck in O(1).
+
+        Args:
+            product: Product index.
+            truck: Truck counting from 1, or 0 for products left out.
+        """
+        members = self.members[truck]
+        position = self._positions[product]
+        last = members.pop()
+        if last != product:
+            members[position] = last
+            self._positions[last] = position
+
+    def fits(self, product: int, truck: int, removed: int = -1) -> bool:
+        """
+        Checks whether a product fits a truck, optionally after removing another.
+
+        Args:
+            product: Product entering the truck.
+            truck: Destination truck, counting from 1.
+            removed: Product leaving the same truck, or -1 for none.
+
+        Returns:
+            bool: True when every dimension stays within capacity.
+        """
+        load = self.loads[truck - 1]
+        added = self.weights[product]
+        taken = self.weights[removed] if removed >= 0 else None
+        for dimension, capacity in enumerate(self.capacities[truck - 1]):
+            new_load = load[dimension] + added[dimension]
+            if taken is not None:
+                new_load -= taken[dimension]
+            if new_load > capacity:
+                return False
+        return True
+
+    def move(self, product: int, truck: int) -> None:
+        """
+        Moves a product to a truck (0 = unload), updating loads and value.
+
+        Args:
+            product: Product to move.
+            truck: Destination truck, counting from 1, or 0 to unload.
+        """
+        source = self.genes[product]
+        if source == truck:
+            return
+        weights = self.weights[product]
+        if source:
+            load = self.loads[source - 1]
+            for dimension, weight in enumerate(weights):
+                load[dimension] -= weight
+            self.value -= self.values[product]
+        if truck:
+            load = self.loads[truck - 1]
+            for dimension, weight in enumerate(weights):
+                load[dimension] += weight
+            self.value += self.values[product]
+        self._remove_member(product, source)
+        self._add_member(product, truck)
+        self.genes[product] = truck
+
+    def propose(
+        self, product: int, target: int, pick: float
+    ) -> Optional[Tuple[List[Tuple[int, int]], float]]:
+        """
+        Builds a random feasible neighbour move around one product.
+
+        A product left out is loaded into the target truck, swapping out a
+        random product of that truck when it does not fit. A loaded product
+        is unloaded, or relocated to the target truck when it fits there.
+
+        Args:
+            product: Product the move is built around.
+            target: Candidate truck, counting from 1.
+            pick: Uniform number in [0, 1) used for the random choices.
+
+        Returns:
+            Optional[Tuple[List[Tuple[int, int]], float]]: The (product,
+            truck) assignments of the move and its value delta, or None when
+            no feasible move was found.
+        """
+        current = self.genes[product]
+        if current == 0:
+            if self.fits(product, target):
+                return [(product, target)], self.values[product]
+            members = self.members[target]
+            if not members:
+                return None
+            other = members[int(pick * len(members))]
+            if self.fits(product, target, other):
+                return (
+                    [(other, 0), (product, target)],
+                    self.values[product] - self.values[other],
+                )
+            return None
+        if target == current or pick < 0.5:
+            return [(product, 0)], -self.values[product]
+        if self.fits(product, target):
+            return [(product, target)], 0.0
+        return None
+
+    def apply(self, assignments: List[Tuple[int, int]]) -> None:
+        """
+        Applies the assignments of a move.
+
+        Args:
+            assignments: (product, truck) pairs, applied in order.
+        """
+        for product, truck in assignments:
+            self.move(product, truck)
+
+    def chromosome(self) -> np.ndarray:
+        """
+        Returns the current assignment as a chromosome.
+
+        Returns:
+            np.ndarray: Truck of each product, counting from 1, or 0 when left out.
+        """
+        return np.asarray(self.genes, dtype=np.int16)
@@ -0,0 +1,104 @@
+"""
+Tabu Search Solver Module.
+
+This module implements tabu search over the compact assignment state: each
+iteration samples a neighbourhood of feasible moves, applies the best one
+that is not tabu and forbids moving the products involved for a while.
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeScenario
+from .base import SearchSolver, SolverStats
+from .state import AssignmentState
+
+# Number of candidate moves sampled per iteration
+NEIGHBOURHOOD_SIZE: int = 32
+
+
+class TabuSolver(SearchSolver):
+    """
+    Tabu search engine with a sampled neighbourhood and aspiration.
+
+    A tabu move is still taken when it leads to a better load than the best
+    found so far (aspiration criterion).
+    """
+
+    name = "tabu"
+
+    def search(
+        self,
+        problem: Problem,
+        capacities: np.ndarray,
+        scenario: OptimizeScenario,
+        seeds: Optional[np.ndarray],
+        deadline: Optional[float],
+        stats: SolverStats,
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        Run tabu search from the seed or greedy solution.
+
+        Args:
+            problem: Preprocessed problem to optimize
+            capacities: Capacity of each truck in each dimension
+            scenario: Iteration, time and tenure parameters
+            seeds: Chromosomes of a previous solution to start from
+            deadline: ``time.perf_counter()`` value at which to stop, if any
+            stats: Statistics to update while searching
+
+        Returns:
+            Tuple[np.ndarray, bool]: Best chromosome found, never proven optimal
+        """
+        state = AssignmentState(
+            problem, capacities, self.initial_chromosome(problem, capacities, seeds)
+        )
+        best_genes, best_value = list(state.genes), state.value
+        stats.record(best_value)
+        products = len(problem)
+        if products == 0:
+            return state.chromosome(), False
+
+        iterations = scenario.max_iterations or max(1000, 2 * products)
+        tenure = scenario.tabu_tenure or max(5, min(50, products // 10))
+        sample = min(NEIGHBOURHOOD_SIZE, max(1, products))
+        tabu_until: List[int] = [0] * products
+        rng = np.random.default_rng(scenario.seed)
+
+        for iteration in range(iterations):
+            if deadline is not None and time.perf_counter() >= deadline:
+                stats.stop_reason = "time_limit"
+                break
+            stats.iterations = iteration + 1
+            chosen = rng.integers(products, size=sample).tolist()
+            targets = rng.integers(1, state.trucks + 1, size=sample).tolist()
+            picks = rng.random(sample).tolist()
+
+            best_move: Optional[List[Tuple[int, int]]] = None
+            best_delta = -float("inf")
+            for product, target, pick in zip(chosen, targets, picks):
+                stats.evaluations += 1
+                move = state.propose(product, target, pick)
+                if move is None:
+                    continue
+                assignments, delta = move
+                tabu = any(tabu_until[moved] > iteration for moved, _ in assignments)
+                # Critério de aspiração: aceita movimento tabu que supera o melhor
+                if tabu and state.value + delta <= best_value:
+                    continue
+                if delta > best_delta:
+                    best_move, best_delta = assignments, delta
+            if best_move is None:
+                continue
+
+            state.apply(best_move)
+            for moved, _ in best_move:
+                tabu_until[moved] = iteration + tenure
+            if state.value > best_value:
+                best_genes, best_value = list(state.genes), state.value
+                stats.record(best_value)
+
+        return np.asarray(best_genes, dtype=np.int16), False
@@ -0,0 +1,268 @@
+"""
+Genetic Algorithm Tuning Module.
+
+This module picks the genetic algorithm parameters (population size,
+number of generations and mutation rate) from the number of products, the
+tightness of the capacities and a latency target. The choice is driven by a
+calibration table produced offline on the target machine by ``calibrate``
+(see ``python -m app.calibrate``).
+"""
+
+import json
+import math
+import os
+import platform
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.controllers.genetic_algorithm import GeneticAlgorithm
+from app.models.problem import Problem
+
+# Calibration table used by the automatic tuning
+GA_CALIBRATION_PATH: str = os.getenv(
+    "GA_CALIBRATION_PATH", os.path.join(os.path.dirname(__file__), "calibration.json")
+)
+
+# Latency target of auto-tuned runs without an explicit one
+AUTO_TUNE_LATENCY_MS: float = float(os.getenv("AUTO_TUNE_LATENCY_MS", "1000"))
+
+# Grid explored by the calibration
+CALIBRATION_SIZES: Sequence[int] = (10, 50, 200, 1000, 5000)
+CALIBRATION_TIGHTNESS: Sequence[float] = (0.25, 0.5, 0.75)
+CALIBRATION_POPULATIONS: Sequence[int] = (50, 100, 200, 400)
+CALIBRATION_MUTATION_SCALES: Sequence[float] = (0.5, 1.0, 2.0)
+
+# Bounds of the tuned number of generations
+MIN_GENERATIONS: int = 10
+MAX_GENERATIONS: int = 2000
+
+# Table used when no calibration file is available
+DEFAULT_CALIBRATION: Dict[str, Any] = {
+    "entries": [
+        {
+            "products": 10,
+            "tightness": 0.5,
+            "population_size": 50,
+            "mutation_scale": 1.0,
+            "seconds_per_gene": 1e-6,
+        },
+        {
+            "products": 200,
+            "tightness": 0.5,
+            "population_size": 200,
+            "mutation_scale": 1.0,
+            "seconds_per_gene": 2e-8,
+        },
+        {
+            "products": 5000,
+            "tightness": 0.5,
+            "population_size": 200,
+            "mutation_scale": 1.0,
+            "seconds_per_gene": 1e-8,
+        },
+    ]
+}
+
+_calibration: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class TunedParameters:
+    """
+    Genetic algorithm parameters chosen by the automatic tuning.
+
+    Attributes:
+        population_size: Size of the population
+        number_generations: Number of generations to run
+        mutation_rate: Mutation rate
+    """
+
+    population_size: int
+    number_generations: int
+    mutation_rate: float
+
+
+def load_calibration() -> Dict[str, Any]:
+    """
+    Return the calibration table, reading it on first use.
+
+    Returns:
+        Dict[str, Any]: The calibration file contents, or the built-in
+        default table when the file does not exist
+    """
+    global _calibration
+    if _calibration is None:
+        if os.path.exists(GA_CALIBRATION_PATH):
+            with open(GA_CALIBRATION_PATH, encoding="utf-8") as file:
+                _calibration = json.load(file)
+        else:
+            _calibration = DEFAULT_CALIBRATION
+    return _calibration
+
+
+def tightness(problem: Problem, capacities: np.ndarray) -> float:
+    """
+    Share of the products' total consumption the fleet can carry.
+
+    Args:
+        problem: Preprocessed problem
+        capacities: Capacity of each truck in each dimension
+
+    Returns:
+        float: Fleet capacity over total consumption in the most constrained
+        dimension, clipped to [0, 1]
+    """
+    demand = problem.weights[:, : capacities.shape[1]].sum(axis=0)
+    if not len(demand) or not np.any(demand > 0):
+        return 1.0
+    supply = capacities.sum(axis=0)
+    ratios = supply[demand > 0] / demand[demand > 0]
+    return float(np.clip(ratios.min(), 0.0, 1.0))
+
+
+def tune(
+    problem: Problem, capacities: np.ndarray, latency_ms: Optional[float] = None
+) -> TunedParameters:
+    """
+    Choose the genetic algorithm parameters for a problem.
+
+    The nearest calibration entry (log-scale in products, then tightness)
+    gives the population size and the mutation rate, as a multiple of one
+    gene per chromosome. The number of generations fills the latency target
+    at the measured cost per gene.
+
+    Args:
+        problem: Preprocessed problem to optimize
+        capacities: Capacity of each truck in each dimension
+        latency_ms: Latency target (default: AUTO_TUNE_LATENCY_MS)
+
+    Returns:
+        TunedParameters: Parameters for the run
+    """
+    products = max(1, len(problem))
+    tight = tightness(problem, capacities)
+    entry = min(
+        load_calibration()["entries"],
+        key=lambda item: (
+            round(abs(math.log10(item["products"]) - math.log10(products)), 6),
+            abs(item["tightness"] - tight),
+        ),
+    )
+    population_size = int(entry["population_size"])
+    mutation_rate = float(np.clip(entry["mutation_scale"] / products, 1e-4, 0.5))
+    budget = (latency_ms or AUTO_TUNE_LATENCY_MS) / 1000
+    generation_cost = population_size * products * entry["seconds_per_gene"]
+    number_generations = int(
+        np.clip(budget / generation_cost, MIN_GENERATIONS, MAX_GENERATIONS)
+    )
+    return TunedParameters(population_size, number_generations, mutation_rate)
+
+
+def synthetic_problem(products: int, rng: np.random.Generator) -> Problem:
+    """
+    Random catalog used by the calibration.
+
+    Args:
+        products: Number of products
+        rng: Random number generator
+
+    Returns:
+        Problem: Catalog with uniform spaces, values and amounts
+    """
+    return Problem(
+        names=[f"p{index}" for index in range(products)],
+        spaces=rng.uniform(0.1, 5.0, products),
+        values=rng.uniform(1.0, 100.0, products),
+        amounts=rng.integers(1, 4, products),
+    )
+
+
+def calibrate(
+    sizes: Sequence[int] = CALIBRATION_SIZES,
+    tightnesses: Sequence[float] = CALIBRATION_TIGHTNESS,
+    budget_ms: float = 200,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Build a calibration table by running the genetic algorithm on this machine.
+
+    For each catalog size and tightness, every population size and mutation
+    scale of the grid runs under the same time budget; the entry keeps the
+    combination reaching the best value and the measured cost per gene.
+
+    Args:
+        sizes: Catalog sizes to calibrate
+        tightnesses: Fleet capacity over total space of the catalogs
+        budget_ms: Time budget of each run
+        seed: Seed of the catalogs and of the runs
+
+    Returns:
+        Dict[str, Any]: Calibration table, as stored by ``save_calibration``
+    """
+    rng = np.random.default_rng(seed)
+    entries: List[Dict[str, Any]] = []
+    for products in sizes:
+        problem = synthetic_problem(products, rng)
+        for tight in tightnesses:
+            limit = tight * float(problem.total_spaces.sum())
+            runs = []
+            for population_size in CALIBRATION_POPULATIONS:
+                for scale in CALIBRATION_MUTATION_SCALES:
+                    ga = GeneticAlgorithm(
+                        problem,
+                        limit,
+                        population_size,
+                        MAX_GENERATIONS,
+                        mutation_rate=min(0.5, scale / products),
+                        seed=seed,
+                        deadline=time.perf_counter() + budget_ms / 1000,
+                    )
+                    started = time.perf_counter()
+                    best = ga.run()
+                    elapsed = time.perf_counter() - started
+                    genes = (ga.generation + 1) * ga.population_size * products
+                    runs.append(
+                        (best.evaluation_note, -population_size, scale, elapsed / genes)
+                    )
+            value, population_size, scale, _ = max(runs)
+            entries.append(
+                {
+                    "products": products,
+                    "tightness": tight,
+                    "population_size": -population_size,
+                    "mutation_scale": scale,
+                    "seconds_per_gene": float(np.median([run[3] for run in runs])),
+                    "best_value": value,
+                }
+            )
+            print(
+                f"> Calibrated {products} products, tightness {tight}: "
+                f"population {-population_size}, mutation scale {scale}"
+            )
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "machine": platform.platform(),
+        "budget_ms": budget_ms,
+        "seed": seed,
+        "entries": entries,
+    }
+
+
+def save_calibration(table: Dict[str, Any], path: str = GA_CALIBRATION_PATH) -> None:
+    """
+    Write a calibration table and make it the active one.
+
+    Args:
+        table: Calibration table from ``calibrate``
+        path: File to write
+    """
+    global _calibration
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(table, file, indent=2)
+        file.write("\n")
+    if path == GA_CALIBRATION_PATH:
+        _calibration = table
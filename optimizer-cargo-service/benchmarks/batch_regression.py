@@ -0,0 +1,136 @@
+"""
+Batch Command Regression Run.
+
+Runs ``python -m app.batch`` on a seeded file that mixes portfolio lines with
+other engines, a fleet, a columnar line and a malformed line, and checks that
+the command exits on its own, in time, with one output line per input line:
+
+    PYTHONPATH=. python benchmarks/batch_regression.py [--lines 24] [--workers 4]
+
+Portfolio lines race their engines inline inside the batch workers; a nested
+process pool there once kept the command from exiting after writing every
+result. Exits with status 1 on a hang, a crash or a missing result.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Engines cycled through the generated lines
+ENGINES = ("portfolio", "genetic", "greedy", "annealing", "exact", "tabu")
+
+# Seconds the command may take before it is considered hung
+TIMEOUT: float = 120.0
+
+
+def batch_lines(lines: int, seed: int) -> List[str]:
+    """
+    Seeded input file mixing engines and payload shapes.
+
+    Args:
+        lines: Number of well-formed requests
+        seed: Seed of the products
+
+    Returns:
+        List[str]: JSON lines, ending with a columnar portfolio request and a
+        malformed line
+    """
+    rng = np.random.default_rng(seed)
+    requests: List[Dict[str, Any]] = []
+    for index in range(lines):
+        engine = ENGINES[index % len(ENGINES)]
+        request: Dict[str, Any] = {
+            "products": [
+                {
+                    "name": f"p{product}",
+                    "space": int(rng.integers(1, 21)),
+                    "value": float(rng.uniform(1.0, 100.0)),
+                    "amount": int(rng.integers(1, 4)),
+                }
+                for product in range(40)
+            ],
+            "engine": engine,
+            "number_generations": 30,
+            "time_limit_ms": 500,
+        }
+        # Frotas a cada terceira linha, exceto para o motor exato
+        if index % 3 == 2 and engine != "exact":
+            request["limits"] = [50.0, 60.0]
+        else:
+            request["limit"] = 100.0
+        requests.append(request)
+    requests.append(
+        {
+            "names": ["a", "b", "c"],
+            "spaces": [1, 2, 3],
+            "values": [3, 4, 5],
+            "amounts": [1, 1, 1],
+            "limit": 4,
+            "engine": "portfolio",
+        }
+    )
+    return [json.dumps(request) for request in requests] + ["not json"]
+
+
+def main() -> None:
+    """
+    Parse the command line, run the batch command and check its output.
+    """
+    parser = argparse.ArgumentParser(description="Batch command regression run")
+    parser.add_argument(
+        "--lines", type=int, default=24, help="well-formed requests in the input"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="worker processes of the batch command"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the generated products"
+    )
+    args = parser.parse_args()
+
+    lines = batch_lines(args.lines, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "input.jsonl")
+        with open(source, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "app.batch",
+                    source,
+                    "--workers",
+                    str(args.workers),
+                ],
+                capture_output=True,
+                timeout=TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            sys.exit(f"FAIL: the batch command did not exit within {TIMEOUT:.0f}s")
+    elapsed = time.perf_counter() - started
+
+    if completed.returncode != 0:
+        sys.exit(
+            f"FAIL: exit status {completed.returncode}\n{completed.stderr.decode()}"
+        )
+    outputs = [json.loads(line) for line in completed.stdout.splitlines()]
+    indices = sorted(output["index"] for output in outputs)
+    failed = [output["index"] for output in outputs if "error" in output]
+    if indices != list(range(len(lines))):
+        sys.exit(f"FAIL: expected one result per line, got indices {indices}")
+    if failed != [len(lines) - 1]:
+        sys.exit(f"FAIL: only the malformed line should fail, failed: {failed}")
+    print(f"OK: {len(lines)} lines in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
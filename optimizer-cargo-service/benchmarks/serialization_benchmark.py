@@ -0,0 +1,119 @@
+"""
+Serialization Benchmark.
+
+Measures the cost of turning an optimization result into a JSON response
+body, comparing the pydantic path (the content validated into one
+ProductOutput per product by the response model and encoded with the standard
+json module, as FastAPI does for a value returned through ``response_model``)
+with the fast path (the same content encoded directly with orjson).
+
+    PYTHONPATH=. python benchmarks/serialization_benchmark.py [--products 10000]
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, Tuple
+
+import numpy as np
+import orjson
+from pydantic import TypeAdapter
+
+from app.controllers.optimizer_controller import OptimizerController
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeResponse, OptimizeScenario
+from app.solvers.base import SolverResult, SolverStats
+
+
+def build_result(
+    products: int, seed: int
+) -> Tuple[Problem, OptimizeScenario, SolverResult]:
+    """
+    Build a problem and a result selecting every product.
+
+    Args:
+        products: Number of products, all of them selected
+        seed: Seed of the random catalog
+
+    Returns:
+        Tuple[Problem, OptimizeScenario, SolverResult]: Problem, scenario
+        and solver result
+    """
+    rng = np.random.default_rng(seed)
+    problem = Problem(
+        names=[f"product-{index}" for index in range(products)],
+        spaces=rng.uniform(0.1, 5.0, products),
+        values=rng.uniform(1.0, 100.0, products),
+        amounts=rng.integers(1, 4, products),
+    )
+    scenario = OptimizeScenario(
+        limit=float(problem.total_spaces.sum()), engine="greedy"
+    )
+    chromosome = np.ones(products, dtype=np.int16)
+    loads = np.array([[problem.total_spaces.sum()]])
+    value = float(problem.total_values.sum())
+    result = SolverResult(
+        chromosome=chromosome,
+        value=value,
+        loads=loads,
+        stats=SolverStats(engine="greedy"),
+        lower_bound=value,
+        upper_bound=value,
+    )
+    return problem, scenario, result
+
+
+def measure(function: Callable[[], bytes], repeats: int) -> float:
+    """
+    Best wall time of several calls, in milliseconds.
+
+    Args:
+        function: Callable producing the response body
+        repeats: Number of calls
+
+    Returns:
+        float: Fastest call, in milliseconds
+    """
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    """
+    Run the benchmark and print the timings of both paths.
+    """
+    parser = argparse.ArgumentParser(description="Response serialization benchmark")
+    parser.add_argument(
+        "--products", type=int, default=10000, help="number of selected products"
+    )
+    parser.add_argument("--repeats", type=int, default=10, help="calls per path")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the catalog")
+    args = parser.parse_args()
+
+    problem, scenario, result = build_result(args.products, args.seed)
+    adapter = TypeAdapter(OptimizeResponse)
+
+    def pydantic_path() -> bytes:
+        content = OptimizerController.build_content(problem, scenario, result)
+        validated = adapter.validate_python(content)
+        return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+    def fast_path() -> bytes:
+        content = OptimizerController.build_content(problem, scenario, result)
+        return orjson.dumps(content)
+
+    assert json.loads(pydantic_path()) == json.loads(fast_path())
+    before = measure(pydantic_path, args.repeats)
+    after = measure(fast_path, args.repeats)
+    print(f"Selected products: {args.products}")
+    print(f"Pydantic models + json:  {before:8.2f} ms")
+    print(f"Arrays + orjson:         {after:8.2f} ms")
+    print(f"Speed-up:                {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
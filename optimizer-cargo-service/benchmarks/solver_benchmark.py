@@ -0,0 +1,367 @@
+"""
+Solver Benchmark and Quality Regression Suite.
+
+Runs the engines in-process on seeded synthetic catalogs and records, for
+each engine and catalog size, the wall time, generations (iterations) per
+second, evaluations per second, peak traced memory and the gap to the
+optimum. The optimum comes from the exact engine's dynamic programming when
+its table fits in EXACT_DP_CELLS; larger catalogs are measured against the
+linear relaxation bound instead, so their gap is an upper estimate.
+
+    PYTHONPATH=. python benchmarks/solver_benchmark.py run -o baseline.json
+    PYTHONPATH=. python benchmarks/solver_benchmark.py run -o candidate.json
+    PYTHONPATH=. python benchmarks/solver_benchmark.py compare \\
+        baseline.json candidate.json
+
+Catalogs have integral spaces so the dynamic programming applies, and are
+fully determined by their size and the seed; engines run with fixed seeds,
+so solution quality is reproducible between runs and any change in the gap
+is a real regression (or improvement). ``compare`` exits with status 1 when
+the candidate regresses beyond the tolerances.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.problem import Problem
+from app.schemas.optimize import OptimizeScenario
+from app.solvers.base import SolverResult
+from app.solvers.exact import EXACT_DP_CELLS
+from app.solvers.registry import get_solver
+
+# Catalog sizes benchmarked by default
+DEFAULT_SIZES: Sequence[int] = (20, 100, 1000, 10000, 100000)
+
+# Engines benchmarked by default
+DEFAULT_ENGINES: Sequence[str] = ("genetic", "annealing", "tabu", "greedy")
+
+# Truck capacity over the total space of the catalog
+TIGHTNESS: float = 0.5
+
+# Largest unit space of the synthetic products
+MAX_SPACE: int = 20
+
+
+def synthetic_problem(products: int, seed: int) -> Problem:
+    """
+    Seeded random catalog with integral spaces.
+
+    Args:
+        products: Number of products
+        seed: Seed of the catalog
+
+    Returns:
+        Problem: Catalog with integral spaces and amounts and uniform values
+    """
+    rng = np.random.default_rng([seed, products])
+    return Problem(
+        names=[f"p{index}" for index in range(products)],
+        spaces=rng.integers(1, MAX_SPACE + 1, products).astype(float),
+        values=rng.uniform(1.0, 100.0, products),
+        amounts=rng.integers(1, 4, products),
+    )
+
+
+def reference(problem: Problem, limit: float) -> Tuple[float, str]:
+    """
+    Optimal value of a catalog, or an upper bound when the DP does not fit.
+
+    Args:
+        problem: Catalog to solve
+        limit: Truck capacity
+
+    Returns:
+        Tuple[float, str]: Reference value and its kind ("optimum" or "bound")
+    """
+    if len(problem) * (int(limit) + 1) <= EXACT_DP_CELLS:
+        scenario = OptimizeScenario(limit=limit, engine="exact")
+        result = get_solver("exact").solve(problem, scenario)
+        if result.optimal:
+            return result.value, "optimum"
+    capacities = Problem.capacity_matrix([limit], None)
+    return problem.upper_bound(capacities), "bound"
+
+
+def solve(problem: Problem, scenario: OptimizeScenario) -> Tuple[SolverResult, float]:
+    """
+    Run one engine and time it.
+
+    Args:
+        problem: Catalog to solve
+        scenario: Engine and parameters
+
+    Returns:
+        Tuple[SolverResult, float]: Result and wall time, in seconds
+    """
+    solver = get_solver(scenario.engine)
+    started = time.perf_counter()
+    result = solver.solve(problem, scenario)
+    elapsed = time.perf_counter() - started
+    return result, elapsed
+
+
+def benchmark(
+    sizes: Sequence[int],
+    engines: Sequence[str],
+    seed: int,
+    repeats: int,
+    memory: bool,
+    parameters: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """
+    Benchmark every engine on every catalog size.
+
+    Args:
+        sizes: Catalog sizes
+        engines: Engines to run
+        seed: Seed of the catalogs and of the engines
+        repeats: Timed runs per engine and size; the fastest one is kept
+        memory: Measure peak memory in an extra traced run
+        parameters: Engine parameters shared by every run
+
+    Returns:
+        List[Dict[str, Any]]: One record per engine and size
+    """
+    records = []
+    for products in sizes:
+        problem = synthetic_problem(products, seed)
+        limit = float(np.floor(TIGHTNESS * problem.total_spaces.sum()))
+        best, kind = reference(problem, limit)
+        for engine in engines:
+            scenario = OptimizeScenario(
+                limit=limit, engine=engine, seed=seed, **parameters
+            )
+            runs = [solve(problem, scenario) for _ in range(repeats)]
+            result, elapsed = min(runs, key=lambda run: run[1])
+            peak = None
+            if memory:
+                # Medido em uma execução à parte: o rastreamento deixa tudo mais lento
+                tracemalloc.start()
+                solve(problem, scenario)
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+
+            stats = result.stats
+            gap = (best - result.value) / best if best > 0 else 0.0
+            records.append(
+                {
+                    "engine": engine,
+                    "products": products,
+                    "seconds": elapsed,
+                    "generations": stats.iterations,
+                    "generations_per_second": stats.iterations / elapsed,
+                    "evaluations_per_second": stats.evaluations / elapsed,
+                    "peak_memory_mb": peak,
+                    "value": result.value,
+                    "reference": best,
+                    "reference_kind": kind,
+                    "gap": max(gap, 0.0),
+                    "stop_reason": stats.stop_reason,
+                }
+            )
+            print(
+                f"{engine:>10} {products:>7} products: {elapsed * 1000:10.1f} ms, "
+                f"gap {records[-1]['gap']:.4%} to {kind}",
+                file=sys.stderr,
+            )
+    return records
+
+
+def compare(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    time_tolerance: float,
+    memory_tolerance: float,
+    gap_tolerance: float,
+    time_slack: float = 0.005,
+) -> List[str]:
+    """
+    Find the regressions of a candidate run against a baseline run.
+
+    Args:
+        baseline: Results file of the reference run
+        candidate: Results file of the run under test
+        time_tolerance: Relative slow-down accepted
+        memory_tolerance: Relative growth of the peak memory accepted
+        gap_tolerance: Absolute growth of the gap accepted
+        time_slack: Absolute slow-down always accepted, in seconds, so that
+            timer noise on sub-millisecond runs is not flagged
+
+    Returns:
+        List[str]: One message per regression
+    """
+    reference_records = {
+        (record["engine"], record["products"]): record for record in baseline["results"]
+    }
+    regressions = []
+    for record in candidate["results"]:
+        before: Optional[Dict[str, Any]] = reference_records.get(
+            (record["engine"], record["products"])
+        )
+        if before is None:
+            continue
+        label = f"{record['engine']} with {record['products']} products"
+        if record["seconds"] > max(
+            before["seconds"] * (1 + time_tolerance), before["seconds"] + time_slack
+        ):
+            regressions.append(
+                f"{label}: {before['seconds'] * 1000:.1f} ms -> "
+                f"{record['seconds'] * 1000:.1f} ms"
+            )
+        if (
+            before["peak_memory_mb"] is not None
+            and record["peak_memory_mb"] is not None
+            and record["peak_memory_mb"]
+            > before["peak_memory_mb"] * (1 + memory_tolerance)
+        ):
+            regressions.append(
+                f"{label}: peak memory {before['peak_memory_mb']:.1f} MB -> "
+                f"{record['peak_memory_mb']:.1f} MB"
+            )
+        if record["gap"] > before["gap"] + gap_tolerance:
+            regressions.append(
+                f"{label}: gap {before['gap']:.4%} -> {record['gap']:.4%}"
+            )
+    return regressions
+
+
+def main() -> None:
+    """
+    Run the benchmark or compare two results files.
+    """
+    parser = argparse.ArgumentParser(
+        description="Solver benchmark and quality regression suite"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="benchmark the engines")
+    run_parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="catalog sizes",
+    )
+    run_parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=list(DEFAULT_ENGINES),
+        help="engines to benchmark",
+    )
+    run_parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the catalogs and engines"
+    )
+    run_parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        help="timed runs per engine and size (fastest kept)",
+    )
+    run_parser.add_argument(
+        "--generations", type=int, default=100, help="generations of the genetic engine"
+    )
+    run_parser.add_argument(
+        "--population", type=int, default=200, help="population of the genetic engine"
+    )
+    run_parser.add_argument(
+        "--time-limit-ms",
+        type=float,
+        default=None,
+        help="time limit of each run (the gap then depends on " "the machine speed)",
+    )
+    run_parser.add_argument(
+        "--no-memory", action="store_true", help="skip the peak memory measurement"
+    )
+    run_parser.add_argument(
+        "-o", "--output", default="-", help="results file (default: stdout)"
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="flag regressions between two runs"
+    )
+    compare_parser.add_argument("baseline", help="results file of the reference run")
+    compare_parser.add_argument("candidate", help="results file of the run under test")
+    compare_parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=0.2,
+        help="relative slow-down accepted (default: 0.2)",
+    )
+    compare_parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.2,
+        help="relative peak memory growth accepted (default: 0.2)",
+    )
+    compare_parser.add_argument(
+        "--gap-tolerance",
+        type=float,
+        default=0.001,
+        help="absolute gap growth accepted (default: 0.001)",
+    )
+    compare_parser.add_argument(
+        "--time-slack-ms",
+        type=float,
+        default=5,
+        help="absolute slow-down always accepted (default: 5)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        with open(args.candidate, encoding="utf-8") as file:
+            candidate = json.load(file)
+        regressions = compare(
+            baseline,
+            candidate,
+            args.time_tolerance,
+            args.memory_tolerance,
+            args.gap_tolerance,
+            args.time_slack_ms / 1000,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        print(f"{len(regressions)} regressions")
+        sys.exit(1 if regressions else 0)
+
+    parameters = {
+        "number_generations": args.generations,
+        "population_size": args.population,
+        "time_limit_ms": args.time_limit_ms,
+    }
+    records = benchmark(
+        args.sizes,
+        args.engines,
+        args.seed,
+        args.repeats,
+        not args.no_memory,
+        parameters,
+    )
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "machine": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "seed": args.seed,
+        "parameters": parameters,
+        "results": records,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,7 @@ PAGE_LAYOUT: str = "wide"
 
 # Request Configuration
 REQUEST_TIMEOUT: int = 120
+PRODUCTS_PAGE_SIZE: int = 500
 
 # Session Keys
 SESSION_SHOW_FORM: str = "show_form"
@@ -64,6 +64,9 @@ def renderizar_selecao_produtos(
     """
     Render product selection and optimization interface.
 
+    An "auto-tune" checkbox lets the optimizer choose the genetic algorithm
+    parameters instead of the values entered.
+
     Args:
         produtos: List of available products
         otimizacao_service: Optimization service instance
@@ -92,6 +95,13 @@ def renderizar_selecao_produtos(
 
     st.subheader("⚙️ Optimization Parameters")
 
+    ajuste_automatico = st.checkbox(
+        "🤖 Auto-tune genetic algorithm parameters",
+        value=False,
+        help="Let the optimizer choose mutation rate, generations and "
+        "population from the selected products and truck limit",
+    )
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -106,7 +116,8 @@ def renderizar_selecao_produtos(
             min_value=0.0,
             max_value=1.0,
             value=0.01,
-            help="Genetic algorithm mutation rate (0.01 = 1%)"
+            disabled=ajuste_automatico,
+            help="Genetic algorithm mutation rate (0.01 = 1%)",
         )
 
     with col2:
@@ -114,13 +125,15 @@ def renderizar_selecao_produtos(
             "🔄 Number of generations",
             min_value=1,
             value=100,
-            help="Number of genetic algorithm iterations"
+            disabled=ajuste_automatico,
+            help="Number of genetic algorithm iterations",
         )
         tamanho_populacao = st.number_input(
             "👥 Population size",
             min_value=1,
             value=200,
-            help="Size of the genetic algorithm population"
+            disabled=ajuste_automatico,
+            help="Size of the genetic algorithm population",
         )
 
     if st.button("🚀 Execute Optimization", type="primary"):
@@ -130,8 +143,14 @@ def renderizar_selecao_produtos(
 
         with st.spinner("🧬 Executing genetic algorithm..."):
             resultado = executar_otimizacao(
-                produtos, quantidades, limite, taxa_mutacao,
-                numero_geracoes, tamanho_populacao, otimizacao_service
+                produtos,
+                quantidades,
+                limite,
+                taxa_mutacao,
+                numero_geracoes,
+                tamanho_populacao,
+                otimizacao_service,
+                ajuste_automatico,
             )
 
         if resultado:
@@ -139,9 +158,14 @@ def renderizar_selecao_produtos(
 
 
 def executar_otimizacao(
-    produtos: List, quantidades: Dict[str, int], limite: float,
-    taxa_mutacao: float, numero_geracoes: int, tamanho_populacao: int,
-    otimizacao_service: OtimizacaoService
+    produtos: List,
+    quantidades: Dict[str, int],
+    limite: float,
+    taxa_mutacao: float,
+    numero_geracoes: int,
+    tamanho_populacao: int,
+    otimizacao_service: OtimizacaoService,
+    ajuste_automatico: bool = False,
 ) -> Dict[str, Any]:
     """
     Execute cargo optimization using genetic algorithm.
@@ -154,14 +178,21 @@ def executar_otimizacao(
         numero_geracoes: Number of generations
         tamanho_populacao: Population size
         otimizacao_service: Optimization service instance
+        ajuste_automatico: Let the optimizer choose the genetic algorithm
+            parameters
 
     Returns:
         Dict[str, Any]: Optimization result or None if failed
     """
     try:
         resultado = otimizacao_service.otimizar(
-            produtos, quantidades, limite, taxa_mutacao,
-            numero_geracoes, tamanho_populacao
+            produtos,
+            quantidades,
+            limite,
+            taxa_mutacao,
+            numero_geracoes,
+            tamanho_populacao,
+            ajuste_automatico,
         )
         mostrar_sucesso("Optimization completed successfully!")
         return resultado
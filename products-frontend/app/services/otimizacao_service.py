@@ -28,12 +28,17 @@ class OtimizacaoService:
         Sets up the base URL and timeout configuration for API calls.
         """
         self.base_url: str = OPTIMIZER_API_URL
+        self.by_id_url: str = f"{OPTIMIZER_API_URL.rstrip('/')}/by-id"
         self.timeout: int = REQUEST_TIMEOUT
 
     def otimizar_carga(
-        self, produtos_selecionados: List[Dict], limite: float,
-        taxa_mutacao: float = 0.01, numero_geracoes: int = 100,
-        tamanho_populacao: int = 200
+        self,
+        produtos_selecionados: List[Dict],
+        limite: float,
+        taxa_mutacao: float = 0.01,
+        numero_geracoes: int = 100,
+        tamanho_populacao: int = 200,
+        ajuste_automatico: bool = False,
     ) -> Dict[str, Any]:
         """
         Execute cargo optimization using genetic algorithm.
@@ -44,6 +49,8 @@ class OtimizacaoService:
             taxa_mutacao: Mutation rate for genetic algorithm (default: 0.01)
             numero_geracoes: Number of generations (default: 100)
             tamanho_populacao: Population size (default: 200)
+            ajuste_automatico: Let the optimizer choose the genetic algorithm
+                parameters, ignoring the three above (default: False)
 
         Returns:
             Dict[str, Any]: Optimization result from the genetic algorithm
@@ -57,7 +64,8 @@ class OtimizacaoService:
             "limit": limite,
             "mutation_rate": taxa_mutacao,
             "number_generations": numero_geracoes,
-            "population_size": tamanho_populacao
+            "population_size": tamanho_populacao,
+            "auto_tune": ajuste_automatico,
         }
 
         try:
@@ -76,13 +84,21 @@ class OtimizacaoService:
             raise Exception(f"Error during optimization: {e}")
 
     def otimizar(
-        self, produtos: List, quantidades: Dict[str, int], limite: float,
-        taxa_mutacao: float = 0.01, numero_geracoes: int = 100,
-        tamanho_populacao: int = 200
+        self,
+        produtos: List,
+        quantidades: Dict[str, int],
+        limite: float,
+        taxa_mutacao: float = 0.01,
+        numero_geracoes: int = 100,
+        tamanho_populacao: int = 200,
+        ajuste_automatico: bool = False,
     ) -> Dict[str, Any]:
         """
         Execute cargo optimization with product list and quantities.
 
+        Only product ids and quantities are sent: the optimizer resolves the
+        product records from products-service itself.
+
         Args:
             produtos: List of available products
             quantidades: Dictionary of product quantities
@@ -90,22 +106,33 @@ class OtimizacaoService:
             taxa_mutacao: Mutation rate for genetic algorithm (default: 0.01)
             numero_geracoes: Number of generations (default: 100)
             tamanho_populacao: Population size (default: 200)
+            ajuste_automatico: Let the optimizer choose the genetic algorithm
+                parameters (default: False)
 
         Returns:
             Dict[str, Any]: Optimization result from the genetic algorithm
         """
-        produtos_selecionados = []
-        for produto in produtos:
-            quantidade = quantidades.get(produto.id, 0)
-            if quantidade > 0:
-                produtos_selecionados.append({
-                    "name": produto.nome,
-                    "space": produto.espaco,
-                    "value": produto.valor,
-                    "amount": quantidade
-                })
-
-        return self.otimizar_carga(
-            produtos_selecionados, limite, taxa_mutacao,
-            numero_geracoes, tamanho_populacao
-        )
+        itens = {
+            produto.id: quantidades[produto.id]
+            for produto in produtos
+            if quantidades.get(produto.id, 0) > 0
+        }
+        payload = {
+            "items": itens,
+            "limit": limite,
+            "mutation_rate": taxa_mutacao,
+            "number_generations": numero_geracoes,
+            "population_size": tamanho_populacao,
+            "auto_tune": ajuste_automatico,
+        }
+
+        try:
+            response = requests.post(self.by_id_url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.ConnectionError as e:
+            print(f"Debug: ConnectionError = {e}")
+            raise ConnectionError("Connection error with optimization service.")
+        except requests.exceptions.RequestException as e:
+            print(f"Debug: RequestException = {e}")
+            raise Exception(f"Error during optimization: {e}")
@@ -6,10 +6,14 @@ including CRUD operations through HTTP API calls to the backend service.
 """
 
 import requests
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from models.produto import Produto
-from config import PRODUCTS_API_URL, REQUEST_TIMEOUT
+from config import PRODUCTS_API_URL, PRODUCTS_PAGE_SIZE, REQUEST_TIMEOUT
+
+# Last catalog downloaded and the ETag of its first page, shared by the
+# reruns of every page (the Streamlit process keeps module state)
+_catalogo: Optional[Tuple[str, List[Produto]]] = None
 
 
 class ProdutoService:
@@ -33,6 +37,11 @@ class ProdutoService:
         """
         Retrieve all products from the API.
 
+        The listing is paginated; pages are requested until the API returns
+        no next cursor. The first page is requested with the ETag of the
+        last download: the ETag is the catalog version, so a 304 means the
+        whole catalog is unchanged and the last download is reused.
+
         Returns:
             List[Produto]: List of all products
 
@@ -40,11 +49,27 @@ class ProdutoService:
             ConnectionError: If connection to the products service fails
             Exception: If there's an error retrieving products
         """
+        global _catalogo
         try:
-            response = requests.get(self.base_url, timeout=self.timeout)
-            response.raise_for_status()
-            produtos_data = response.json()
-            return [Produto.from_dict(data) for data in produtos_data]
+            produtos: List[Produto] = []
+            params = {"limit": PRODUCTS_PAGE_SIZE}
+            headers = {"If-None-Match": _catalogo[0]} if _catalogo else {}
+            etag = None
+            while True:
+                response = requests.get(
+                    self.base_url, params=params, headers=headers, timeout=self.timeout
+                )
+                if response.status_code == 304 and _catalogo:
+                    return list(_catalogo[1])
+                response.raise_for_status()
+                etag = etag or response.headers.get("ETag")
+                headers = {}
+                pagina = response.json()
+                produtos.extend(Produto.from_dict(data) for data in pagina["items"])
+                if not pagina["next_cursor"]:
+                    _catalogo = (etag, produtos) if etag else None
+                    return list(produtos)
+                params["cursor"] = pagina["next_cursor"]
         except requests.exceptions.ConnectionError:
             raise ConnectionError("Connection error with products service.")
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,531 @@
+"""
+Product Cache Module.
+
+This module keeps recently read products and product listings in memory, so
+repeated reads of an unchanged catalog do not reach the database. The
+repository reads through the cache and invalidates it after every write it
+commits.
+
+Each process (uvicorn worker or replica) has its own cache, so writes are
+also announced to the other processes through a notifier: PostgreSQL
+``LISTEN/NOTIFY`` in production, or an in-memory notifier for a single
+process and for tests. While the PostgreSQL listener is disconnected the
+cache is bypassed, since announcements may be missed.
+
+Announcements also carry the catalog version the write committed, so each
+worker knows the current version (for ETags) without querying it.
+"""
+
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.engine import make_url
+
+from app.schemas.product import Product
+
+# Products kept by id (0 disables the cache)
+PRODUCT_CACHE_SIZE: int = int(os.getenv("PRODUCT_CACHE_SIZE", "10000"))
+
+# Listings (the full catalog and pages) kept
+PRODUCT_CACHE_LISTINGS: int = int(os.getenv("PRODUCT_CACHE_LISTINGS", "64"))
+
+# PostgreSQL channel the invalidations are announced on
+PRODUCT_CACHE_CHANNEL: str = os.getenv("PRODUCT_CACHE_CHANNEL", "products_cache")
+
+# Seconds between reconnection attempts of the PostgreSQL listener
+NOTIFY_RETRY_DELAY: float = 5.0
+
+# Largest NOTIFY payload; larger invalidations are sent as "everything"
+NOTIFY_MAX_PAYLOAD: int = 7000
+
+
+class ProductCache:
+    """
+    Bounded, least-recently-used cache of products and product listings.
+
+    Every invalidation bumps ``generation``; readers note it before querying
+    the database and the result is only stored if no write happened
+    meanwhile, so a slow read cannot put stale data back in the cache.
+
+    Attributes:
+        max_size: Maximum number of products kept
+        max_listings: Maximum number of listings kept
+        active: Whether the cache may be used; False while invalidations
+            could be missed
+        generation: Number of invalidations so far
+        version: Latest catalog version known to this worker, or None when
+            it must be read from the database
+        hits: Lookups served from the cache
+        misses: Lookups that went to the database
+    """
+
+    def __init__(
+        self,
+        max_size: int = PRODUCT_CACHE_SIZE,
+        max_listings: int = PRODUCT_CACHE_LISTINGS,
+    ) -> None:
+        """
+        Initialize the product cache.
+
+        Args:
+            max_size: Maximum number of products kept by id
+            max_listings: Maximum number of listings kept
+        """
+        self.max_size = max_size
+        self.max_listings = max_listings
+        self.active = max_size > 0
+        self.generation = 0
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.notifier: Optional[Any] = None
+        self._products: "OrderedDict[str, Product]" = OrderedDict()
+        self._listings: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, product_id: str) -> Optional[Product]:
+        """
+        Look up a product.
+
+        Args:
+            product_id: Product ID
+
+        Returns:
+            Optional[Product]: Cached product, or None on a miss
+        """
+        return self._lookup(self._products, product_id)
+
+    def put(self, product: Product, generation: int) -> None:
+        """
+        Store a product read from the database.
+
+        Args:
+            product: Product read
+            generation: Value of ``generation`` before the read
+        """
+        self._store(self._products, product.id, product, self.max_size, generation)
+
+    def get_listing(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a listing.
+
+        Args:
+            key: Listing key, e.g. ("all",) or ("page", limit, after)
+
+        Returns:
+            Optional[Any]: Cached listing, or None on a miss; treat it as
+            read-only
+        """
+        return self._lookup(self._listings, key)
+
+    def put_listing(self, key: Hashable, listing: Any, generation: int) -> None:
+        """
+        Store a listing read from the database.
+
+        Args:
+            key: Listing key
+            listing: Listing read
+            generation: Value of ``generation`` before the read
+        """
+        self._store(self._listings, key, listing, self.max_listings, generation)
+
+    def get_version(self) -> Optional[int]:
+        """
+        Current catalog version, if this worker can vouch for it.
+
+        Returns:
+            Optional[int]: Catalog version, or None when it must be read
+            from the database
+        """
+        return self.version if self.active else None
+
+    def set_version(self, version: int, generation: int) -> None:
+        """
+        Store the catalog version read from the database.
+
+        Args:
+            version: Catalog version read
+            generation: Value of ``generation`` before the read
+        """
+        if self.active and generation == self.generation:
+            self.version = version
+
+    def drop(
+        self, product_ids: Optional[Iterable[str]] = None, version: Optional[int] = None
+    ) -> None:
+        """
+        Forget changed products and every listing.
+
+        Args:
+            product_ids: Products written, or None when unknown (forgets
+                every product)
+            version: Catalog version committed by the write, or None when
+                unknown (the version is then read again from the database)
+        """
+        self.generation += 1
+        self._listings.clear()
+        if version is None:
+            self.version = None
+        elif self.version is not None:
+            # Anúncios de workers diferentes podem chegar fora de ordem
+            self.version = max(self.version, version)
+        if product_ids is None:
+            self._products.clear()
+            return
+        for product_id in product_ids:
+            self._products.pop(product_id, None)
+
+    def invalidate(
+        self, product_ids: Optional[Iterable[str]] = None, version: Optional[int] = None
+    ) -> None:
+        """
+        Forget changed products here and announce the change to the other
+        processes.
+
+        Args:
+            product_ids: Products written, or None when unknown
+            version: Catalog version committed by the write
+        """
+        if product_ids is not None:
+            product_ids = list(product_ids)
+        self.drop(product_ids, version)
+        if self.notifier is not None:
+            self.notifier.publish(self, product_ids, version)
+
+    async def start(self, notifier: Any) -> None:
+        """
+        Start receiving the invalidations announced by other processes.
+
+        Args:
+            notifier: LocalNotifier or PostgresNotifier
+        """
+        self.notifier = notifier
+        await notifier.start(self)
+
+    async def stop(self) -> None:
+        """
+        Stop the notifier, sending any pending announcement first.
+        """
+        if self.notifier is not None:
+            await self.notifier.stop(self)
+            self.notifier = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Size and effectiveness of the cache.
+
+        Returns:
+            Dict[str, Any]: Entries, limits, hits, misses and hit ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "active": self.active,
+            "notifier": type(self.notifier).__name__ if self.notifier else None,
+            "products": len(self._products),
+            "max_size": self.max_size,
+            "listings": len(self._listings),
+            "max_listings": self.max_listings,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.generation,
+            "version": self.version,
+        }
+
+    def _lookup(
+        self, entries: "OrderedDict[Hashable, Any]", key: Hashable
+    ) -> Optional[Any]:
+        """
+        Look up an entry, marking it as recently used.
+
+        Args:
+            entries: Products or listings
+            key: Entry key
+
+        Returns:
+            Optional[Any]: Entry, or None on a miss
+        """
+        if not self.active:
+            return None
+        value = entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entries.move_to_end(key)
+        return value
+
+    def _store(
+        self,
+        entries: "OrderedDict[Hashable, Any]",
+        key: Hashable,
+        value: Any,
+        limit: int,
+        generation: int,
+    ) -> None:
+        """
+        Store an entry unless a write happened since it was read.
+
+        Args:
+            entries: Products or listings
+            key: Entry key
+            value: Entry
+            limit: Maximum number of entries
+            generation: Value of ``generation`` before the read
+        """
+        if not self.active or generation != self.generation or limit <= 0:
+            return
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > limit:
+            entries.popitem(last=False)
+
+
+class LocalNotifier:
+    """
+    In-memory notifier connecting the caches of a single process.
+
+    Several caches started with the same LocalNotifier behave like several
+    workers sharing a database, which makes cross-worker invalidation
+    testable without PostgreSQL.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the notifier with no subscribers.
+        """
+        self._caches: List[ProductCache] = []
+
+    async def start(self, cache: ProductCache) -> None:
+        """
+        Subscribe a cache to the announcements.
+
+        Args:
+            cache: Cache to invalidate when another cache announces a write
+        """
+        self._caches.append(cache)
+
+    async def stop(self, cache: ProductCache) -> None:
+        """
+        Unsubscribe a cache.
+
+        Args:
+            cache: Cache to unsubscribe
+        """
+        if cache in self._caches:
+            self._caches.remove(cache)
+
+    def publish(
+        self,
+        source: ProductCache,
+        product_ids: Optional[List[str]],
+        version: Optional[int] = None,
+    ) -> None:
+        """
+        Invalidate every other subscribed cache.
+
+        Args:
+            source: Cache that announced the write
+            product_ids: Products written, or None when unknown
+            version: Catalog version committed by the write
+        """
+        for cache in self._caches:
+            if cache is not source:
+                cache.drop(product_ids, version)
+
+
+class PostgresNotifier:
+    """
+    Notifier relaying invalidations through PostgreSQL ``LISTEN/NOTIFY``.
+
+    Uses one dedicated asyncpg connection per process, outside the pool.
+    Announcements are queued and sent by a background task, coalescing the
+    writes made while the previous NOTIFY was in flight, so writes never
+    wait for them. Payloads are ``<origin>:<version>:<id>,<id>,...`` or
+    ``<origin>:<version>:*``; a process ignores its own announcements.
+    """
+
+    def __init__(self, database_url: str, channel: str = PRODUCT_CACHE_CHANNEL) -> None:
+        """
+        Initialize the notifier.
+
+        Args:
+            database_url: SQLAlchemy URL of the PostgreSQL database
+            channel: Channel the announcements are sent on
+        """
+        url = make_url(database_url).set(drivername="postgresql")
+        self.dsn = url.render_as_string(hide_password=False)
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._cache: Optional[ProductCache] = None
+        self._queue: "asyncio.Queue[Tuple[Optional[int], Optional[List[str]]]]" = (
+            asyncio.Queue()
+        )
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def start(self, cache: ProductCache) -> None:
+        """
+        Start listening in the background; the cache stays inactive until
+        the listener is connected.
+
+        Args:
+            cache: Cache to invalidate on announcements
+        """
+        self._cache = cache
+        cache.active = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, cache: ProductCache) -> None:
+        """
+        Send the pending announcements, then close the connection.
+
+        Args:
+            cache: Cache being stopped
+        """
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), NOTIFY_RETRY_DELAY)
+        except asyncio.TimeoutError:
+            pass
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def publish(
+        self,
+        source: ProductCache,
+        product_ids: Optional[List[str]],
+        version: Optional[int] = None,
+    ) -> None:
+        """
+        Queue an announcement for the other processes.
+
+        Args:
+            source: Cache that announced the write
+            product_ids: Products written, or None when unknown
+            version: Catalog version committed by the write
+        """
+        self._queue.put_nowait((version, product_ids))
+
+    def _receive(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """
+        Invalidate the cache for an announcement of another process.
+
+        Args:
+            connection: Listening connection
+            pid: Backend process of the sender
+            channel: Channel of the announcement
+            payload: ``<origin>:<version>:<ids>`` or ``<origin>:<version>:*``
+        """
+        origin, version, ids = payload.split(":", 2)
+        if origin != self.origin and self._cache is not None:
+            self._cache.drop(
+                None if ids == "*" else ids.split(","),
+                int(version) if version else None,
+            )
+
+    def _lost(self, connection: Any) -> None:
+        """
+        Stop using the cache as soon as the listener connection drops.
+
+        Args:
+            connection: Listening connection
+        """
+        if self._cache is not None:
+            self._cache.active = False
+
+    def _payload(
+        self, first: Tuple[Optional[int], Optional[List[str]]]
+    ) -> Tuple[Optional[int], str]:
+        """
+        Merge the queued announcements into one payload.
+
+        Args:
+            first: Announcement already taken from the queue
+
+        Returns:
+            Tuple[Optional[int], str]: Latest version announced and the
+            NOTIFY payload
+        """
+        version, product_ids = first
+        merged: Optional[Set[str]] = None if product_ids is None else set(product_ids)
+        while not self._queue.empty():
+            queued_version, product_ids = self._queue.get_nowait()
+            self._queue.task_done()
+            if queued_version is not None:
+                version = max(version or 0, queued_version)
+            if merged is not None and product_ids is not None:
+                merged.update(product_ids)
+            else:
+                merged = None
+        ids = "*" if merged is None else ",".join(sorted(merged))
+        if len(ids) > NOTIFY_MAX_PAYLOAD:
+            ids = "*"
+        return version, f"{self.origin}:{'' if version is None else version}:{ids}"
+
+    async def _run(self) -> None:
+        """
+        Keep the listener connected and send the queued announcements.
+        """
+        import asyncpg
+
+        cache = self._cache
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                connection.add_termination_listener(self._lost)
+                await connection.add_listener(self.channel, self._receive)
+                # Anúncios feitos enquanto não havia escuta se perderam
+                cache.drop()
+                cache.active = cache.max_size > 0
+                while not connection.is_closed():
+                    try:
+                        first = await asyncio.wait_for(
+                            self._queue.get(), NOTIFY_RETRY_DELAY
+                        )
+                    except asyncio.TimeoutError:
+                        continue
+                    version, payload = self._payload(first)
+                    try:
+                        await connection.execute(
+                            "SELECT pg_notify($1, $2)", self.channel, payload
+                        )
+                    except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                        # Reenvia depois de reconectar para não perder o anúncio
+                        self._queue.put_nowait((version, None))
+                        raise
+                    finally:
+                        self._queue.task_done()
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                pass
+            finally:
+                cache.active = False
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+            await asyncio.sleep(NOTIFY_RETRY_DELAY)
+
+
+def create_notifier(database_url: str) -> Any:
+    """
+    Notifier suited to a database.
+
+    Args:
+        database_url: SQLAlchemy URL of the database
+
+    Returns:
+        PostgresNotifier for PostgreSQL, LocalNotifier otherwise (a single
+        SQLite process has no other workers to notify)
+    """
+    if make_url(database_url).get_backend_name() == "postgresql":
+        return PostgresNotifier(database_url)
+    return LocalNotifier()
+
+
+product_cache = ProductCache()
@@ -0,0 +1,275 @@
+"""
+Import Controller Module.
+
+This module loads catalog dumps (CSV or Parquet) into the products table.
+Files are read in chunks of IMPORT_CHUNK_SIZE rows, each chunk is validated
+and handed to the repository, which copies it into a staging table on
+PostgreSQL or upserts it directly elsewhere, so memory use depends on the
+chunk size rather than on the file size.
+
+Rows are matched by ``id``: existing products are updated, unknown ids are
+inserted and rows without an id get a new one. When an id repeats in the
+file, the last row wins; row counts still include every repeated row.
+"""
+
+import asyncio
+import csv
+import io
+import os
+import time
+import uuid
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product import ImportRowError, ImportSummary, ProductCreate
+
+# Rows validated and loaded at a time
+IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", "10000"))
+
+# Rejected rows reported in the summary (the count covers all of them)
+IMPORT_MAX_ERRORS: int = 100
+
+# Formats accepted by the import
+IMPORT_FORMATS = ("csv", "parquet")
+
+# Columns every imported row must have
+REQUIRED_COLUMNS = ("nome", "espaco", "valor")
+
+# A chunk ready for the repository and the rows it rejected
+Chunk = Tuple[List[Tuple[str, str, float, float]], List[ImportRowError]]
+
+
+def detect_format(filename: Optional[str]) -> str:
+    """
+    Guess the import format from a file name.
+
+    Args:
+        filename: Name of the uploaded or local file
+
+    Returns:
+        str: "parquet" for .parquet/.pq files, "csv" otherwise
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    return "parquet" if extension in (".parquet", ".pq") else "csv"
+
+
+def _check_columns(columns: List[str]) -> None:
+    """
+    Ensure a file has every required column.
+
+    Args:
+        columns: Column names of the file
+
+    Raises:
+        ValueError: If a required column is missing
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+
+def _csv_records(file: BinaryIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Read the records of a CSV file with a header line.
+
+    Args:
+        file: Binary file positioned at the header
+
+    Yields:
+        Tuple[int, Dict[str, Any]]: Line number and record
+
+    Raises:
+        ValueError: If the header lacks a required column
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        header = [column.strip() for column in next(reader, [])]
+        _check_columns(header)
+        for values in reader:
+            if values:
+                yield reader.line_num, dict(zip(header, values))
+    except csv.Error as error:
+        raise ValueError(f"Line {reader.line_num}: {error}") from None
+    finally:
+        # Devolve o arquivo a quem o abriu em vez de fechá-lo junto
+        text.detach()
+
+
+def _parquet_records(
+    file: BinaryIO, chunk_size: int
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Read the records of a Parquet file, one row group batch at a time.
+
+    Args:
+        file: Binary file
+        chunk_size: Rows read per batch
+
+    Yields:
+        Tuple[int, Dict[str, Any]]: Row number, counting from 1, and record
+
+    Raises:
+        ValueError: If pyarrow is not installed or a required column is missing
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError(
+            "Parquet imports require pyarrow (pip install pyarrow)"
+        ) from None
+
+    parquet = pq.ParquetFile(file)
+    names = parquet.schema_arrow.names
+    _check_columns(names)
+    columns = [column for column in ("id",) + REQUIRED_COLUMNS if column in names]
+    line = 0
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+        for record in batch.to_pylist():
+            line += 1
+            yield line, record
+
+
+def _row(record: Dict[str, Any]) -> Tuple[str, str, float, float]:
+    """
+    Validate one record.
+
+    Args:
+        record: Imported record
+
+    Returns:
+        Tuple[str, str, float, float]: id, nome, espaco and valor
+
+    Raises:
+        ValidationError: If nome, espaco or valor is invalid
+    """
+    product = ProductCreate.model_validate(record)
+    product_id = record.get("id")
+    product_id = str(product_id).strip() if product_id is not None else ""
+    return product_id or str(uuid.uuid4()), product.nome, product.espaco, product.valor
+
+
+def read_chunks(
+    file: BinaryIO, file_format: str, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Iterator[Chunk]:
+    """
+    Read and validate a catalog file in chunks.
+
+    Args:
+        file: Binary file to import
+        file_format: "csv" or "parquet"
+        chunk_size: Rows per chunk
+
+    Yields:
+        Chunk: Valid rows of the chunk and the rows it rejected
+
+    Raises:
+        ValueError: If the format is unknown or the file cannot be read
+    """
+    if file_format == "csv":
+        records = _csv_records(file)
+    elif file_format == "parquet":
+        records = _parquet_records(file, chunk_size)
+    else:
+        raise ValueError(
+            f"Unknown format {file_format!r}, use one of {', '.join(IMPORT_FORMATS)}"
+        )
+
+    rows: List[Tuple[str, str, float, float]] = []
+    errors: List[ImportRowError] = []
+    for line, record in records:
+        try:
+            rows.append(_row(record))
+        except ValidationError as error:
+            errors.append(
+                ImportRowError(
+                    line=line,
+                    detail="; ".join(
+                        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+                        for item in error.errors()
+                    ),
+                )
+            )
+        if len(rows) + len(errors) >= chunk_size:
+            yield rows, errors
+            rows, errors = [], []
+    if rows or errors:
+        yield rows, errors
+
+
+class ImportController:
+    """
+    Controller for catalog imports.
+
+    Handles reading and validating the file and reports progress after each
+    chunk; the repository decides how the rows reach the database.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Initialize the import controller.
+
+        Args:
+            db: Database session instance
+        """
+        self.repository = ProductRepository(db)
+
+    async def import_file(
+        self,
+        file: BinaryIO,
+        file_format: str,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        on_progress: Optional[Callable[[int, int, float], None]] = None,
+    ) -> ImportSummary:
+        """
+        Import a catalog file in a single transaction.
+
+        Args:
+            file: Binary file to import
+            file_format: "csv" or "parquet"
+            chunk_size: Rows validated and loaded at a time
+            on_progress: Called after each chunk with the rows loaded and
+                rejected so far (input rows, repeated ids included) and the
+                seconds elapsed
+
+        Returns:
+            ImportSummary: Counts, throughput and the first rejected rows
+
+        Raises:
+            ValueError: If the format is unknown or the file cannot be read
+        """
+        started = time.perf_counter()
+        chunks = read_chunks(file, file_format, chunk_size)
+        loaded = rejected = count = 0
+        errors: List[ImportRowError] = []
+
+        await self.repository.start_import()
+        while True:
+            # A leitura e a validação rodam numa thread para não travar o loop
+            # de eventos
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                break
+            rows, chunk_errors = chunk
+            await self.repository.import_rows(rows)
+            count += 1
+            loaded += len(rows)
+            rejected += len(chunk_errors)
+            errors.extend(chunk_errors[: IMPORT_MAX_ERRORS - len(errors)])
+            if on_progress is not None:
+                on_progress(loaded, rejected, time.perf_counter() - started)
+        await self.repository.finish_import()
+
+        elapsed = time.perf_counter() - started
+        return ImportSummary(
+            rows=loaded,
+            rejected=rejected,
+            chunks=count,
+            seconds=elapsed,
+            rows_per_second=loaded / elapsed if elapsed > 0 else 0.0,
+            method=self.repository.import_method(),
+            errors=errors,
+        )
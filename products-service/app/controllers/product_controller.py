@@ -5,13 +5,43 @@ This module contains the business logic controller for product operations,
 providing an interface between the API routes and the repository layer.
 """
 
-from typing import List, Optional
+import base64
+import binascii
+import csv
+import io
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from sqlalchemy.orm import Session
-from app.schemas.product import ProductCreate, Product
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.product import (
+    BulkItemResult,
+    BulkResult,
+    DeletedProduct,
+    ProductChanges,
+    ProductCreate,
+    Product,
+    ProductPage,
+    ProductPatch,
+    ProductVersion,
+)
 from app.repositories.product_repository import ProductRepository
 
 
+# Hours tombstones of deleted products are kept for the change feed
+TOMBSTONE_RETENTION_HOURS: float = float(os.getenv("TOMBSTONE_RETENTION_HOURS", "168"))
+
+
+class ChangesExpiredError(Exception):
+    """
+    Raised when the change feed cannot serve changes since a version,
+    because deletions after it were compacted or the version is unknown.
+    """
+
+
 class ProductController:
     """
     Controller for managing product business logic.
@@ -20,7 +50,7 @@ class ProductController:
     providing a clean interface for product operations.
     """
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         """
         Initialize the product controller.
 
@@ -29,16 +59,188 @@ class ProductController:
         """
         self.repository = ProductRepository(db)
 
-    def get_all_products(self) -> List[Product]:
+    async def get_all_products(self) -> List[Product]:
         """
         Retrieve all products.
 
         Returns:
             List[Product]: List of all products
         """
-        return self.repository.get_all()
+        return await self.repository.get_all()
+
+    async def get_products_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> ProductPage:
+        """
+        Retrieve one page of products.
+
+        Args:
+            limit: Maximum number of products in the page
+            cursor: Cursor returned with the previous page, if any
+
+        Returns:
+            ProductPage: Products of the page and the cursor of the next one
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = self.decode_cursor(cursor) if cursor is not None else None
+        items, more = await self.repository.get_page(limit, after)
+        return ProductPage(
+            items=items, next_cursor=self.encode_cursor(items[-1].id) if more else None
+        )
+
+    @staticmethod
+    def encode_cursor(product_id: str) -> str:
+        """
+        Build the opaque cursor of the page following a product.
+
+        Args:
+            product_id: Id of the last product of a page
+
+        Returns:
+            str: URL-safe cursor
+        """
+        return base64.urlsafe_b64encode(product_id.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> str:
+        """
+        Recover the product id a cursor points after.
+
+        Args:
+            cursor: Cursor built by ``encode_cursor``
+
+        Returns:
+            str: Id of the last product of the previous page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+        except (binascii.Error, UnicodeError):
+            raise ValueError("Invalid cursor") from None
 
-    def get_product_by_id(self, product_id: str) -> Optional[Product]:
+    async def export_products(self, export_format: str) -> AsyncIterator[str]:
+        """
+        Serialize the whole catalog as it is read from the database.
+
+        Each chunk holds one batch of the server-side cursor, so the first
+        chunk is ready after the first batch and memory stays constant.
+
+        Args:
+            export_format: "ndjson" (one JSON object per line) or "csv"
+                (with a header row)
+
+        Yields:
+            str: The next chunk of the export
+        """
+        fields = ("id", "nome", "espaco", "valor")
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(fields)
+            async for rows in self.repository.stream_all():
+                writer.writerows(rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            async for rows in self.repository.stream_all():
+                yield "".join(json.dumps(dict(zip(fields, row))) + "\n" for row in rows)
+
+    async def get_catalog_version(self) -> int:
+        """
+        Retrieve the current catalog version.
+
+        Returns:
+            int: Catalog version, bumped by every write
+        """
+        return await self.repository.get_version()
+
+    async def get_changes(self, since: int) -> ProductChanges:
+        """
+        Retrieve the changes to the catalog since a version.
+
+        Args:
+            since: Catalog version the client is synchronized with (0 for
+                the whole catalog, as long as no tombstone was compacted)
+
+        Returns:
+            ProductChanges: Products written and deleted after ``since``
+
+        Raises:
+            ChangesExpiredError: If the changes since that version are no
+                longer complete, or the version is ahead of the catalog; the
+                client must reload the catalog
+        """
+        version, compacted, changed, deleted = await self.repository.get_changes(since)
+        if since < compacted:
+            raise ChangesExpiredError(
+                f"Changes before version {compacted} were compacted; reload the catalog"
+            )
+        if since > version:
+            raise ChangesExpiredError(
+                f"Version {since} is ahead of the catalog (version {version}); "
+                "reload the catalog"
+            )
+        return ProductChanges(
+            since=since,
+            version=version,
+            changed=[ProductVersion.model_validate(row) for row in changed],
+            deleted=[DeletedProduct(id=row.id, version=row.version) for row in deleted],
+        )
+
+    async def compact_changes(self) -> int:
+        """
+        Drop the tombstones older than TOMBSTONE_RETENTION_HOURS.
+
+        Returns:
+            int: Tombstones removed
+        """
+        before = datetime.now(timezone.utc) - timedelta(hours=TOMBSTONE_RETENTION_HOURS)
+        return await self.repository.compact_tombstones(before)
+
+    @staticmethod
+    def etag(version: int) -> str:
+        """
+        Build the strong ETag of a representation at a catalog version.
+
+        A response is fully determined by its URL and the catalog version,
+        so the version alone tells representations of one URL apart.
+
+        Args:
+            version: Catalog version the response was built at
+
+        Returns:
+            str: Quoted entity tag
+        """
+        return f'"{version}"'
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """
+        Check an ``If-None-Match`` header against the current ETag.
+
+        Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+
+        Args:
+            if_none_match: Header value, if sent
+            etag: Current entity tag
+
+        Returns:
+            bool: True if the client already has the current representation
+        """
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+    async def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """
         Retrieve a product by its ID.
 
@@ -48,9 +250,9 @@ class ProductController:
         Returns:
             Optional[Product]: Product if found, None otherwise
         """
-        return self.repository.get_by_id(product_id)
+        return await self.repository.get_by_id(product_id)
 
-    def create_product(self, product_data: ProductCreate) -> Product:
+    async def create_product(self, product_data: ProductCreate) -> Product:
         """
         Create a new product.
 
@@ -60,9 +262,9 @@ class ProductController:
         Returns:
             Product: Created product instance
         """
-        return self.repository.create(product_data)
+        return await self.repository.create(product_data)
 
-    def update_product(
+    async def update_product(
         self, product_id: str, product_data: ProductCreate
     ) -> Optional[Product]:
         """
@@ -75,9 +277,9 @@ class ProductController:
         Returns:
             Optional[Product]: Updated product if found, None otherwise
         """
-        return self.repository.update(product_id, product_data)
+        return await self.repository.update(product_id, product_data)
 
-    def delete_product(self, product_id: str) -> bool:
+    async def delete_product(self, product_id: str) -> bool:
         """
         Delete a product.
 
@@ -87,4 +289,161 @@ class ProductController:
         Returns:
             bool: True if product was deleted, False otherwise
         """
-        return self.repository.delete(product_id)
+        return await self.repository.delete(product_id)
+
+    async def create_products(self, items: List[Any]) -> BulkResult:
+        """
+        Create several products in one transaction.
+
+        Each item is validated on its own; invalid items are reported and
+        the valid ones are still created.
+
+        Args:
+            items: Product data for creation, one object per product
+
+        Returns:
+            BulkResult: Outcome of each item, with the created products
+        """
+        results: Dict[int, BulkItemResult] = {}
+        valid: Dict[int, ProductCreate] = {}
+        for index, item in enumerate(items):
+            try:
+                valid[index] = ProductCreate.model_validate(item)
+            except ValidationError as error:
+                results[index] = self._item_error(index, None, self._describe(error))
+
+        created = await self.repository.create_many(list(valid.values()))
+        for index, product in zip(valid, created):
+            results[index] = BulkItemResult(
+                index=index, id=product.id, status="created", product=product
+            )
+        return self._bulk_result(results, len(items))
+
+    async def update_products(self, items: List[Any]) -> BulkResult:
+        """
+        Apply partial updates to several products in one transaction.
+
+        Invalid items, items that change no field, unknown ids and ids
+        repeated in the request are reported; the other updates are still
+        applied.
+
+        Args:
+            items: Partial updates, each with the product id and the fields
+                that change
+
+        Returns:
+            BulkResult: Outcome of each item, with the updated products
+        """
+        results: Dict[int, BulkItemResult] = {}
+        valid: Dict[int, ProductPatch] = {}
+        seen = set()
+        for index, item in enumerate(items):
+            try:
+                patch = ProductPatch.model_validate(item)
+            except ValidationError as error:
+                results[index] = self._item_error(index, None, self._describe(error))
+                continue
+            if not patch.model_dump(
+                exclude={"id"}, exclude_unset=True, exclude_none=True
+            ):
+                results[index] = self._item_error(
+                    index, patch.id, "No fields to update: give nome, espaco or valor"
+                )
+                continue
+            if patch.id in seen:
+                results[index] = self._item_error(
+                    index, patch.id, "Duplicate product id"
+                )
+                continue
+            seen.add(patch.id)
+            valid[index] = patch
+
+        updated = await self.repository.update_many(list(valid.values()))
+        for index, patch in valid.items():
+            product = updated.get(patch.id)
+            if product is None:
+                results[index] = self._item_error(index, patch.id, "Product not found")
+            else:
+                results[index] = BulkItemResult(
+                    index=index, id=patch.id, status="updated", product=product
+                )
+        return self._bulk_result(results, len(items))
+
+    async def delete_products(self, product_ids: List[str]) -> BulkResult:
+        """
+        Delete several products in one transaction.
+
+        Args:
+            product_ids: Ids of the products to delete
+
+        Returns:
+            BulkResult: Outcome of each id; unknown and repeated ids are
+            reported as errors
+        """
+        deleted = await self.repository.delete_many(product_ids)
+        results: Dict[int, BulkItemResult] = {}
+        seen = set()
+        for index, product_id in enumerate(product_ids):
+            if product_id in seen:
+                results[index] = self._item_error(
+                    index, product_id, "Duplicate product id"
+                )
+            elif product_id in deleted:
+                results[index] = BulkItemResult(
+                    index=index, id=product_id, status="deleted"
+                )
+            else:
+                results[index] = self._item_error(
+                    index, product_id, "Product not found"
+                )
+            seen.add(product_id)
+        return self._bulk_result(results, len(product_ids))
+
+    @staticmethod
+    def _item_error(
+        index: int, product_id: Optional[str], detail: str
+    ) -> BulkItemResult:
+        """
+        Build the outcome of a rejected bulk item.
+
+        Args:
+            index: Position of the item in the request
+            product_id: Id of the product, when known
+            detail: Why the item was rejected
+
+        Returns:
+            BulkItemResult: Error outcome
+        """
+        return BulkItemResult(index=index, id=product_id, status="error", detail=detail)
+
+    @staticmethod
+    def _describe(error: ValidationError) -> str:
+        """
+        Summarize the validation errors of one bulk item.
+
+        Args:
+            error: Validation error of the item
+
+        Returns:
+            str: One "field: message" entry per error
+        """
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc']) or 'item'}: {item['msg']}"
+            for item in error.errors()
+        )
+
+    @staticmethod
+    def _bulk_result(results: Dict[int, BulkItemResult], count: int) -> BulkResult:
+        """
+        Assemble the outcome of a bulk operation in request order.
+
+        Args:
+            results: Outcome of each item, by position
+            count: Number of items in the request
+
+        Returns:
+            BulkResult: Counts and outcomes in request order
+        """
+        ordered = [results[index] for index in range(count)]
+        failed = sum(result.status == "error" for result in ordered)
+        return BulkResult(succeeded=count - failed, failed=failed, results=ordered)
@@ -0,0 +1,111 @@
+"""
+Catalog Import Command.
+
+Loads a catalog dump into the database configured by DATABASE_URL, the same
+way ``POST /products/import`` does, printing the progress to stderr:
+
+    python -m app.import_catalog catalog.csv
+    python -m app.import_catalog catalog.parquet --chunk-size 50000
+
+Rows are matched by ``id``: existing products are updated and new ones are
+inserted. The import runs in a single transaction, so a failure leaves the
+catalog untouched.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.cache import create_notifier, product_cache
+from app.controllers.import_controller import (
+    IMPORT_CHUNK_SIZE,
+    IMPORT_FORMATS,
+    ImportController,
+    detect_format,
+)
+from app.database import DATABASE_URL, SessionLocal, create_db_tables, engine
+from app.schemas.product import ImportSummary
+
+
+def report(rows: int, rejected: int, elapsed: float) -> None:
+    """
+    Print the progress of the import.
+
+    Args:
+        rows: Rows loaded so far
+        rejected: Rows rejected so far
+        elapsed: Seconds since the import started
+    """
+    print(
+        f"> {rows} rows ({rejected} rejected) in {elapsed:.1f}s, "
+        f"{rows / max(elapsed, 1e-9):.0f} rows/s",
+        file=sys.stderr,
+    )
+
+
+async def run(path: str, file_format: str, chunk_size: int) -> ImportSummary:
+    """
+    Import one file, announcing the change to the running workers so they
+    drop their cached products.
+
+    Args:
+        path: File to import
+        file_format: "csv" or "parquet"
+        chunk_size: Rows validated and loaded at a time
+
+    Returns:
+        ImportSummary: Outcome of the import
+    """
+    await create_db_tables()
+    await product_cache.start(create_notifier(DATABASE_URL))
+    try:
+        with open(path, "rb") as file:
+            async with SessionLocal() as db:
+                return await ImportController(db).import_file(
+                    file, file_format, chunk_size, on_progress=report
+                )
+    finally:
+        await product_cache.stop()
+        await engine.dispose()
+
+
+def main() -> None:
+    """
+    Parse the command line and run the import.
+    """
+    parser = argparse.ArgumentParser(description="Import a CSV or Parquet catalog dump")
+    parser.add_argument(
+        "input", help="CSV (header nome,espaco,valor[,id]) or Parquet file"
+    )
+    parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        default=None,
+        help="file format (default: guessed from the extension)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=IMPORT_CHUNK_SIZE,
+        help=f"rows loaded at a time (default: {IMPORT_CHUNK_SIZE})",
+    )
+    args = parser.parse_args()
+
+    try:
+        summary = asyncio.run(
+            run(args.input, args.format or detect_format(args.input), args.chunk_size)
+        )
+    except ValueError as error:
+        parser.exit(1, f"Import failed: {error}\n")
+    for error in summary.errors:
+        print(f"Line {error.line}: {error.detail}", file=sys.stderr)
+    print(
+        f"> Imported {summary.rows} rows ({summary.rejected} rejected) with "
+        f"{summary.method} in {summary.seconds:.1f}s, "
+        f"{summary.rows_per_second:.0f} rows/s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
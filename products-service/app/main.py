@@ -6,16 +6,52 @@ service. It handles database initialization, startup events, and route
 registration.
 """
 
-import time
-from typing import Dict
+import asyncio
+import os
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.cache import create_notifier, product_cache
+from app.controllers.product_controller import ProductController
+from app.database import (
+    DATABASE_URL,
+    SessionLocal,
+    create_db_tables,
+    engine,
+    insert_initial_products,
+    pool_wait_stats,
+)
+from app.routers import debug_router, product_router, health_router
 
-from fastapi import FastAPI
+# Seconds between compactions of the change feed tombstones
+TOMBSTONE_COMPACT_INTERVAL: float = float(
+    os.getenv("TOMBSTONE_COMPACT_INTERVAL", "3600")
+)
 
-from app.database import create_db_tables, get_db, insert_initial_products
-from app.routers import product_router, health_router
+app = FastAPI(title="Products Management Backend")
 
+# Background task compacting the tombstones
+compaction_task: Optional["asyncio.Task[None]"] = None
 
-app = FastAPI(title="Products Management Backend")
+
+async def compact_tombstones_periodically() -> None:
+    """
+    Compact the change feed tombstones every TOMBSTONE_COMPACT_INTERVAL
+    seconds. Every worker runs it; compaction is idempotent.
+    """
+    while True:
+        await asyncio.sleep(TOMBSTONE_COMPACT_INTERVAL)
+        try:
+            async with SessionLocal() as db:
+                await ProductController(db).compact_changes()
+        except SQLAlchemyError:
+            # O banco pode estar fora do ar; tenta de novo no próximo ciclo
+            pass
 
 
 @app.on_event("startup")
@@ -25,7 +61,8 @@ async def startup_event() -> None:
 
     Creates database tables if they don't exist and inserts initial products
     if the products table is empty. Includes retry logic to wait for the
-    database to be ready.
+    database to be ready. Then starts listening for the cache invalidations
+    of the other workers and schedules the tombstone compaction.
 
     Raises:
         Exception: If database connection fails after maximum retries.
@@ -35,26 +72,63 @@ async def startup_event() -> None:
 
     for i in range(max_retries):
         try:
-            create_db_tables()
+            await create_db_tables()
 
-            db = next(get_db())
-            try:
-                insert_initial_products(db)
-            finally:
-                db.close()
+            async with SessionLocal() as db:
+                await insert_initial_products(db)
 
-            return
+            break
         except Exception:
             if i < max_retries - 1:
-                time.sleep(retry_delay)
+                await asyncio.sleep(retry_delay)
             else:
                 raise
 
+    await product_cache.start(create_notifier(DATABASE_URL))
+
+    global compaction_task
+    compaction_task = asyncio.create_task(compact_tombstones_periodically())
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    """
+    Application shutdown event handler.
+
+    Stops the tombstone compaction and the cache notifier and closes the
+    database connection pool.
+    """
+    if compaction_task is not None:
+        compaction_task.cancel()
+    await product_cache.stop()
+    await engine.dispose()
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    """
+    Answer 503 when no pooled connection freed up within DB_POOL_TIMEOUT.
+
+    Args:
+        request: Request that could not get a connection
+        exc: Pool timeout raised by SQLAlchemy
+
+    Returns:
+        JSONResponse: 503 asking the client to retry later
+    """
+    pool_wait_stats.timeouts += 1
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database connection pool exhausted, try again later"},
+        headers={"Retry-After": "1"},
+    )
+
 
 app.include_router(
     product_router.router, prefix="/products", tags=["products"]
 )
 app.include_router(health_router.router)
+app.include_router(debug_router.router, tags=["debug"])
 
 
 @app.get("/")
@@ -0,0 +1,35 @@
+"""
+Catalog Version Model Module.
+
+This module contains the SQLAlchemy model for the catalog version, a
+single-row counter bumped by every transaction that writes products.
+"""
+
+from sqlalchemy import BigInteger, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+# Primary key of the single catalog version row
+CATALOG_VERSION_ID = 1
+
+
+class CatalogVersionModel(Base):
+    """
+    SQLAlchemy model for the 'catalog_version' table in the database.
+
+    Holds one row whose version increases with every committed write. The
+    row lock taken by the increment also orders concurrent writes, so a
+    higher version is never committed before a lower one.
+
+    Attributes:
+        id: Always CATALOG_VERSION_ID (primary key)
+        version: Current catalog version
+        compacted_version: Latest version whose tombstones were compacted;
+            the change feed cannot serve changes since an earlier version
+    """
+
+    __tablename__ = "catalog_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+    compacted_version: Mapped[int] = mapped_column(BigInteger, default=0)
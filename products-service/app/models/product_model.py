@@ -5,7 +5,7 @@ This module contains the SQLAlchemy model for the Product entity,
 defining the database table structure and field mappings.
 """
 
-from sqlalchemy import String, Float
+from sqlalchemy import BigInteger, String, Float
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
 
@@ -22,6 +22,8 @@ class ProductModel(Base):
         nome: Product name (indexed for faster queries)
         espaco: Space occupied by the product (float)
         valor: Product value (float)
+        version: Catalog version of the last write to the product
+            (indexed for the change feed)
     """
 
     __tablename__ = "products"
@@ -30,3 +32,4 @@ class ProductModel(Base):
     nome: Mapped[str] = mapped_column(String, index=True)
     espaco: Mapped[float] = mapped_column(Float)
     valor: Mapped[float] = mapped_column(Float)
+    version: Mapped[int] = mapped_column(BigInteger, index=True, default=0)
@@ -0,0 +1,33 @@
+"""
+Product Tombstone Model Module.
+
+This module contains the SQLAlchemy model for product tombstones, the
+records the change feed reports deletions from.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+
+class ProductTombstoneModel(Base):
+    """
+    SQLAlchemy model for the 'product_tombstones' table in the database.
+
+    One row per deleted product, kept until compaction. A product that is
+    imported again loses its tombstone, so an id is never both a product
+    and a tombstone.
+
+    Attributes:
+        id: Id of the deleted product (primary key)
+        version: Catalog version of the deletion (indexed for the feed)
+        deleted_at: When the product was deleted, in UTC
+    """
+
+    __tablename__ = "product_tombstones"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, index=True)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
@@ -2,15 +2,54 @@
 Product Repository Module.
 
 This module contains the repository layer for product data access,
-providing CRUD operations using SQLAlchemy ORM.
+providing CRUD operations using the SQLAlchemy ORM over an async session.
 """
 
+import os
 import uuid
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from sqlalchemy.orm import Session
-from app.schemas.product import ProductCreate, Product
+from sqlalchemy import case, delete, func, insert, select, text, update
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import ProductCache, product_cache
+from app.schemas.product import ProductCreate, Product, ProductPatch
+from app.models.catalog_version_model import CATALOG_VERSION_ID, CatalogVersionModel
 from app.models.product_model import ProductModel
+from app.models.product_tombstone_model import ProductTombstoneModel
+
+# Rows fetched from the server-side cursor at a time by the export
+EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Products table, for Core statements that skip the ORM unit of work
+PRODUCTS = ProductModel.__table__
+
+# Catalog version table, bumped by every write
+CATALOG_VERSION = CatalogVersionModel.__table__
+
+# Tombstones of deleted products, read by the change feed
+TOMBSTONES = ProductTombstoneModel.__table__
+
+# Staging table PostgreSQL imports are copied into before the upsert
+IMPORT_STAGING_TABLE = "products_import_staging"
+
+# Columns of an imported row, in order
+IMPORT_COLUMNS = ("id", "nome", "espaco", "valor")
+
+# Ids per IN (...) list in bulk statements, below the bind parameter limits
+# of PostgreSQL and SQLite
+BULK_CHUNK_SIZE: int = 1000
 
 
 class ProductRepository:
@@ -18,31 +57,221 @@ class ProductRepository:
     Repository for product CRUD operations using SQLAlchemy.
 
     Provides data access layer functionality for product operations,
-    handling database queries and model conversions.
+    handling database queries and model conversions. Listings and lookups
+    by id read through the product cache. Every write bumps the catalog
+    version first, stamps it on the rows it writes (and on tombstones for
+    deletions) and invalidates the cache once committed.
     """
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession, cache: ProductCache = product_cache) -> None:
         """
         Initialize the product repository.
 
         Args:
             db: Database session instance
+            cache: Product cache read through and invalidated on writes
         """
         self.db = db
+        self.cache = cache
+        self._import_version: Optional[int] = None
+        self._import_loaded = False
+
+    async def get_version(self) -> int:
+        """
+        Retrieve the current catalog version.
+
+        Taken from the cache when this worker knows it (its own writes and
+        the announcements of the other workers keep it current), otherwise
+        read from the single catalog version row; the products table is
+        never read.
+
+        Returns:
+            int: Catalog version
+        """
+        version = self.cache.get_version()
+        if version is not None:
+            return version
+        generation = self.cache.generation
+        version = await self.db.scalar(
+            select(CATALOG_VERSION.c.version).where(
+                CATALOG_VERSION.c.id == CATALOG_VERSION_ID
+            )
+        )
+        self.cache.set_version(version, generation)
+        return version
+
+    async def get_changes(
+        self, since: int
+    ) -> Tuple[int, int, Sequence[Any], Sequence[Any]]:
+        """
+        Retrieve the products written and deleted after a catalog version.
+
+        The catalog version is read first: writes committed meanwhile may
+        show up in the changes too, which only makes a client apply them
+        again, but a change can never be missed. The compacted version is
+        read last, so a compaction that ran meanwhile is noticed.
+
+        Args:
+            since: Catalog version the client is synchronized with
+
+        Returns:
+            Tuple[int, int, Sequence[Any], Sequence[Any]]: Current catalog
+            version, latest compacted version, (id, nome, espaco, valor,
+            version) rows of the products written and (id, version) rows of
+            the products deleted, both in version order
+        """
+        version = await self.db.scalar(
+            select(CATALOG_VERSION.c.version).where(
+                CATALOG_VERSION.c.id == CATALOG_VERSION_ID
+            )
+        )
+        changed = (
+            await self.db.execute(
+                select(*PRODUCTS.c)
+                .where(PRODUCTS.c.version > since)
+                .order_by(PRODUCTS.c.version, PRODUCTS.c.id)
+            )
+        ).all()
+        deleted = (
+            await self.db.execute(
+                select(TOMBSTONES.c.id, TOMBSTONES.c.version)
+                .where(TOMBSTONES.c.version > since)
+                .order_by(TOMBSTONES.c.version, TOMBSTONES.c.id)
+            )
+        ).all()
+        compacted = await self.db.scalar(
+            select(CATALOG_VERSION.c.compacted_version).where(
+                CATALOG_VERSION.c.id == CATALOG_VERSION_ID
+            )
+        )
+        return version, compacted, changed, deleted
+
+    async def compact_tombstones(self, before: datetime) -> int:
+        """
+        Delete the tombstones of products deleted before a moment.
+
+        Every tombstone up to the version of the newest one removed is
+        deleted, and that version is recorded as compacted: the change feed
+        can no longer serve changes since an earlier version.
+
+        Args:
+            before: Tombstones older than this are removed
+
+        Returns:
+            int: Tombstones removed
+        """
+        watermark = await self.db.scalar(
+            select(func.max(TOMBSTONES.c.version)).where(
+                TOMBSTONES.c.deleted_at < before
+            )
+        )
+        if watermark is None:
+            return 0
+        removed = (
+            await self.db.execute(
+                delete(TOMBSTONES).where(TOMBSTONES.c.version <= watermark)
+            )
+        ).rowcount
+        await self.db.execute(
+            update(CATALOG_VERSION)
+            .where(CATALOG_VERSION.c.id == CATALOG_VERSION_ID)
+            .values(
+                compacted_version=case(
+                    (CATALOG_VERSION.c.compacted_version < watermark, watermark),
+                    else_=CATALOG_VERSION.c.compacted_version,
+                )
+            )
+        )
+        await self.db.commit()
+        return removed
 
-    def get_all(self) -> List[Product]:
+    async def get_all(self) -> List[Product]:
         """
-        Retrieve all products from the database.
+        Retrieve all products, in id order, from the cache or the database.
 
         Returns:
             List[Product]: List of all products
         """
-        products = self.db.query(ProductModel).all()
-        return [Product.model_validate(p) for p in products]
+        cached = self.cache.get_listing(("all",))
+        if cached is not None:
+            return cached
+        generation = self.cache.generation
+        products = await self.db.scalars(select(ProductModel).order_by(ProductModel.id))
+        listing = [Product.model_validate(p) for p in products]
+        self.cache.put_listing(("all",), listing, generation)
+        return listing
 
-    def get_by_id(self, product_id: str) -> Optional[Product]:
+    async def get_page(
+        self, limit: int, after: Optional[str] = None
+    ) -> Tuple[List[Product], bool]:
         """
-        Retrieve a product by its ID from the database.
+        Retrieve one page of products in id order (keyset pagination).
+
+        Only the columns are selected, without building ORM objects, and the
+        primary key index serves both the filter and the ordering, so every
+        page costs the same whatever its position in the catalog.
+
+        Args:
+            limit: Maximum number of products in the page
+            after: Id of the last product of the previous page, if any
+
+        Returns:
+            Tuple[List[Product], bool]: Products of the page and whether
+            more products follow
+        """
+        key = ("page", limit, after)
+        cached = self.cache.get_listing(key)
+        if cached is not None:
+            return cached
+        generation = self.cache.generation
+        query = (
+            select(
+                ProductModel.id,
+                ProductModel.nome,
+                ProductModel.espaco,
+                ProductModel.valor,
+            )
+            .order_by(ProductModel.id)
+            .limit(limit + 1)
+        )
+        if after is not None:
+            query = query.where(ProductModel.id > after)
+        rows = (await self.db.execute(query)).all()
+        page = [Product.model_validate(row) for row in rows[:limit]], len(rows) > limit
+        self.cache.put_listing(key, page, generation)
+        return page
+
+    async def stream_all(
+        self, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        Stream every product in id order from a server-side cursor.
+
+        Rows are plain (id, nome, espaco, valor) tuples, fetched
+        ``batch_size`` at a time, so memory does not grow with the catalog.
+
+        Args:
+            batch_size: Rows fetched from the cursor at a time
+
+        Yields:
+            Sequence[Any]: The next batch of rows
+        """
+        result = await self.db.stream(
+            select(
+                ProductModel.id,
+                ProductModel.nome,
+                ProductModel.espaco,
+                ProductModel.valor,
+            )
+            .order_by(ProductModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def get_by_id(self, product_id: str) -> Optional[Product]:
+        """
+        Retrieve a product by its ID from the cache or the database.
 
         Args:
             product_id: Product ID to search for
@@ -50,14 +279,18 @@ class ProductRepository:
         Returns:
             Optional[Product]: Product if found, None otherwise
         """
-        product = self.db.query(ProductModel).filter(
-            ProductModel.id == product_id
-        ).first()
+        cached = self.cache.get(product_id)
+        if cached is not None:
+            return cached
+        generation = self.cache.generation
+        product = await self.db.get(ProductModel, product_id)
         if product:
-            return Product.model_validate(product)
+            found = Product.model_validate(product)
+            self.cache.put(found, generation)
+            return found
         return None
 
-    def create(self, product_create: ProductCreate) -> Product:
+    async def create(self, product_create: ProductCreate) -> Product:
         """
         Create a new product and add it to the database.
 
@@ -69,24 +302,29 @@ class ProductRepository:
         Returns:
             Product: Created product instance
         """
+        version = await self._bump_version()
         product_id = str(uuid.uuid4())
         new_product_model = ProductModel(
             id=product_id,
             nome=product_create.nome,
             espaco=product_create.espaco,
-            valor=product_create.valor
+            valor=product_create.valor,
+            version=version,
         )
         self.db.add(new_product_model)
-        self.db.commit()
-        self.db.refresh(new_product_model)
+        await self._commit([product_id], version)
         return Product.model_validate(new_product_model)
 
-    def update(
+    async def update(
         self, product_id: str, product_update: ProductCreate
     ) -> Optional[Product]:
         """
         Update an existing product in the database.
 
+        A single ``UPDATE ... RETURNING`` statement writes the row and reads
+        it back; without RETURNING support the row count tells whether the
+        product existed, since the new values are already known.
+
         Args:
             product_id: Product ID to update
             product_update: New product data
@@ -94,36 +332,349 @@ class ProductRepository:
         Returns:
             Optional[Product]: Updated product if found, None otherwise
         """
-        product_model = self.db.query(ProductModel).filter(
-            ProductModel.id == product_id
-        ).first()
-        if not product_model:
-            return None
-
-        product_model.nome = product_update.nome
-        product_model.espaco = product_update.espaco
-        product_model.valor = product_update.valor
+        version = await self._bump_version()
+        statement = (
+            update(PRODUCTS)
+            .where(PRODUCTS.c.id == product_id)
+            .values(
+                nome=product_update.nome,
+                espaco=product_update.espaco,
+                valor=product_update.valor,
+                version=version,
+            )
+        )
+        if self.db.bind.dialect.update_returning:
+            row = (await self.db.execute(statement.returning(*PRODUCTS.c))).first()
+            await self._commit([product_id] if row is not None else [], version)
+            return Product.model_validate(row) if row is not None else None
 
-        self.db.commit()
-        self.db.refresh(product_model)
-        return Product.model_validate(product_model)
+        result = await self.db.execute(statement)
+        await self._commit([product_id] if result.rowcount else [], version)
+        if not result.rowcount:
+            return None
+        return Product(id=product_id, **product_update.model_dump())
 
-    def delete(self, product_id: str) -> bool:
+    async def delete(self, product_id: str) -> bool:
         """
         Delete a product from the database.
 
+        A single ``DELETE ... RETURNING`` statement, or a plain DELETE and
+        its row count when RETURNING is not supported, followed by the
+        tombstone of the product.
+
         Args:
             product_id: Product ID to delete
 
         Returns:
             bool: True if product was deleted, False otherwise
         """
-        product_model = self.db.query(ProductModel).filter(
-            ProductModel.id == product_id
-        ).first()
-        if not product_model:
-            return False
+        version = await self._bump_version()
+        statement = delete(PRODUCTS).where(PRODUCTS.c.id == product_id)
+        if self.db.bind.dialect.delete_returning:
+            found = (
+                await self.db.execute(statement.returning(PRODUCTS.c.id))
+            ).first() is not None
+        else:
+            found = bool((await self.db.execute(statement)).rowcount)
+        if found:
+            await self._bury([product_id], version)
+        await self._commit([product_id] if found else [], version)
+        return found
+
+    async def create_many(self, products: List[ProductCreate]) -> List[Product]:
+        """
+        Create several products with one multi-row INSERT and one commit.
+
+        Args:
+            products: Product data for creation
+
+        Returns:
+            List[Product]: Created products, in the order given
+        """
+        created = [
+            Product(id=str(uuid.uuid4()), **product.model_dump())
+            for product in products
+        ]
+        if created:
+            version = await self._bump_version()
+            await self.db.execute(
+                insert(ProductModel),
+                [{**product.model_dump(), "version": version} for product in created],
+            )
+            await self._commit([product.id for product in created], version)
+        return created
+
+    async def update_many(self, patches: List[ProductPatch]) -> Dict[str, Product]:
+        """
+        Apply partial updates to several products in one transaction.
+
+        The current rows are read with one query per chunk of ids; the
+        updates are sent as executemany batches grouped by changed fields.
+        Patches for unknown ids are skipped.
+
+        Args:
+            patches: Partial updates, at most one per product id
+
+        Returns:
+            Dict[str, Product]: Updated products by id
+        """
+        version = await self._bump_version()
+        current = await self._get_many([patch.id for patch in patches])
+        updated: Dict[str, Product] = {}
+        changes = []
+        for patch in patches:
+            product = current.get(patch.id)
+            if product is None:
+                continue
+            values = patch.model_dump(exclude_unset=True, exclude_none=True)
+            updated[patch.id] = product.model_copy(update=values)
+            if len(values) > 1:
+                changes.append({**values, "version": version})
+        if changes:
+            await self.db.execute(update(ProductModel), changes)
+        await self._commit([change["id"] for change in changes], version)
+        return updated
+
+    async def delete_many(self, product_ids: List[str]) -> Set[str]:
+        """
+        Delete several products in one transaction.
+
+        Args:
+            product_ids: Ids of the products to delete
+
+        Returns:
+            Set[str]: Ids that existed and were deleted
+        """
+        version = await self._bump_version()
+        existing: Set[str] = set()
+        for chunk in self._chunks(list(dict.fromkeys(product_ids))):
+            found = (
+                await self.db.scalars(
+                    select(ProductModel.id).where(ProductModel.id.in_(chunk))
+                )
+            ).all()
+            if found:
+                await self.db.execute(
+                    delete(ProductModel).where(ProductModel.id.in_(found))
+                )
+                await self._bury(found, version)
+                existing.update(found)
+        await self._commit(existing, version)
+        return existing
+
+    def import_method(self) -> str:
+        """
+        How this database loads imported rows.
+
+        Returns:
+            str: "copy" on PostgreSQL, "upsert" on SQLite
+
+        Raises:
+            NotImplementedError: On any other database
+        """
+        dialect = self.db.bind.dialect.name
+        if dialect == "postgresql":
+            return "copy"
+        if dialect == "sqlite":
+            return "upsert"
+        raise NotImplementedError(
+            f"Bulk import supports PostgreSQL and SQLite, not {dialect}"
+        )
+
+    async def start_import(self) -> None:
+        """
+        Prepare an import transaction.
+
+        On PostgreSQL this creates the temporary staging table, dropped when
+        the transaction ends; ``seq`` keeps the file order so the last row
+        of a repeated id wins. On SQLite rows are written as they come, so
+        the catalog version they are stamped with is taken now.
+        """
+        self._import_version = None
+        self._import_loaded = False
+        if self.import_method() == "upsert":
+            self._import_version = await self._bump_version()
+        else:
+            await self.db.execute(
+                text(
+                    f"CREATE TEMPORARY TABLE {IMPORT_STAGING_TABLE} ("
+                    "seq BIGSERIAL, id VARCHAR, nome VARCHAR, "
+                    "espaco DOUBLE PRECISION, valor DOUBLE PRECISION"
+                    ") ON COMMIT DROP"
+                )
+            )
+
+    async def import_rows(self, rows: List[Tuple[str, str, float, float]]) -> None:
+        """
+        Load one chunk of an import.
+
+        PostgreSQL copies the chunk into the staging table with COPY FROM
+        STDIN; SQLite upserts it straight into ``products``.
 
-        self.db.delete(product_model)
-        self.db.commit()
-        return True
+        Args:
+            rows: (id, nome, espaco, valor) tuples
+        """
+        if not rows:
+            return
+        self._import_loaded = True
+        if self.import_method() == "copy":
+            connection = await self.db.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                IMPORT_STAGING_TABLE, records=rows, columns=list(IMPORT_COLUMNS)
+            )
+            return
+        statement = sqlite.insert(ProductModel)
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[ProductModel.id],
+                set_={
+                    "nome": statement.excluded.nome,
+                    "espaco": statement.excluded.espaco,
+                    "valor": statement.excluded.valor,
+                    "version": statement.excluded.version,
+                },
+            ),
+            [
+                {**dict(zip(IMPORT_COLUMNS, row)), "version": self._import_version}
+                for row in rows
+            ],
+        )
+
+    async def finish_import(self) -> None:
+        """
+        Upsert the staged rows, if any, and commit the import.
+
+        Imported products that had been deleted lose their tombstones.
+        Imports may touch any product, so the whole cache is invalidated.
+        An import that loaded no rows is rolled back instead, leaving the
+        catalog version and the cache untouched.
+        """
+        version = self._import_version
+        if not self._import_loaded:
+            await self._commit(set(), version or 0)
+            return
+        if version is None:
+            version = await self._bump_version()
+            await self.db.execute(
+                text(
+                    "INSERT INTO products (id, nome, espaco, valor, version) "
+                    "SELECT DISTINCT ON (id) id, nome, espaco, valor, :version "
+                    f"FROM {IMPORT_STAGING_TABLE} ORDER BY id, seq DESC "
+                    "ON CONFLICT (id) DO UPDATE SET nome = EXCLUDED.nome, "
+                    "espaco = EXCLUDED.espaco, valor = EXCLUDED.valor, "
+                    "version = EXCLUDED.version"
+                ),
+                {"version": version},
+            )
+        await self.db.execute(
+            delete(TOMBSTONES).where(
+                TOMBSTONES.c.id.in_(
+                    select(PRODUCTS.c.id).where(PRODUCTS.c.version == version)
+                )
+            )
+        )
+        await self._commit(None, version)
+
+    async def _commit(self, product_ids: Optional[Iterable[str]], version: int) -> None:
+        """
+        Commit the transaction, then invalidate the cached copies of the
+        products it wrote, here and in the other workers.
+
+        Args:
+            product_ids: Products written, or None when unknown; when none
+                changed the transaction is rolled back instead, so the
+                version bump is undone
+            version: Catalog version taken by the transaction
+        """
+        if product_ids is not None and not product_ids:
+            await self.db.rollback()
+            return
+        await self.db.commit()
+        self.cache.invalidate(product_ids, version)
+
+    async def _bury(self, product_ids: Iterable[str], version: int) -> None:
+        """
+        Record the tombstones of deleted products for the change feed.
+
+        Args:
+            product_ids: Products deleted
+            version: Catalog version of the deletion
+        """
+        deleted_at = datetime.now(timezone.utc)
+        await self.db.execute(
+            insert(TOMBSTONES),
+            [
+                {"id": product_id, "version": version, "deleted_at": deleted_at}
+                for product_id in product_ids
+            ],
+        )
+
+    async def _bump_version(self) -> int:
+        """
+        Increment the catalog version within the current transaction.
+
+        Writes take their version before touching any product, and the row
+        stays locked until the commit, so concurrent writes commit their
+        versions in order: once version N is visible, no write with a lower
+        version is still pending.
+
+        Returns:
+            int: New catalog version
+        """
+        statement = (
+            update(CATALOG_VERSION)
+            .where(CATALOG_VERSION.c.id == CATALOG_VERSION_ID)
+            .values(version=CATALOG_VERSION.c.version + 1)
+        )
+        if self.db.bind.dialect.update_returning:
+            return (
+                await self.db.execute(statement.returning(CATALOG_VERSION.c.version))
+            ).scalar_one()
+        await self.db.execute(statement)
+        return await self.db.scalar(
+            select(CATALOG_VERSION.c.version).where(
+                CATALOG_VERSION.c.id == CATALOG_VERSION_ID
+            )
+        )
+
+    async def _get_many(self, product_ids: List[str]) -> Dict[str, Product]:
+        """
+        Retrieve several products by id.
+
+        Args:
+            product_ids: Ids to look up
+
+        Returns:
+            Dict[str, Product]: Products found, by id
+        """
+        products: Dict[str, Product] = {}
+        for chunk in self._chunks(list(dict.fromkeys(product_ids))):
+            rows = (
+                await self.db.execute(
+                    select(
+                        ProductModel.id,
+                        ProductModel.nome,
+                        ProductModel.espaco,
+                        ProductModel.valor,
+                    ).where(ProductModel.id.in_(chunk))
+                )
+            ).all()
+            products.update((row.id, Product.model_validate(row)) for row in rows)
+        return products
+
+    @staticmethod
+    def _chunks(items: List[str]) -> List[List[str]]:
+        """
+        Split a list into chunks of BULK_CHUNK_SIZE items.
+
+        Args:
+            items: Items to split
+
+        Returns:
+            List[List[str]]: Consecutive chunks of the items
+        """
+        return [
+            items[start : start + BULK_CHUNK_SIZE]
+            for start in range(0, len(items), BULK_CHUNK_SIZE)
+        ]
@@ -0,0 +1,40 @@
+"""
+Debug Router Module.
+
+This module contains diagnostic endpoints for the products service, used to
+size the database connection pool and the product cache against the
+observed load.
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from app.cache import product_cache
+from app.database import pool_status
+
+router = APIRouter()
+
+
+@router.get("/debug/pool")
+async def pool_debug() -> Dict[str, Any]:
+    """
+    Connection pool status endpoint.
+
+    Returns:
+        Dict[str, Any]: Pool settings, connections checked out, idle and in
+        overflow, and the time sessions waited for a connection
+    """
+    return pool_status()
+
+
+@router.get("/debug/cache")
+async def cache_debug() -> Dict[str, Any]:
+    """
+    Product cache status endpoint.
+
+    Returns:
+        Dict[str, Any]: Entries and limits, hits, misses and invalidations of
+        this worker's product cache
+    """
+    return product_cache.stats()
@@ -5,20 +5,54 @@ This module contains the FastAPI router for product-related endpoints.
 It provides CRUD operations for products with dependency injection.
 """
 
-from typing import List
+import logging
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controllers.import_controller import ImportController, detect_format
+from app.controllers.product_controller import ChangesExpiredError, ProductController
+from app.database import get_db
+from app.schemas.product import (
+    BulkDelete,
+    BulkResult,
+    ImportSummary,
+    Product,
+    ProductChanges,
+    ProductCreate,
+    ProductPage,
+)
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
+router = APIRouter()
+logger = logging.getLogger(__name__)
 
-from app.controllers.product_controller import ProductController
-from app.database import get_db
-from app.schemas.product import Product, ProductCreate
+# Products per page when the request does not set a limit
+DEFAULT_PAGE_SIZE = 100
 
+# Largest page a request may ask for
+MAX_PAGE_SIZE = 1000
 
-router = APIRouter()
+# Largest number of items in one bulk request
+MAX_BULK_ITEMS = 10000
+
+# Media type of each export format
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
 
-def get_product_controller(db: Session = Depends(get_db)) -> ProductController:
+def get_product_controller(db: AsyncSession = Depends(get_db)) -> ProductController:
     """
     FastAPI dependency that provides a ProductController instance
     with an injected database session.
@@ -32,20 +66,57 @@ def get_product_controller(db: Session = Depends(get_db)) -> ProductController:
     return ProductController(db)
 
 
-@router.get("/", response_model=List[Product])
+@router.get("/", response_model=Union[ProductPage, List[Product]])
 async def get_all_products_route(
-    controller: ProductController = Depends(get_product_controller)
-) -> List[Product]:
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    paginate: bool = True,
+    if_none_match: Optional[str] = Header(None),
+    controller: ProductController = Depends(get_product_controller),
+) -> Union[ProductPage, List[Product], Response]:
     """
-    Get all products.
+    Get the products, one page at a time.
+
+    Pages are ordered by product id; pass the ``next_cursor`` of a page as
+    ``cursor`` to get the next one. Responses carry the catalog version as
+    their ETag; a request whose ``If-None-Match`` holds the current one is
+    answered with 304 and no body, without reading the products.
 
     Args:
+        response: Response whose headers receive the ETag.
+        limit: Maximum number of products in the page.
+        cursor: Cursor returned with the previous page.
+        paginate: False returns every product as a plain list, as the
+            listing did before pagination (kept for compatibility).
+        if_none_match: ETags of the representations the client holds.
         controller: Product controller dependency.
 
     Returns:
-        List[Product]: List of all products.
+        Union[ProductPage, List[Product], Response]: Page of products,
+        every product when not paginating, or 304 Not Modified.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
     """
-    return controller.get_all_products()
+    try:
+        if paginate and cursor is not None:
+            controller.decode_cursor(cursor)
+    except ValueError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(error)
+        ) from None
+
+    etag = controller.etag(await controller.get_catalog_version())
+    if controller.etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+
+    if not paginate:
+        return await controller.get_all_products()
+    return await controller.get_products_page(limit, cursor)
 
 
 @router.post("/", response_model=Product, status_code=status.HTTP_201_CREATED)
@@ -63,33 +134,219 @@ async def create_product_route(
     Returns:
         Product: Created product.
     """
-    return controller.create_product(product)
+    return await controller.create_product(product)
+
+
+@router.get("/changes", response_model=ProductChanges)
+async def get_changes_route(
+    since: int = Query(..., ge=0),
+    controller: ProductController = Depends(get_product_controller),
+) -> ProductChanges:
+    """
+    Get the products created, updated and deleted since a catalog version.
+
+    Mirrors apply ``changed`` and ``deleted`` and keep ``version`` for the
+    next request, so syncing costs as much as the changes, not the catalog.
+    Start from the ETag of a full listing, which is its catalog version.
+
+    Args:
+        since: Catalog version the client is synchronized with.
+        controller: Product controller dependency.
+
+    Returns:
+        ProductChanges: Changes after ``since`` and the current version.
+
+    Raises:
+        HTTPException: 410 if the changes since that version are no longer
+            complete (tombstones compacted) or the version is unknown; the
+            client must reload the catalog.
+    """
+    try:
+        return await controller.get_changes(since)
+    except ChangesExpiredError as error:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE, detail=str(error)
+        ) from None
+
+
+@router.get("/export")
+async def export_products_route(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    controller: ProductController = Depends(get_product_controller),
+) -> StreamingResponse:
+    """
+    Stream the whole catalog as NDJSON or CSV.
+
+    Rows are read from a server-side cursor and sent as they arrive, so
+    memory use does not depend on the catalog size.
+
+    Args:
+        format: Export format, "ndjson" or "csv".
+        controller: Product controller dependency.
+
+    Returns:
+        StreamingResponse: Products in id order.
+    """
+    return StreamingResponse(
+        controller.export_products(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=products.{format}"},
+    )
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def create_products_route(
+    items: List[Dict[str, Any]] = Body(..., max_length=MAX_BULK_ITEMS),
+    controller: ProductController = Depends(get_product_controller),
+) -> BulkResult:
+    """
+    Create several products in one transaction.
+
+    Args:
+        items: Product data (nome, espaco, valor), one object per product.
+        controller: Product controller dependency.
+
+    Returns:
+        BulkResult: Outcome of each item; invalid items are reported and
+        the valid ones are created.
+    """
+    return await controller.create_products(items)
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def update_products_route(
+    items: List[Dict[str, Any]] = Body(..., max_length=MAX_BULK_ITEMS),
+    controller: ProductController = Depends(get_product_controller),
+) -> BulkResult:
+    """
+    Partially update several products in one transaction.
+
+    Args:
+        items: Product id plus the fields that change, one object per product.
+        controller: Product controller dependency.
+
+    Returns:
+        BulkResult: Outcome of each item; invalid items and unknown ids are
+        reported and the other updates are applied.
+    """
+    return await controller.update_products(items)
+
+
+@router.delete("/bulk", response_model=BulkResult)
+async def delete_products_route(
+    data: BulkDelete, controller: ProductController = Depends(get_product_controller)
+) -> BulkResult:
+    """
+    Delete several products in one transaction.
+
+    Args:
+        data: Ids of the products to delete.
+        controller: Product controller dependency.
+
+    Returns:
+        BulkResult: Outcome of each id; unknown ids are reported.
+
+    Raises:
+        HTTPException: If more than MAX_BULK_ITEMS ids are sent.
+    """
+    if len(data.ids) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {MAX_BULK_ITEMS} ids per request",
+        )
+    return await controller.delete_products(data.ids)
+
+
+@router.post("/import", response_model=ImportSummary)
+async def import_products_route(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "parquet"]] = None,
+    db: AsyncSession = Depends(get_db),
+) -> ImportSummary:
+    """
+    Import a catalog dump, inserting new products and updating existing ones.
+
+    The file is loaded in chunks in one transaction: through COPY into a
+    staging table on PostgreSQL, with batched upserts elsewhere. CSV files
+    need a header with nome, espaco and valor (id is optional); Parquet
+    files need pyarrow.
+
+    Args:
+        file: CSV or Parquet file.
+        format: File format; guessed from the file name when omitted.
+        db: Database session dependency.
+
+    Returns:
+        ImportSummary: Rows loaded and rejected, throughput and the first
+        rejected rows.
+
+    Raises:
+        HTTPException: If the file cannot be read.
+    """
+    file_format = format or detect_format(file.filename)
+
+    def report(rows: int, rejected: int, elapsed: float) -> None:
+        logger.info(
+            "Import %s: %d rows (%d rejected), %.0f rows/s",
+            file.filename,
+            rows,
+            rejected,
+            rows / max(elapsed, 1e-9),
+        )
+
+    try:
+        return await ImportController(db).import_file(
+            file.file, file_format, on_progress=report
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
 
 
 @router.get("/{product_id}", response_model=Product)
 async def get_product_route(
     product_id: str,
-    controller: ProductController = Depends(get_product_controller)
-) -> Product:
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    controller: ProductController = Depends(get_product_controller),
+) -> Union[Product, Response]:
     """
     Get a specific product by ID.
 
+    The ETag is the catalog version, as in the listing: a client holding
+    the current one gets 304 without the product being looked up.
+
     Args:
         product_id: Product ID.
+        response: Response whose headers receive the ETag.
+        if_none_match: ETags of the representations the client holds.
         controller: Product controller dependency.
 
     Returns:
-        Product: Product with the specified ID.
+        Union[Product, Response]: Product with the specified ID, or 304
+        Not Modified.
 
     Raises:
         HTTPException: If product is not found.
     """
-    product = controller.get_product_by_id(product_id)
+    etag = controller.etag(await controller.get_catalog_version())
+    not_modified = controller.etag_matches(if_none_match, etag)
+    # "*" só vale se o produto existir, então ele precisa ser consultado
+    if not_modified and if_none_match.strip() != "*":
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    product = await controller.get_product_by_id(product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
+    if not_modified:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
     return product
 
 
@@ -113,7 +370,7 @@ async def update_product_route(
     Raises:
         HTTPException: If product is not found.
     """
-    updated_product = controller.update_product(product_id, product)
+    updated_product = await controller.update_product(product_id, product)
     if not updated_product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -137,7 +394,7 @@ async def delete_product_route(
     Raises:
         HTTPException: If product is not found.
     """
-    if not controller.delete_product(product_id):
+    if not await controller.delete_product(product_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
@@ -5,6 +5,8 @@ This module contains Pydantic models for product data validation
 and serialization, including base, creation, and response schemas.
 """
 
+from typing import List, Literal, Optional
+
 from pydantic import BaseModel
 
 
@@ -56,3 +58,158 @@ class Product(ProductBase):
         """
 
         from_attributes = True
+
+
+class ProductPage(BaseModel):
+    """
+    One page of the product listing.
+
+    Attributes:
+        items: Products of the page, ordered by id
+        next_cursor: Opaque cursor of the next page, or None on the last page
+    """
+
+    items: List[Product]
+    next_cursor: Optional[str] = None
+
+
+class ProductPatch(BaseModel):
+    """
+    Partial update of one product in a bulk update.
+
+    Attributes:
+        id: Id of the product to update
+        nome: New product name, if it changes
+        espaco: New space occupied by the product, if it changes
+        valor: New product value, if it changes
+    """
+
+    id: str
+    nome: Optional[str] = None
+    espaco: Optional[float] = None
+    valor: Optional[float] = None
+
+
+class BulkDelete(BaseModel):
+    """
+    Products to remove in a bulk delete.
+
+    Attributes:
+        ids: Ids of the products to delete
+    """
+
+    ids: List[str]
+
+
+class BulkItemResult(BaseModel):
+    """
+    Outcome of one item of a bulk operation.
+
+    Attributes:
+        index: Position of the item in the request
+        id: Id of the product, when known
+        status: "created", "updated", "deleted" or "error"
+        detail: Why the item failed, for errors
+        product: The product as stored, for creations and updates
+    """
+
+    index: int
+    id: Optional[str] = None
+    status: Literal["created", "updated", "deleted", "error"]
+    detail: Optional[str] = None
+    product: Optional[Product] = None
+
+
+class BulkResult(BaseModel):
+    """
+    Outcome of a bulk operation, one entry per requested item.
+
+    Attributes:
+        succeeded: Items applied
+        failed: Items rejected
+        results: Outcome of each item, in request order
+    """
+
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+class ImportRowError(BaseModel):
+    """
+    Row rejected by a catalog import.
+
+    Attributes:
+        line: Line (CSV) or row (Parquet) number, counting from 1
+        detail: Why the row was rejected
+    """
+
+    line: int
+    detail: str
+
+
+class ImportSummary(BaseModel):
+    """
+    Outcome of a catalog import.
+
+    Attributes:
+        rows: Valid input rows loaded; a product whose id repeats in the
+            file is counted once per row, although only its last row is kept
+        rejected: Rows skipped because they were invalid
+        chunks: Chunks the file was loaded in
+        seconds: Wall time of the import
+        rows_per_second: Rows loaded per second
+        method: "copy" (PostgreSQL COPY into a staging table) or "upsert"
+            (batched INSERT ... ON CONFLICT)
+        errors: The first rejected rows
+    """
+
+    rows: int
+    rejected: int
+    chunks: int
+    seconds: float
+    rows_per_second: float
+    method: Literal["copy", "upsert"]
+    errors: List[ImportRowError]
+
+
+class ProductVersion(Product):
+    """
+    Product written after the version a change feed request started from.
+
+    Attributes:
+        version: Catalog version of the last write to the product
+    """
+
+    version: int
+
+
+class DeletedProduct(BaseModel):
+    """
+    Product deleted after the version a change feed request started from.
+
+    Attributes:
+        id: Id of the deleted product
+        version: Catalog version of the deletion
+    """
+
+    id: str
+    version: int
+
+
+class ProductChanges(BaseModel):
+    """
+    Changes to the catalog since a version.
+
+    Attributes:
+        since: Version the changes start after
+        version: Catalog version the client is synchronized with once the
+            changes are applied; pass it as ``since`` in the next request
+        changed: Products created or updated, in version order
+        deleted: Products deleted, in version order
+    """
+
+    since: int
+    version: int
+    changed: List[ProductVersion]
+    deleted: List[DeletedProduct]
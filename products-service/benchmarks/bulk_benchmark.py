@@ -0,0 +1,133 @@
+"""
+Bulk Endpoint Benchmark.
+
+Loads, updates and deletes the same number of products through the
+per-item endpoints (one request, one transaction per product) and through
+the bulk endpoints (one request, one transaction in total), in-process
+against the database in DATABASE_URL:
+
+    DATABASE_URL=sqlite:///./bench.db PYTHONPATH=. \\
+        python benchmarks/bulk_benchmark.py [--products 2000]
+
+Use a scratch database: the benchmark writes and deletes products.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.main import app
+
+
+async def timed(step: Callable[[], Awaitable[None]]) -> float:
+    """
+    Wall time of one benchmark step.
+
+    Args:
+        step: Coroutine function running the step
+
+    Returns:
+        float: Elapsed seconds
+    """
+    started = time.perf_counter()
+    await step()
+    return time.perf_counter() - started
+
+
+async def run(products: int) -> Dict[str, Dict[str, float]]:
+    """
+    Time creation, update and deletion on both paths.
+
+    Args:
+        products: Products handled by each step
+
+    Returns:
+        Dict[str, Dict[str, float]]: Seconds of each step, by path
+    """
+    payload = [
+        {"nome": f"bench-{index}", "espaco": 0.1 + index % 10, "valor": 10.0 + index}
+        for index in range(products)
+    ]
+    timings: Dict[str, Dict[str, float]] = {"per-item": {}, "bulk": {}}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        ids: List[str] = []
+
+        async def create_each() -> None:
+            for item in payload:
+                response = await client.post("/products/", json=item)
+                ids.append(response.json()["id"])
+
+        async def update_each() -> None:
+            for product_id, item in zip(ids, payload):
+                await client.put(f"/products/{product_id}", json={**item, "valor": 1.0})
+
+        async def delete_each() -> None:
+            for product_id in ids:
+                await client.delete(f"/products/{product_id}")
+
+        timings["per-item"]["create"] = await timed(create_each)
+        timings["per-item"]["update"] = await timed(update_each)
+        timings["per-item"]["delete"] = await timed(delete_each)
+        ids.clear()
+
+        async def create_bulk() -> None:
+            response = await client.post("/products/bulk", json=payload)
+            ids.extend(item["id"] for item in response.json()["results"])
+
+        async def update_bulk() -> None:
+            await client.patch(
+                "/products/bulk",
+                json=[{"id": product_id, "valor": 1.0} for product_id in ids],
+            )
+
+        async def delete_bulk() -> None:
+            await client.request("DELETE", "/products/bulk", json={"ids": ids})
+
+        timings["bulk"]["create"] = await timed(create_bulk)
+        timings["bulk"]["update"] = await timed(update_bulk)
+        timings["bulk"]["delete"] = await timed(delete_bulk)
+    return timings
+
+
+async def main_async(products: int) -> None:
+    """
+    Start the application, run the benchmark and print the timings.
+
+    Args:
+        products: Products handled by each step
+    """
+    await app.router.startup()
+    try:
+        timings = await run(products)
+    finally:
+        await app.router.shutdown()
+    print(f"Products per step: {products}")
+    print(f"{'step':<8} {'per-item':>12} {'bulk':>12} {'speed-up':>10}")
+    for step in ("create", "update", "delete"):
+        each, bulk = timings["per-item"][step], timings["bulk"][step]
+        print(
+            f"{step:<8} {each * 1000:10.0f} ms {bulk * 1000:10.0f} ms"
+            f" {each / bulk:9.1f}x"
+        )
+
+
+def main() -> None:
+    """
+    Parse the command line and run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Bulk endpoint benchmark")
+    parser.add_argument(
+        "--products", type=int, default=2000, help="products handled by each step"
+    )
+    args = parser.parse_args()
+    asyncio.run(main_async(args.products))
+
+
+if __name__ == "__main__":
+    main()
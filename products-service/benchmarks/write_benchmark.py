@@ -0,0 +1,234 @@
+"""
+Single-Product Write Benchmark.
+
+Times ``ProductRepository.update`` and ``ProductRepository.delete`` against
+the ORM path they replaced (SELECT the row, change or delete it, COMMIT and,
+for updates, read the row back), in-process against the database in
+DATABASE_URL, and counts the SQL statements each path sends. Both paths do
+the same catalog bookkeeping (version bump, tombstones), so the difference
+is the RETURNING statement alone:
+
+    DATABASE_URL=sqlite:///./bench.db PYTHONPATH=. \\
+        python benchmarks/write_benchmark.py [--products 2000] [--concurrency 8]
+
+With ``--concurrency`` several sessions write at once, which is where the
+saved round trips matter most on a networked database. Use a scratch
+database: the benchmark writes and deletes products.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import event, insert
+
+from app.database import SessionLocal, create_db_tables, engine
+from app.models.product_model import ProductModel
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product import Product, ProductCreate
+
+# Statements sent to the database since the benchmark started
+statements = 0
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def count_statement(*args: Any) -> None:
+    """
+    Count every statement sent to the database.
+    """
+    global statements
+    statements += 1
+
+
+async def orm_update(
+    repository: ProductRepository, product_id: str, product_update: ProductCreate
+) -> Product:
+    """
+    Update a product the way the repository did before RETURNING, with
+    today's version bookkeeping.
+
+    Args:
+        repository: Repository bound to the session
+        product_id: Product ID to update
+        product_update: New product data
+
+    Returns:
+        Product: Updated product
+    """
+    version = await repository._bump_version()
+    product_model = await repository.db.get(ProductModel, product_id)
+    product_model.nome = product_update.nome
+    product_model.espaco = product_update.espaco
+    product_model.valor = product_update.valor
+    product_model.version = version
+    await repository.db.commit()
+    repository.cache.invalidate([product_id], version)
+    await repository.db.refresh(product_model)
+    return Product.model_validate(product_model)
+
+
+async def orm_delete(repository: ProductRepository, product_id: str) -> bool:
+    """
+    Delete a product the way the repository did before RETURNING, with
+    today's version bookkeeping.
+
+    Args:
+        repository: Repository bound to the session
+        product_id: Product ID to delete
+
+    Returns:
+        bool: True once deleted
+    """
+    version = await repository._bump_version()
+    product_model = await repository.db.get(ProductModel, product_id)
+    await repository.db.delete(product_model)
+    await repository._bury([product_id], version)
+    await repository.db.commit()
+    repository.cache.invalidate([product_id], version)
+    return True
+
+
+async def seed(products: int) -> List[str]:
+    """
+    Insert the products the benchmark writes to.
+
+    Args:
+        products: Number of products
+
+    Returns:
+        List[str]: Their ids
+    """
+    ids = [str(uuid.uuid4()) for _ in range(products)]
+    async with SessionLocal() as db:
+        await db.execute(
+            insert(ProductModel),
+            [
+                {
+                    "id": product_id,
+                    "nome": f"bench-{index}",
+                    "espaco": 1.0,
+                    "valor": 10.0,
+                }
+                for index, product_id in enumerate(ids)
+            ],
+        )
+        await db.commit()
+    return ids
+
+
+async def timed(
+    ids: List[str],
+    concurrency: int,
+    operation: Callable[[ProductRepository, str], Awaitable[Any]],
+) -> Dict[str, float]:
+    """
+    Run one operation on every product, ``concurrency`` sessions at a time.
+
+    Args:
+        ids: Products to write
+        concurrency: Sessions writing at once
+        operation: Write applied to each product
+
+    Returns:
+        Dict[str, float]: Seconds, mean latency in milliseconds and
+        statements per operation
+    """
+    latencies: List[float] = []
+
+    async def worker(part: List[str]) -> None:
+        for product_id in part:
+            async with SessionLocal() as db:
+                started = time.perf_counter()
+                await operation(ProductRepository(db), product_id)
+                latencies.append(time.perf_counter() - started)
+
+    sent = statements
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(worker(ids[start::concurrency]) for start in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "latency_ms": 1000 * sum(latencies) / len(latencies),
+        "statements": (statements - sent) / len(ids),
+    }
+
+
+async def run(
+    products: int, concurrency: int
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Time updates and deletes on both paths.
+
+    Args:
+        products: Products written by each step
+        concurrency: Sessions writing at once
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, float]]]: Figures of each step, by path
+    """
+    change = ProductCreate(nome="bench", espaco=2.0, valor=20.0)
+    timings: Dict[str, Dict[str, Dict[str, float]]] = {"orm": {}, "returning": {}}
+    for path, update_one, delete_one in (
+        (
+            "orm",
+            lambda repository, product_id: orm_update(repository, product_id, change),
+            orm_delete,
+        ),
+        (
+            "returning",
+            lambda repository, product_id: repository.update(product_id, change),
+            lambda repository, product_id: repository.delete(product_id),
+        ),
+    ):
+        ids = await seed(products)
+        timings[path]["update"] = await timed(ids, concurrency, update_one)
+        timings[path]["delete"] = await timed(ids, concurrency, delete_one)
+    return timings
+
+
+async def main_async(products: int, concurrency: int) -> None:
+    """
+    Create the tables, run the benchmark and print the figures.
+
+    Args:
+        products: Products written by each step
+        concurrency: Sessions writing at once
+    """
+    await create_db_tables()
+    try:
+        timings = await run(products, concurrency)
+    finally:
+        await engine.dispose()
+    print(f"Products per step: {products}, concurrency: {concurrency}")
+    print(f"{'step':<8} {'orm':>22} {'returning':>22} {'speed-up':>10}")
+    for step in ("update", "delete"):
+        orm, returning = timings["orm"][step], timings["returning"][step]
+        print(
+            f"{step:<8} "
+            f"{orm['latency_ms']:8.2f} ms {orm['statements']:4.1f} stmts "
+            f"{returning['latency_ms']:8.2f} ms {returning['statements']:4.1f} stmts "
+            f"{orm['seconds'] / returning['seconds']:9.2f}x"
+        )
+
+
+def main() -> None:
+    """
+    Parse the command line and run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Single-product write benchmark")
+    parser.add_argument(
+        "--products", type=int, default=2000, help="products written by each step"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="sessions writing at once"
+    )
+    args = parser.parse_args()
+    asyncio.run(main_async(args.products, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()